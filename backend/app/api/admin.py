@@ -0,0 +1,61 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from core.jobs import scheduler
+from core.stages import stages_status
+from models.registry import MODEL_SPECS, models_info, reload_model, reload_changed_models
+
+router = APIRouter()
+
+# ---------- Endpoint: Model Registry Status ----------
+@router.get("/admin/models")
+def get_models():
+    """
+    Load time, estimated memory size and version of every registered model.
+    """
+    return models_info()
+
+# ---------- Endpoint: Hot-swap Weights ----------
+@router.post("/admin/models/reload")
+async def reload_changed():
+    """
+    Swaps in every model whose weights file changed on disk.
+    """
+    changed = await run_in_threadpool(reload_changed_models)
+    return {"reloaded": changed, "models": models_info()}
+
+@router.post("/admin/models/{name}/reload")
+async def reload_one(name: str):
+    if name not in MODEL_SPECS:
+        raise HTTPException(status_code=404, detail=f"Unknown model: {name}")
+    try:
+        entry = await run_in_threadpool(reload_model, name)
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"Reload failed, previous weights kept: {exc}")
+    return entry.info()
+
+# ---------- Endpoint: Request Stages ----------
+@router.get("/admin/stages")
+def get_stages():
+    """
+    Per-stage pool size, queue bound, in-flight requests and 429 counts.
+    """
+    return stages_status()
+
+# ---------- Endpoint: Background Jobs ----------
+@router.get("/admin/jobs")
+async def get_jobs():
+    """
+    State, run counts and timings of every background job.
+    """
+    return {"running": scheduler.running, "jobs": scheduler.status()}
+
+@router.post("/admin/jobs/{name}/run")
+async def run_job(name: str):
+    """
+    Triggers a job (joining its run if one is already queued or running)
+    without waiting for it; poll GET /admin/jobs for the outcome.
+    """
+    if name not in scheduler.jobs:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {name}")
+    scheduler.trigger(name)
+    return scheduler.jobs[name].status()
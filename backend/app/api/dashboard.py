@@ -1,16 +1,13 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from schemas.dashboard import DashboardMetrics
-from models.xgb_model import predict_demand
-from models.prophet_model import average_forecasted_demand
-from models.trend_model import forecast_trend_spike
-from core.utils import load_inventory_data, load_forecast_data
-from fastapi.responses import StreamingResponse
-from io import StringIO
+from core import dashboard_metrics, stages
+from core.utils import load_inventory_data
+from core.export import export_response
 
 router = APIRouter()
 
 @router.get("/dashboard/metrics", response_model=DashboardMetrics)
-def get_dashboard_metrics():
+async def get_dashboard_metrics():
     """
     Returns key warehouse metrics:
     - Total SKUs
@@ -18,58 +15,26 @@ def get_dashboard_metrics():
     - Reorder Required Count
     - Revenue Impact Estimate
     - ML Model Outputs: XGBoost, Prophet, Spike Detection
-    """
-
-    # Load inventory and forecast data
-    inventory_df = load_inventory_data()  # SKU, stock, reorder, pricing
-    forecast_df = load_forecast_data()    # Demand forecasts (7-day/30-day)
 
-    # Top Metrics
-    total_skus = inventory_df['sku'].nunique()
-    reorder_required = inventory_df[inventory_df['current_stock'] < inventory_df['required_stock']].shape[0]
-    capacity_utilization = round((inventory_df['current_stock'].sum() / inventory_df['max_capacity'].sum()) * 100, 2)
-    revenue_impact = round(((inventory_df['price'] * inventory_df['required_stock']).sum()) / 1_000_000, 2)  # in $M
-
-    # ML Models Output
-    xgb_accuracy = predict_demand(return_accuracy=True)  # returns accuracy %
-    prophet_trend = average_forecasted_demand()          # e.g. +23% for Q4
-    spike_result = forecast_trend_spike()                # list of 15 items
+    KPIs are computed once per data version; the three model outputs run
+    concurrently with their own TTL cache and timeout (core/dashboard_metrics.py).
+    """
+    return await stages.read.run(dashboard_metrics.get_dashboard_metrics)
 
-    return {
-        "total_skus": total_skus,
-        "capacity_utilization": capacity_utilization,
-        "reorder_required": reorder_required,
-        "revenue_impact": revenue_impact,
-        "xgb_forecast": {
-            "accuracy": xgb_accuracy,
-            "status": "Optimal" if xgb_accuracy > 90 else "Warning"
-        },
-        "prophet_seasonality": {
-            "trend_summary": "Q4 holiday season trend detected",
-            "demand_increase": "+{}% demand".format(prophet_trend),
-            "status": "Alert" if prophet_trend > 20 else "Stable"
-        },
-        "trend_spike": {
-            "items": len(spike_result),
-            "status": "Action" if len(spike_result) > 0 else "None"
-        }
-    }
+def _reorder_rows():
+    inventory_df = load_inventory_data()
+    return inventory_df[inventory_df['required_stock'] > inventory_df['current_stock']]
 
 @router.get("/dashboard/reorder-report")
-def generate_reorder_report():
+async def generate_reorder_report(
+    export_format: str = Query("csv", alias="format"),
+    gzip: bool = Query(False)
+):
     """
     Button click: Generate CSV for reorder-required SKUs.
     Rule: required_stock > current_stock
+    Streamed in row batches; also available as ndjson/parquet and gzipped.
     """
-    inventory_df = load_inventory_data()
-    reorder_df = inventory_df[inventory_df['required_stock'] > inventory_df['current_stock']]
-
-    csv_buffer = StringIO()
-    reorder_df.to_csv(csv_buffer, index=False)
-    csv_buffer.seek(0)
-
-    return StreamingResponse(
-        csv_buffer,
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=reorder_report.csv"}
-    )
+    with stages.export.reserve() as slot:
+        reorder_df = await stages.read.run(_reorder_rows)
+        return export_response(reorder_df, "reorder_report", export_format, gzip, slot=slot)
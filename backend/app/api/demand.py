@@ -1,14 +1,23 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import List, Optional
 from pydantic import BaseModel
-from models.trend_model import detect_demand_spikes
+from core import config, stages
+from core.serialization import etag_response
+from core.demand_map import (
+    get_tiles, spikes_payload, summary_cards_payload, overlay_payload, cells_payload,
+    viewport_payload, nearest_surplus, encode_payload, event_context
+)
+from models.event_model import get_event_metadata, get_region_spike_forecast
+from schemas.demand_map import RegionRequest, RegionSpikeDetails, RegionCard, AllSpikes
 
 router = APIRouter()
 
 # ---------- Endpoint: Region Spike Details ----------
 @router.post("/demand-map/region-details", response_model=RegionSpikeDetails)
-def get_region_spike_info(region_request: RegionRequest):
-    region = region_request.region
+async def get_region_spike_info(region_request: RegionRequest):
+    return await stages.read.run(_region_spike_info, region_request.region)
+
+def _region_spike_info(region: str) -> RegionSpikeDetails:
     event_info = get_event_metadata(region)
     forecast_data = get_region_spike_forecast(region)
 
@@ -20,157 +29,74 @@ def get_region_spike_info(region_request: RegionRequest):
         top_products=forecast_data["top_products"]
     )
 
+def _tile_payload(key, build) -> tuple:
+    # Encoded once per tiles version and event calendar (see DemandMapTiles.payload)
+    return get_tiles().payload(key, build, event_context())
+
 # ---------- Endpoint: All Spikes Summary ----------
 @router.get("/demand-map/spikes", response_model=AllSpikes)
-def get_all_spike_regions():
+async def get_all_spike_regions(request: Request):
     """
     Returns a summary of all demand spikes by region.
     Used for placing colored markers on the Google Earth/Map UI.
+    Served from the materialized demand map (see core/demand_map.py).
     """
-    spike_data = detect_demand_spikes()
-
-    region_cards = []
-    for entry in spike_data:
-        region_cards.append(RegionSpikeInfo(
-            region=entry['region'],
-            demand_level=entry['demand_level'],
-            spike_percentage=entry['spike_percent'],
-            reason=entry['reason'],
-            duration=entry['duration'],
-            affected_products=entry['products']
-        ))
-
-    return AllSpikes(regions=region_cards)
-
-# ---------- Endpoint: Inventory Matrix Table ----------
-@router.get("/inventory-matrix", response_model=List[InventoryItem])
-def get_inventory_matrix(
-    brand: Optional[str] = Query(None),
-    category: Optional[str] = Query(None),
-    location: Optional[str] = Query(None)
-):
-    df = load_inventory_data()
-    forecast_dict = predict_demand_matrix()
-
-    if brand:
-        df = df[df['brand'] == brand]
-    if category:
-        df = df[df['category'] == category]
-    if location:
-        df = df[df['location'] == location]
-
-    items = []
-    for _, row in df.iterrows():
-        sku = row['sku']
-        forecasted = forecast_dict.get(sku, 0)
-        required = max(forecasted, row['required_stock'])
-        stock_ratio = row['current_stock'] / required if required > 0 else 0
-
-        if stock_ratio < 0.4:
-            status = "Critical"
-        elif stock_ratio < 1.0:
-            status = "Low"
-        else:
-            status = "Sufficient"
-
-        price_action = "Lower Price" if forecasted < row['current_stock'] else "Hold Price"
-
-        items.append(InventoryItem(
-            sku=sku,
-            product_name=row['product_name'],
-            brand=row['brand'],
-            category=row['category'],
-            location=row['location'],
-            current_stock=row['current_stock'],
-            forecasted_demand=forecasted,
-            required_stock=required,
-            price_action=price_action,
-            status=status
-        ))
-
-    return items
-
-# ---------- Endpoint: Summary Metrics ----------
-@router.get("/inventory-matrix/metrics", response_model=InventoryMetrics)
-def get_inventory_metrics():
-    df = load_inventory_data()
-    forecast_dict = predict_demand_matrix()
-
-    total_skus = df['sku'].nunique()
-    critical = 0
-    low = 0
-    sufficient = 0
-    reorder = 0
-
-    for _, row in df.iterrows():
-        sku = row['sku']
-        forecasted = forecast_dict.get(sku, 0)
-        required = max(forecasted, row['required_stock'])
-        stock_ratio = row['current_stock'] / required if required > 0 else 0
-
-        if stock_ratio < 0.4:
-            critical += 1
-            reorder += 1
-        elif stock_ratio < 1.0:
-            low += 1
-            reorder += 1
-        else:
-            sufficient += 1
-
-    return InventoryMetrics(
-        total_skus=total_skus,
-        reorder_required=reorder,
-        critical_items=critical,
-        low_items=low,
-        sufficient_items=sufficient
-    )
-
-# ---------- Endpoint: Reorder Report ----------
-@router.get("/inventory-matrix/reorder-report", response_model=ReorderReport)
-def generate_reorder_report():
-    df = load_inventory_data()
-    forecast_dict = predict_demand_matrix()
-
-    report = []
-    for _, row in df.iterrows():
-        sku = row['sku']
-        forecasted = forecast_dict.get(sku, 0)
-        required = max(forecasted, row['required_stock'])
-
-        if row['current_stock'] < required:
-            report.append(ReorderItem(
-                sku=sku,
-                product_name=row['product_name'],
-                current_stock=row['current_stock'],
-                required_stock=required
-            ))
-
-    return ReorderReport(
-        total_reorder_items=len(report),
-        items=report
-    )
+    body, etag = await stages.read.run(_tile_payload, "spikes", spikes_payload)
+    return etag_response(request, body, etag)
 
 @router.get("/demand-map/summary-cards", response_model=List[RegionCard])
-def get_all_region_summaries():
-    regions = ["California", "Texas", "New York", "Florida"]
-    cards = []
-
-    for region in regions:
-        event_info = get_event_metadata(region)
-        forecast_data = get_region_spike_forecast(region)
-
-        cards.append(RegionCard(
-            region=region,
-            spike_percentage=forecast_data["spike_percentage"],
-            reason=event_info["reason"],
-            duration=event_info["duration"],
-            demand_level=forecast_data["demand_level"]
-        ))
-
-    return cards
-from models.geo_demand import get_geo_demand_spikes
+async def get_all_region_summaries(request: Request):
+    body, etag = await stages.read.run(_tile_payload, "summary-cards", summary_cards_payload)
+    return etag_response(request, body, etag)
+
+def _parse_bbox(bbox: str) -> tuple:
+    try:
+        south, west, north, east = (float(part) for part in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox must be 'south,west,north,east'")
+    if not (-90 <= south <= north <= 90 and -180 <= west <= 180 and -180 <= east <= 180):
+        raise HTTPException(status_code=400, detail="bbox is out of range")
+    return south, west, north, east
 
 @router.get("/demand-map/geo-overlay")
-def get_geo_demand_overlay():
-    return get_geo_demand_spikes()
-
+async def get_geo_demand_overlay(
+    request: Request,
+    zoom: Optional[int] = Query(None, ge=0, le=22),
+    bbox: Optional[str] = Query(None, description="south,west,north,east")
+):
+    """
+    Spiking regions with coordinates, or with `zoom` the precomputed grid
+    cells for that zoom level (see WAREHOUSEIQ_DEMAND_MAP_ZOOM_LEVELS).
+    With `bbox`, only what is in view: regions, or clusters at low zoom.
+    """
+    tiles = await stages.read.run(get_tiles)
+    if bbox is not None:
+        payload = await stages.read.run(viewport_payload, tiles, _parse_bbox(bbox), zoom, event_context())
+        body, etag = encode_payload(payload)
+    elif zoom is None:
+        body, etag = await stages.read.run(tiles.payload, "geo-overlay", overlay_payload, event_context())
+    elif zoom in tiles.cells:
+        body, etag = await stages.read.run(tiles.payload, ("cells", zoom), cells_payload(zoom))
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail=f"zoom must be one of {sorted(config.DEMAND_MAP_ZOOM_LEVELS)} without bbox"
+        )
+    return etag_response(request, body, etag)
+
+# ---------- Endpoint: Nearest Warehouses With Surplus ----------
+@router.get("/demand-map/nearest-surplus")
+async def get_nearest_surplus(
+    region: str = Query(...),
+    k: int = Query(5, ge=1, le=100),
+    sku: List[str] = Query([])
+):
+    """
+    The k warehouses closest to `region` with surplus stock of `sku`
+    (defaults to the region's spiking products).
+    """
+    tiles = await stages.read.run(get_tiles)
+    try:
+        return await stages.read.run(nearest_surplus, tiles, region, k, sku)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown or unlocated region: {region}")
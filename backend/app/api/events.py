@@ -1,146 +1,117 @@
-from fastapi import APIRouter, Query
+from datetime import date
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from pydantic import BaseModel
-from models.xgb_model import predict_demand_matrix
-from core.utils import load_inventory_data
-from models.event_model import get_event_metadata, get_region_spike_forecast, calculate_event_impact, get_upcoming_events
+import numpy as np
+from core import stages
+from core.export import iter_ndjson
+from core.event_store import get_calendar, ingest_events
+from models.event_model import calculate_event_impact, get_upcoming_events, score_event_impacts
+from schemas.event import (
+    EventEstimateRequest, EventEstimateResponse, UpcomingEvent, CalendarEventIn, EventBatchRequest
+)
 
 router = APIRouter()
 
+# Upper bound on scenarios per batch request (explicit + grid). Scenarios
+# are scored and streamed BATCH_CHUNK_ROWS at a time, so memory per request
+# is bounded by the chunk, not by this limit.
+MAX_BATCH_SCENARIOS = 1_000_000
+BATCH_CHUNK_ROWS = 50_000
 
-# ---------- Endpoint: Inventory Matrix Table ----------
-@router.get("/inventory-matrix", response_model=List[InventoryItem])
-def get_inventory_matrix(
-    brand: Optional[str] = Query(None),
-    category: Optional[str] = Query(None),
-    location: Optional[str] = Query(None)
-):
-    df = load_inventory_data()
-    forecast_dict = predict_demand_matrix()
-
-    if brand:
-        df = df[df['brand'] == brand]
-    if category:
-        df = df[df['category'] == category]
-    if location:
-        df = df[df['location'] == location]
-
-    items = []
-    for _, row in df.iterrows():
-        sku = row['sku']
-        forecasted = forecast_dict.get(sku, 0)
-        required = max(forecasted, row['required_stock'])
-        stock_ratio = row['current_stock'] / required if required > 0 else 0
-
-        if stock_ratio < 0.4:
-            status = "Critical"
-        elif stock_ratio < 1.0:
-            status = "Low"
-        else:
-            status = "Sufficient"
-
-        price_action = "Lower Price" if forecasted < row['current_stock'] else "Hold Price"
-
-        items.append(InventoryItem(
-            sku=sku,
-            product_name=row['product_name'],
-            brand=row['brand'],
-            category=row['category'],
-            location=row['location'],
-            current_stock=row['current_stock'],
-            forecasted_demand=forecasted,
-            required_stock=required,
-            price_action=price_action,
-            status=status
-        ))
-
-    return items
-
-# ---------- Endpoint: Summary Metrics ----------
-@router.get("/inventory-matrix/metrics", response_model=InventoryMetrics)
-def get_inventory_metrics():
-    df = load_inventory_data()
-    forecast_dict = predict_demand_matrix()
-
-    total_skus = df['sku'].nunique()
-    critical = 0
-    low = 0
-    sufficient = 0
-    reorder = 0
-
-    for _, row in df.iterrows():
-        sku = row['sku']
-        forecasted = forecast_dict.get(sku, 0)
-        required = max(forecasted, row['required_stock'])
-        stock_ratio = row['current_stock'] / required if required > 0 else 0
-
-        if stock_ratio < 0.4:
-            critical += 1
-            reorder += 1
-        elif stock_ratio < 1.0:
-            low += 1
-            reorder += 1
-        else:
-            sufficient += 1
-
-    return InventoryMetrics(
-        total_skus=total_skus,
-        reorder_required=reorder,
-        critical_items=critical,
-        low_items=low,
-        sufficient_items=sufficient
-    )
-
-# ---------- Endpoint: Reorder Report ----------
-@router.get("/inventory-matrix/reorder-report", response_model=ReorderReport)
-def generate_reorder_report():
-    df = load_inventory_data()
-    forecast_dict = predict_demand_matrix()
-
-    report = []
-    for _, row in df.iterrows():
-        sku = row['sku']
-        forecasted = forecast_dict.get(sku, 0)
-        required = max(forecasted, row['required_stock'])
-
-        if row['current_stock'] < required:
-            report.append(ReorderItem(
-                sku=sku,
-                product_name=row['product_name'],
-                current_stock=row['current_stock'],
-                required_stock=required
-            ))
-
-    return ReorderReport(
-        total_reorder_items=len(report),
-        items=report
-    )
-
-# ---------- Endpoint: Region Spike Details ----------
-@router.post("/demand-map/region-details", response_model=RegionSpikeDetails)
-def get_region_spike_info(region_request: RegionRequest):
-    region = region_request.region
-    event_info = get_event_metadata(region)
-    forecast_data = get_region_spike_forecast(region)
-
-    return RegionSpikeDetails(
-        demand_level=forecast_data["demand_level"],
-        spike_percentage=forecast_data["spike_percentage"],
-        reason=event_info["reason"],
-        duration=event_info["duration"],
-        top_products=forecast_data["top_products"]
-    )
 
 # ---------- Endpoint: Event Estimation ----------
 @router.post("/event-estimator/calculate", response_model=EventEstimateResponse)
-def estimate_event_impact(event_request: EventEstimateRequest):
-    return calculate_event_impact(
+async def estimate_event_impact(event_request: EventEstimateRequest):
+    return await stages.read.run(
+        calculate_event_impact,
         region=event_request.region,
         event_type=event_request.event_type,
         score=event_request.score
     )
 
+# ---------- Endpoint: Batch Event Estimation ----------
+@router.post("/event-estimator/batch")
+async def estimate_event_impacts(batch: EventBatchRequest):
+    """
+    Scores many scenarios in vectorized chunks: the explicit `scenarios`
+    followed by the cartesian `grid` of regions x event types x scores
+    (score_min..score_max inclusive, by score_step). Streams one NDJSON
+    line per scenario with region, event_type, score, demand_multiplier,
+    duration and explanation.
+    """
+    with stages.export.reserve() as slot:
+        plan = await stages.compute.run(_batch_plan, batch)
+        body = stages.export.stream(_iter_scored_batch(*plan), slot)
+        return StreamingResponse(body, media_type="application/x-ndjson")
+
+def _batch_plan(batch: EventBatchRequest) -> tuple:
+    # Validated scenario arrays; the grid stays (grid, steps) and is expanded per chunk
+    regions = np.asarray([s.region for s in batch.scenarios], dtype=object)
+    event_types = np.asarray([s.event_type for s in batch.scenarios], dtype=object)
+    scores = np.array([s.score for s in batch.scenarios], dtype=float)
+
+    grid, steps, size = batch.grid, 0, 0
+    if grid is not None:
+        if grid.score_step <= 0 or grid.score_max < grid.score_min:
+            raise HTTPException(status_code=400, detail="grid needs score_step > 0 and score_max >= score_min")
+        steps = int(np.floor((grid.score_max - grid.score_min) / grid.score_step + 1e-9)) + 1
+        size = len(grid.regions) * len(grid.event_types) * steps
+    if len(scores) + size > MAX_BATCH_SCENARIOS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SCENARIOS} scenarios per request")
+
+    return regions, event_types, scores, grid, steps
+
+def _iter_scored_batch(regions, event_types, scores, grid, steps, chunk_rows: int = BATCH_CHUNK_ROWS):
+    # Scores and encodes BATCH_CHUNK_ROWS scenarios at a time: explicit ones
+    # first, then the grid in region, event type, score order
+    for start in range(0, len(scores), chunk_rows):
+        stop = start + chunk_rows
+        chunk = score_event_impacts(regions[start:stop], event_types[start:stop], scores[start:stop])
+        yield from iter_ndjson(chunk, chunk_rows)
+    if grid is None:
+        return
+
+    grid_regions = np.asarray(grid.regions, dtype=object)
+    grid_types = np.asarray(grid.event_types, dtype=object)
+    per_region = len(grid_types) * steps
+    size = len(grid_regions) * per_region
+    for start in range(0, size, chunk_rows):
+        i = np.arange(start, min(start + chunk_rows, size))
+        chunk = score_event_impacts(
+            grid_regions[i // per_region],
+            grid_types[(i // steps) % len(grid_types)],
+            np.round(grid.score_min + grid.score_step * (i % steps), 6)
+        )
+        yield from iter_ndjson(chunk, chunk_rows)
+
 # ---------- Endpoint: Event Calendar ----------
 @router.get("/event-estimator/calendar", response_model=List[UpcomingEvent])
-def get_event_calendar():
-    return get_upcoming_events()
+async def get_event_calendar(
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    region: Optional[List[str]] = Query(None),
+    category: Optional[List[str]] = Query(None)
+):
+    """
+    Events overlapping the [from, to] window (multi-day events included),
+    optionally limited to some regions / categories (repeatable).
+    """
+    if date_from is not None and date_to is not None and date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    return await stages.read.run(_query_calendar, date_from, date_to, region, category)
+
+def _query_calendar(date_from, date_to, region, category) -> list:
+    return get_calendar().query(date_from, date_to, region, category)
+
+@router.post("/event-estimator/calendar")
+async def add_calendar_events(events: List[CalendarEventIn]):
+    """
+    Ingests events; expected_impact is scored here, once, for each of them.
+    """
+    try:
+        calendar = await stages.ingest.run(ingest_events, [event.model_dump() for event in events])
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid event date: {exc}")
+    return {"ingested": len(events), "total_events": len(calendar.events)}
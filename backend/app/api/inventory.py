@@ -1,163 +1,177 @@
-from fastapi import APIRouter, Query
-from fastapi.responses import StreamingResponse
-from io import StringIO
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
 from typing import List, Optional
 from pydantic import BaseModel
-from models.xgb_model import predict_demand_matrix_with_price
-from core.utils import load_inventory_data
-from schemas.inventory import InventoryItem, InventoryMetrics, ReorderItem, ReorderReport
-import pandas as pd
+from core import stages
+from core.snapshot import get_snapshot, get_inventory_snapshot
+from core.filter_index import build_filter_index, select_rows
+from core.pagination import (
+    SORTABLE_COLUMNS, MAX_PAGE_SIZE, build_sort_index, paginate, encode_cursor, decode_cursor
+)
+from core.serialization import frame_to_records_json, json_response
+from core.export import export_response
+from core.kpi_aggregates import get_aggregates, apply_stock_events
+from models.trend_model import record_sales
+from schemas.inventory import (
+    InventoryItem, InventoryMetrics, ReorderItem, ReorderReport, StockEvent, StockEventResult
+)
 
 
 
 router = APIRouter()
 
+# ---------- Shared Filtering ----------
+def _select(snapshot, brand=None, category=None, location=None, status=None):
+    """
+    Row positions matching the optional (multi-value) filters, looked up in
+    the snapshot's filter index. None when no filter is set.
+    """
+    index = snapshot.derived("filters", build_filter_index)
+    return select_rows(index, {
+        "brand": brand,
+        "category": category,
+        "location": location,
+        "status": status
+    })
+
+
 # ---------- Inventory Matrix Route ----------
 @router.get("/inventory-matrix", response_model=List[InventoryItem])
-def get_inventory_matrix(
-    brand: Optional[str] = Query(None),
-    category: Optional[str] = Query(None),
-    location: Optional[str] = Query(None)
+async def get_inventory_matrix(
+    brand: Optional[List[str]] = Query(None),
+    category: Optional[List[str]] = Query(None),
+    location: Optional[List[str]] = Query(None),
+    status: Optional[List[str]] = Query(None),
+    sort_by: Optional[str] = Query(None),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None)
 ):
-    # Load base data
-    df = load_inventory_data()
-
-    # Load forecasted demand and pricing suggestions
-    forecast_df = predict_demand_matrix_with_price()  # Should include sku, forecasted_demand, price_action
-    df = df.merge(forecast_df[['sku', 'forecasted_demand', 'price_action']], on='sku', how='left')
-
-    # Clean and fill missing data
-    df['forecasted_demand'] = df['forecasted_demand'].fillna(0).astype(int)
-    df['price_action'] = df['price_action'].fillna("Hold Price")
-
-    # Apply optional filters
-    if brand:
-        df = df[df['brand'] == brand]
-    if category:
-        df = df[df['category'] == category]
-    if location:
-        df = df[df['location'] == location]
-
-    # Calculate required stock and stock ratio
-    df['required_stock'] = df[['forecasted_demand', 'required_stock']].max(axis=1)
-    df['stock_ratio'] = df['current_stock'] / df['required_stock'].replace(0, 1)
-
-    # Status buckets
-    df['status'] = pd.cut(
-        df['stock_ratio'],
-        bins=[-float('inf'), 0.4, 1.0, float('inf')],
-        labels=["Critical", "Low", "Sufficient"]
+    """
+    Filters accept repeated values (`brand=A&brand=B`).
+    Without `limit`/`sort_by`/`cursor` the full filtered matrix is returned.
+    Otherwise rows come back sorted by `sort_by` (default sku) in pages of
+    `limit`; the `X-Next-Cursor` header carries the cursor for the next page
+    and `X-Total-Count` the number of matching rows.
+    """
+    return await stages.read.run(
+        _inventory_matrix, brand, category, location, status, sort_by, order, limit, cursor
     )
 
-    # Return formatted response
-    return [
-        InventoryItem(
-            sku=row['sku'],
-            product_name=row['product_name'],
-            brand=row['brand'],
-            category=row['category'],
-            location=row['location'],
-            current_stock=row['current_stock'],
-            forecasted_demand=row['forecasted_demand'],
-            required_stock=row['required_stock'],
-            price_action=row['price_action'],
-            status=row['status']
-        )
-        for _, row in df.iterrows()
-    ]
+def _inventory_matrix(brand, category, location, status, sort_by, order, limit, cursor):
+    # Shared enriched snapshot (forecast, required stock, status, price action)
+    snapshot = get_snapshot()
+    df = snapshot.frame
+    selected = _select(snapshot, brand, category, location, status)
+
+    if limit is None and sort_by is None and cursor is None:
+        if selected is not None:
+            df = df.iloc[selected]
+        # Encode straight from the columns (same shape as List[InventoryItem])
+        return json_response(frame_to_records_json(df, InventoryItem))
+
+    sort_by = sort_by or "sku"
+    if sort_by not in SORTABLE_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"sort_by must be one of {SORTABLE_COLUMNS}")
+    descending = order == "desc"
+
+    try:
+        after = decode_cursor(cursor, sort_by, descending) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    sort_index = snapshot.derived(("sort", sort_by), lambda frame: build_sort_index(frame, sort_by))
+    total = len(df) if selected is None else len(selected)
+
+    rows, last = paginate(sort_index, selected, limit or total, after, descending)
+
+    headers = {"X-Total-Count": str(total)}
+    if last is not None:
+        headers["X-Next-Cursor"] = encode_cursor(sort_by, descending, *last)
+
+    body = frame_to_records_json(df.iloc[rows], InventoryItem)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @router.get("/inventory-matrix/metrics", response_model=InventoryMetrics)
-def get_inventory_metrics():
-    df = load_inventory_data()
-    forecast_df = predict_demand_matrix_with_price()  # Uses enhanced model with pricing
-    df = df.merge(forecast_df[['sku', 'forecasted_demand']], on='sku', how='left')
-    df['forecasted_demand'] = df['forecasted_demand'].fillna(0).astype(int)
-
-    df['required_stock'] = df[['forecasted_demand', 'required_stock']].max(axis=1)
-    df['stock_ratio'] = df['current_stock'] / df['required_stock'].replace(0, 1)
-
-    df['status'] = pd.cut(
-        df['stock_ratio'],
-        bins=[-float('inf'), 0.4, 1.0, float('inf')],
-        labels=['Critical', 'Low', 'Sufficient']
+async def get_inventory_metrics():
+    # Running counters, kept current by /inventory-matrix/stock-events
+    aggregates = await stages.read.run(get_aggregates)
+    return InventoryMetrics(**aggregates.inventory_metrics())
+
+# ---------- Endpoint: Stock Change Events ----------
+@router.post("/inventory-matrix/stock-events", response_model=StockEventResult)
+async def ingest_stock_events(events: List[StockEvent]):
+    """
+    Pick/receive deltas, applied in order to the running inventory and
+    dashboard KPIs in O(1) each. Applied picks (negative deltas) also count
+    as sales for trend spike detection. Events for unknown (sku, location)
+    pairs are returned unapplied.
+    """
+    return await stages.ingest.run(_ingest_stock_events, events)
+
+def _ingest_stock_events(events: List[StockEvent]) -> StockEventResult:
+    applied, unknown = apply_stock_events(
+        (event.sku, event.location, event.delta) for event in events
     )
-
-    return InventoryMetrics(
-        total_skus=df['sku'].nunique(),
-        reorder_required=(df['status'].isin(['Critical', 'Low'])).sum(),
-        critical_items=(df['status'] == 'Critical').sum(),
-        low_items=(df['status'] == 'Low').sum(),
-        sufficient_items=(df['status'] == 'Sufficient').sum()
+    unknown_keys = {(sku, location) for sku, location, _ in unknown}
+    record_sales(
+        (event.sku, -event.delta) for event in events
+        if event.delta < 0 and (event.sku, event.location) not in unknown_keys
+    )
+    return StockEventResult(
+        applied=applied,
+        unknown=[StockEvent(sku=sku, location=location, delta=delta) for sku, location, delta in unknown]
     )
 @router.get("/inventory-matrix/reorder-report", response_model=ReorderReport)
-def generate_reorder_report():
-    df = load_inventory_data()
-    forecast_df = predict_demand_matrix_with_price()
-    df = df.merge(forecast_df[['sku', 'forecasted_demand']], on='sku', how='left')
-    df['forecasted_demand'] = df['forecasted_demand'].fillna(0).astype(int)
+async def generate_reorder_report():
+    return await stages.export.run(_reorder_report)
 
-    df['required_stock'] = df[['forecasted_demand', 'required_stock']].max(axis=1)
+def _reorder_report():
+    df = get_inventory_snapshot()
 
     reorder_df = df[df['current_stock'] < df['required_stock']]
 
-    items = [
-        ReorderItem(
-            sku=row['sku'],
-            product_name=row['product_name'],
-            current_stock=row['current_stock'],
-            required_stock=row['required_stock']
-        )
-        for _, row in reorder_df.iterrows()
-    ]
+    items_json = frame_to_records_json(reorder_df, ReorderItem)
 
-    return ReorderReport(
-        total_reorder_items=len(items),
-        items=items
+    return json_response(
+        '{"total_reorder_items":%d,"items":%s}' % (len(reorder_df), items_json)
     )
 
 
-# ---------- Endpoint: Download Inventory CSV ----------
+# ---------- Endpoint: Download Inventory Export ----------
 @router.get("/inventory-matrix/download")
-def download_inventory_csv(
-    brand: Optional[str] = Query(None),
-    category: Optional[str] = Query(None),
-    location: Optional[str] = Query(None)
+async def download_inventory_csv(
+    brand: Optional[List[str]] = Query(None),
+    category: Optional[List[str]] = Query(None),
+    location: Optional[List[str]] = Query(None),
+    export_format: str = Query("csv", alias="format"),
+    gzip: bool = Query(False)
 ):
-    df = load_inventory_data()
-    forecast_df = predict_demand_matrix_with_price()
-
-    df = df.merge(forecast_df[['sku', 'forecasted_demand', 'price_action']], on='sku', how='left')
-    df['forecasted_demand'] = df['forecasted_demand'].fillna(0).astype(int)
-    df['required_stock'] = df[['forecasted_demand', 'required_stock']].max(axis=1)
-    df['stock_ratio'] = df['current_stock'] / df['required_stock'].replace(0, 1)
-
-    df['status'] = pd.cut(
-        df['stock_ratio'],
-        bins=[-float('inf'), 0.4, 1.0, float('inf')],
-        labels=['Critical', 'Low', 'Sufficient']
-    )
-
-    # Optional filtering
-    if brand:
-        df = df[df['brand'] == brand]
-    if category:
-        df = df[df['category'] == category]
-    if location:
-        df = df[df['location'] == location]
-
+    """
+    Streams the (filtered) matrix as csv, ndjson or parquet in row batches,
+    optionally gzip-compressed on the fly.
+    """
     # Reorder columns to match UI
     export_cols = [
         "sku", "product_name", "brand", "category", "location",
         "current_stock", "forecasted_demand", "required_stock",
         "status", "price_action"
     ]
-    csv_stream = StringIO()
-    df[export_cols].to_csv(csv_stream, index=False)
-    csv_stream.seek(0)
-
-    return StreamingResponse(
-        csv_stream,
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=inventory_matrix.csv"}
-    )
+    with stages.export.reserve() as slot:
+        df = await stages.read.run(_export_rows, brand, category, location)
+        return export_response(
+            df, "inventory_matrix", export_format, gzip, columns=export_cols, slot=slot
+        )
+
+def _export_rows(brand, category, location):
+    snapshot = get_snapshot()
+    df = snapshot.frame
+
+    # Optional filtering
+    selected = _select(snapshot, brand, category, location)
+    if selected is not None:
+        df = df.iloc[selected]
+    return df
 
-# Note: The above code assumes that the `load_inventory_data` function and the `predict_demand_matrix` function are defined in the respective modules.
+# Note: All routes above read the shared snapshot from `core.snapshot`, so the inventory is loaded and scored once per data/model version.
+# Handlers are async; their pandas work runs on the stage pools of `core.stages`.
@@ -0,0 +1,89 @@
+from fastapi import APIRouter, HTTPException
+from typing import List
+import numpy as np
+import pandas as pd
+from core import stages
+from core.serialization import frame_to_records_json, json_response
+from core.price_ingest import ingest_feed_directory, get_price_history
+from models.price_model import price_feature_matrix, predict_should_lower, price_actions
+from schemas.price import PriceInput, PriceOutput, PriceDecision
+
+router = APIRouter()
+
+# ---------- Shared Scoring ----------
+def _decide(items: List[PriceInput]) -> pd.DataFrame:
+    """
+    One classifier call for all items, then the demand-vs-stock rule for
+    the items that carry forecast and stock.
+    """
+    columns = {name: np.array([getattr(item, name) for item in items], dtype=float)
+               for name in PriceInput.model_fields}
+    should_lower = predict_should_lower(price_feature_matrix(
+        columns["walmart_price"], columns["amazon_price"],
+        columns["brand"], columns["category"], columns["available"]
+    ))
+
+    # NaN forecast/stock (not sent) never blocks the classifier's decision
+    forecast, stock = columns["forecasted_demand"], columns["current_stock"]
+    overstock = np.isnan(forecast) | np.isnan(stock) | (forecast < stock)
+
+    return pd.DataFrame({
+        "should_lower_price": should_lower,
+        "price_action": price_actions(overstock=overstock, ml_lower=should_lower)
+    })
+
+# ---------- Endpoint: Single Price Decision ----------
+@router.post("/pricing/predict", response_model=PriceOutput)
+async def predict_price(price_input: PriceInput):
+    decisions = await stages.compute.run(_decide, [price_input])
+    return PriceOutput(should_lower_price=int(decisions["should_lower_price"].iloc[0]))
+
+# ---------- Endpoint: Batch Price Decisions ----------
+@router.post("/pricing/batch", response_model=List[PriceDecision])
+async def predict_prices(items: List[PriceInput]):
+    """
+    Scores thousands of items in one vectorized pass; results are in
+    request order.
+    """
+    decisions = await stages.compute.run(_decide, items)
+    return json_response(frame_to_records_json(decisions, PriceDecision))
+
+# ---------- Endpoint: Competitor Feed Ingestion ----------
+def _ingest_and_rescore() -> dict:
+    result = ingest_feed_directory()
+    changed = result["deltas"]["sku"].unique().tolist()
+    summary = {
+        "files": result["files"],
+        "rows": result["rows"],
+        "price_changes": len(result["deltas"]),
+        "changed_skus": len(changed)
+    }
+    if not changed:
+        return {**summary, "decisions": []}
+
+    # Rescore only the SKUs whose competitor prices moved
+    prices = get_price_history().latest_wide(changed)
+    decisions = prices.iloc[0:0]
+    if {"walmart_price", "amazon_price"} <= set(prices.columns):
+        decisions = prices.dropna(subset=["walmart_price", "amazon_price"])[["sku", "walmart_price", "amazon_price"]]
+        should_lower = predict_should_lower(price_feature_matrix(
+            decisions["walmart_price"].to_numpy(), decisions["amazon_price"].to_numpy()
+        ))
+        decisions = decisions.assign(
+            should_lower_price=should_lower, price_action=price_actions(ml_lower=should_lower)
+        )
+
+    return {**summary, "decisions": decisions.to_dict(orient="records")}
+
+@router.post("/pricing/ingest-feeds")
+async def ingest_competitor_feeds():
+    """
+    Ingests the competitor price feeds waiting in the drop directory into
+    the Parquet price history and returns fresh price decisions for the
+    SKUs whose competitor prices changed.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise HTTPException(status_code=501, detail="Price ingestion requires pyarrow")
+    return await stages.ingest.run(_ingest_and_rescore)
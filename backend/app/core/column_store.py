@@ -0,0 +1,124 @@
+# core/column_store.py
+
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+import numpy as np
+import pandas as pd
+
+# Layout of a store root:
+#   current -> v-<ns>          symlink swapped atomically on publish
+#   v-<ns>/manifest.json       row count + column kinds/dtypes
+#   v-<ns>/<col>.npy           numeric column, or the codes of a string column
+#   v-<ns>/<col>.categories.npy  fixed-width unicode categories of a string column
+#
+# Numeric columns and string codes are mapped without a copy. Codes are
+# written in the integer width pandas uses for that many categories, which
+# lets Categorical wrap the mapped array as is. Categories are not shared:
+# each process builds them as Python strings, which costs memory and time
+# in proportion to the distinct values. That is small for brand, category
+# and location, but close to a private copy for sku or product_name.
+CURRENT_LINK = "current"
+MANIFEST = "manifest.json"
+KEEP_VERSIONS = 2
+
+
+# ---------- Writing ----------
+def _code_dtype(n_categories: int):
+    # Same widths as pandas' own Categorical codes
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _write_column(directory: str, name: str, series: pd.Series) -> dict:
+    if pd.api.types.is_numeric_dtype(series.dtype) and not isinstance(series.dtype, pd.CategoricalDtype):
+        np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(series.to_numpy()))
+        return {"kind": "numeric", "dtype": str(series.dtype)}
+
+    # Strings/categoricals: codes + categories, both mmap-able
+    categorical = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+    codes = categorical.cat.codes.to_numpy().astype(_code_dtype(len(categorical.cat.categories)))
+    categories = categorical.cat.categories.astype(str).to_numpy(dtype=str)
+    np.save(os.path.join(directory, f"{name}.npy"), codes)
+    np.save(os.path.join(directory, f"{name}.categories.npy"), categories)
+    return {"kind": "categorical"}
+
+
+def publish_column_store(df: pd.DataFrame, root: str) -> str:
+    """
+    Writes `df` as a new store version next to the live one and swaps the
+    `current` link to it in one rename, so readers see either the old or
+    the new snapshot, never a partial one. Returns the version directory.
+    """
+    os.makedirs(root, exist_ok=True)
+    version = f"v-{time.time_ns()}"
+    staging = os.path.join(root, f".staging-{uuid.uuid4().hex}")
+    os.makedirs(staging)
+
+    columns = {name: _write_column(staging, name, df[name]) for name in df.columns}
+    with open(os.path.join(staging, MANIFEST), "w") as f:
+        json.dump({"rows": len(df), "columns": columns}, f)
+
+    os.rename(staging, os.path.join(root, version))
+
+    link = os.path.join(root, f".link-{uuid.uuid4().hex}")
+    os.symlink(version, link)
+    os.replace(link, os.path.join(root, CURRENT_LINK))
+
+    _prune_versions(root, keep=version)
+    return os.path.join(root, version)
+
+
+def _prune_versions(root: str, keep: str):
+    # Older versions may still be mapped by running workers; unlinking is
+    # safe on POSIX since mappings keep the inodes alive.
+    versions = sorted(d for d in os.listdir(root) if d.startswith("v-"))
+    for name in versions[:-KEEP_VERSIONS]:
+        if name != keep:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+# ---------- Reading ----------
+def current_version(root: str) -> str:
+    return os.readlink(os.path.join(root, CURRENT_LINK))
+
+
+def open_column_store(root: str, columns: list = None) -> pd.DataFrame:
+    """
+    Maps the current store version read-only. Numeric columns and string
+    codes are backed directly by the page cache, so every worker on the
+    host shares one physical copy; nothing is parsed. Categories are the
+    exception (see the layout notes above).
+    """
+    directory = os.path.join(root, current_version(root))
+    with open(os.path.join(directory, MANIFEST)) as f:
+        manifest = json.load(f)
+
+    data = {}
+    for name in (manifest["columns"] if columns is None else columns):
+        spec = manifest["columns"][name]
+        values = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+        if spec["kind"] == "categorical":
+            categories = np.load(os.path.join(directory, f"{name}.categories.npy"), mmap_mode="r")
+            # Codes were range-checked when written; validating would scan them
+            values = pd.Categorical.from_codes(values, categories=pd.Index(categories), validate=False)
+        data[name] = values
+
+    return pd.DataFrame(data, copy=False)
+
+
+if __name__ == "__main__":
+    # Usage: python -m core.column_store <store root>
+    # Publishes the inventory from the configured source (core/config.py).
+    from core.data_sources import create_source, INVENTORY_DTYPES
+    from core.utils import SAMPLE_INVENTORY
+    from core import config
+
+    source = create_source(config.INVENTORY_SOURCE, config.INVENTORY_URI,
+                           config.INVENTORY_TABLE, INVENTORY_DTYPES, SAMPLE_INVENTORY)
+    print(publish_column_store(source.load(), sys.argv[1]))
@@ -1 +1,114 @@
-ECHO is on.
+# core/config.py
+
+import os
+
+# ---------- Data Sources ----------
+# Backend per dataset: "builtin" (bundled sample data), "csv", "parquet",
+# "sqlite", "sqlalchemy" or "mmap". URI is a file path for csv/parquet/sqlite,
+# a SQLAlchemy URL for "sqlalchemy" and a store root for "mmap"
+# (published with `python -m core.column_store <root>`).
+INVENTORY_SOURCE = os.getenv("WAREHOUSEIQ_INVENTORY_SOURCE", "builtin")
+INVENTORY_URI = os.getenv("WAREHOUSEIQ_INVENTORY_URI")
+INVENTORY_TABLE = os.getenv("WAREHOUSEIQ_INVENTORY_TABLE", "inventory")
+
+FORECAST_SOURCE = os.getenv("WAREHOUSEIQ_FORECAST_SOURCE", "builtin")
+FORECAST_URI = os.getenv("WAREHOUSEIQ_FORECAST_URI")
+FORECAST_TABLE = os.getenv("WAREHOUSEIQ_FORECAST_TABLE", "forecast")
+
+# Seconds a loaded frame is trusted for sources that cannot report a
+# version (e.g. a remote database). File-backed sources reload on mtime change.
+DATA_CACHE_TTL = float(os.getenv("WAREHOUSEIQ_DATA_CACHE_TTL", "300"))
+
+# ---------- Demand Model Inference ----------
+# Max cached per-row predictions (roughly 40 bytes each; least recently
+# used go first) and how long the first of several concurrent predict
+# calls waits to batch the others with it.
+PREDICTION_CACHE_SIZE = int(os.getenv("WAREHOUSEIQ_PREDICTION_CACHE_SIZE", "2000000"))
+PREDICTION_BATCH_WINDOW_MS = float(os.getenv("WAREHOUSEIQ_PREDICTION_BATCH_WINDOW_MS", "5"))
+
+# ---------- Model Weights ----------
+MODEL_WEIGHTS_DIR = os.getenv(
+    "WAREHOUSEIQ_MODEL_WEIGHTS_DIR",
+    os.path.join(os.path.dirname(__file__), '../../model_weights')
+)
+
+# ---------- Catalogue Scoring Pool ----------
+# Worker processes for full-catalogue scoring (1 or less disables the pool) and the
+# number of rows below which scoring stays in the request process.
+SCORING_WORKERS = int(os.getenv("WAREHOUSEIQ_SCORING_WORKERS", str(os.cpu_count() or 1)))
+SCORING_POOL_MIN_ROWS = int(os.getenv("WAREHOUSEIQ_SCORING_POOL_MIN_ROWS", "200000"))
+
+# ---------- Geocoding ----------
+GOOGLE_GEOCODE_URL = os.getenv("WAREHOUSEIQ_GEOCODE_URL", "https://maps.googleapis.com/maps/api/geocode/json")
+GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
+GEOCODE_CACHE_PATH = os.getenv(
+    "WAREHOUSEIQ_GEOCODE_CACHE_PATH",
+    os.path.join(os.path.dirname(__file__), '../../geocode_cache.sqlite3')
+)
+GEOCODE_TIMEOUT = float(os.getenv("WAREHOUSEIQ_GEOCODE_TIMEOUT", "5"))
+GEOCODE_MAX_CONNECTIONS = int(os.getenv("WAREHOUSEIQ_GEOCODE_MAX_CONNECTIONS", "20"))
+
+# ---------- Background Jobs ----------
+# Threads running job bodies (see core/jobs.py) and how often the
+# load -> score -> aggregate -> materialize pipeline checks for new data.
+JOB_WORKERS = int(os.getenv("WAREHOUSEIQ_JOB_WORKERS", "4"))
+DATA_REFRESH_SECONDS = float(os.getenv("WAREHOUSEIQ_DATA_REFRESH_SECONDS", "30"))
+
+# ---------- Request Stages ----------
+# Worker threads per class of request work and how many more requests may
+# wait before new ones get 429 (see core/stages.py), as "stage=workers:queue".
+def _stage_limits(spec: str) -> dict:
+    limits = {}
+    for part in spec.split(","):
+        name, _, sizes = part.partition("=")
+        workers, _, queue = sizes.partition(":")
+        limits[name.strip()] = (int(workers), int(queue or 0))
+    return limits
+
+REQUEST_STAGES = _stage_limits(os.getenv(
+    "WAREHOUSEIQ_REQUEST_STAGES",
+    f"read=8:64,compute={os.cpu_count() or 1}:16,export=2:4,ingest=2:16"
+))
+
+# ---------- Demand Map Materializer ----------
+# Background refresh interval (a request that sees outdated tiles triggers
+# an earlier refresh) and the zoom levels precomputed as grid cells.
+DEMAND_MAP_REFRESH_SECONDS = float(os.getenv("WAREHOUSEIQ_DEMAND_MAP_REFRESH_SECONDS", "30"))
+DEMAND_MAP_ZOOM_LEVELS = [
+    int(z) for z in os.getenv("WAREHOUSEIQ_DEMAND_MAP_ZOOM_LEVELS", "2,4,6,8").split(",")
+]
+# A spiking region's reason is the first calendar event in it starting
+# or running within this many days
+DEMAND_MAP_EVENT_WINDOW_DAYS = int(os.getenv("WAREHOUSEIQ_DEMAND_MAP_EVENT_WINDOW_DAYS", "30"))
+
+# ---------- Dashboard ----------
+# Cache lifetime of each model-backed dashboard figure, and how long a
+# request waits for them before answering with the previous value.
+DASHBOARD_ML_TTL = float(os.getenv("WAREHOUSEIQ_DASHBOARD_ML_TTL", "60"))
+DASHBOARD_ML_TIMEOUT = float(os.getenv("WAREHOUSEIQ_DASHBOARD_ML_TIMEOUT", "2"))
+
+# ---------- Competitor Prices ----------
+# Drop directory for CSV/JSONL price feeds, the Parquet price history
+# (partitioned by day) and the rows read per ingestion chunk.
+COMPETITOR_FEED_DIR = os.getenv(
+    "WAREHOUSEIQ_COMPETITOR_FEED_DIR",
+    os.path.join(os.path.dirname(__file__), '../../competitor_feeds')
+)
+PRICE_HISTORY_DIR = os.getenv(
+    "WAREHOUSEIQ_PRICE_HISTORY_DIR",
+    os.path.join(os.path.dirname(__file__), '../../price_history')
+)
+PRICE_INGEST_CHUNK_ROWS = int(os.getenv("WAREHOUSEIQ_PRICE_INGEST_CHUNK_ROWS", "100000"))
+
+# ---------- Forecast Store ----------
+# Horizons (days) precomputed per SKU, where the store is persisted, how
+# often stale SKUs are recomputed and how many SKUs are scored per batch.
+FORECAST_HORIZONS = [
+    int(h) for h in os.getenv("WAREHOUSEIQ_FORECAST_HORIZONS", "1,7,30,90").split(",")
+]
+FORECAST_STORE_PATH = os.getenv(
+    "WAREHOUSEIQ_FORECAST_STORE_PATH",
+    os.path.join(os.path.dirname(__file__), '../../forecast_store.npz')
+)
+FORECAST_REFRESH_SECONDS = float(os.getenv("WAREHOUSEIQ_FORECAST_REFRESH_SECONDS", "3600"))
+FORECAST_REFRESH_BATCH = int(os.getenv("WAREHOUSEIQ_FORECAST_REFRESH_BATCH", "100000"))
@@ -0,0 +1,150 @@
+# core/dashboard_metrics.py
+
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from core import config
+from core.jobs import scheduler
+from core.kpi_aggregates import get_aggregates
+from core.snapshot import current_version as snapshot_version
+from core.forecast_store import current_version as forecast_version
+from models.xgb_model import predict_demand
+from models.prophet_model import average_forecasted_demand
+from models.trend_model import forecast_trend_spike
+
+# ---------- Inventory KPIs ----------
+def get_inventory_kpis() -> dict:
+    """
+    Running KPIs, kept current by stock events (see core/kpi_aggregates.py).
+    """
+    return get_aggregates().dashboard_kpis()
+
+
+# ---------- Model-backed Components ----------
+class CachedComponent:
+    """
+    A slow sub-result with its own TTL cache. Concurrent callers share one
+    in-flight computation; a caller that runs out of time gets the last
+    good value (or `fallback`) while the computation finishes in the
+    background and fills the cache for the next request. The "aggregate"
+    job (see core/jobs.py) refreshes it ahead of expiry. Computations run
+    on the job scheduler's executor.
+
+    With `version` (a callable), a cached value is also outdated once the
+    version it was computed for moves on, e.g. after a model reload.
+    """
+
+    def __init__(self, name: str, compute, fallback, ttl: float, timeout: float, version=None):
+        self.name = name
+        self.compute = compute
+        self.fallback = fallback
+        self.ttl = ttl
+        self.timeout = timeout
+        self.version = version
+        self._value = None
+        self._value_version = None
+        self._expires = 0.0
+        self._future = None
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "computed": 0, "timeouts": 0, "errors": 0}
+
+    def start(self):
+        """
+        Returns a fresh cached value, or the future computing one.
+        """
+        version = self.version() if self.version is not None else None
+        with self._lock:
+            if (self._value is not None and time.monotonic() < self._expires
+                    and self._value_version == version):
+                self.stats["hits"] += 1
+                return self._value
+            future, submitted = self._future, self._future is None
+            if submitted:
+                future = self._future = scheduler.executor.submit(self.compute)
+        if submitted:
+            # Outside the lock: the callback runs inline if already done
+            future.add_done_callback(lambda done: self._store(done, version))
+        return future
+
+    def _store(self, future, version):
+        with self._lock:
+            if self._future is future:
+                self._future = None
+            if future.exception() is None:
+                self._value = (future.result(),)
+                self._value_version = version
+                self._expires = time.monotonic() + self.ttl
+                self.stats["computed"] += 1
+            else:
+                self.stats["errors"] += 1
+
+    def result(self, pending, deadline: float):
+        """
+        Resolves what `start` returned, waiting no later than `deadline`.
+        """
+        if isinstance(pending, tuple):
+            return pending[0]
+        try:
+            return pending.result(timeout=max(deadline - time.monotonic(), 0))
+        except FutureTimeoutError:
+            self.stats["timeouts"] += 1
+        except Exception:
+            pass
+        stale = self._value
+        return stale[0] if stale is not None else self.fallback
+
+
+xgb_accuracy = CachedComponent(
+    "xgb_accuracy", lambda: predict_demand(return_accuracy=True), 0.0,
+    config.DASHBOARD_ML_TTL, config.DASHBOARD_ML_TIMEOUT, version=snapshot_version
+)
+prophet_trend = CachedComponent(
+    "prophet_trend", average_forecasted_demand, 0.0,
+    config.DASHBOARD_ML_TTL, config.DASHBOARD_ML_TIMEOUT, version=forecast_version
+)
+trend_spike = CachedComponent(
+    "trend_spike", forecast_trend_spike, [],
+    config.DASHBOARD_ML_TTL, config.DASHBOARD_ML_TIMEOUT
+)
+COMPONENTS = [xgb_accuracy, prophet_trend, trend_spike]
+
+
+def resolve_components(components: list = None) -> dict:
+    """
+    Starts every component at once and collects them under one shared
+    deadline, so the wait is bounded by the slowest (or the timeout).
+    """
+    components = components or COMPONENTS
+    pending = [component.start() for component in components]
+    deadline = time.monotonic() + max(component.timeout for component in components)
+    return {
+        component.name: component.result(started, deadline)
+        for component, started in zip(components, pending)
+    }
+
+
+def get_dashboard_metrics() -> dict:
+    ml = resolve_components()
+    kpis = get_inventory_kpis()
+
+    xgb_accuracy_pct = ml["xgb_accuracy"]
+    prophet_increase = ml["prophet_trend"]
+    spike_items = ml["trend_spike"]
+
+    return {
+        **kpis,
+        "xgb_forecast": {
+            "accuracy": xgb_accuracy_pct,
+            "status": "Optimal" if xgb_accuracy_pct > 90 else "Warning"
+        },
+        "prophet_seasonality": {
+            "trend_summary": "Q4 holiday season trend detected",
+            "demand_increase": "{:+.2f}% demand".format(prophet_increase),
+            "status": "Alert" if prophet_increase > 20 else "Stable"
+        },
+        "trend_spike": {
+            "items": len(spike_items),
+            "status": "Action" if len(spike_items) > 0 else "None"
+        }
+    }
@@ -0,0 +1,220 @@
+# core/data_sources.py
+
+import os
+import sqlite3
+from contextlib import closing
+import threading
+import time
+import pandas as pd
+
+from core import config
+from core.column_store import current_version, open_column_store
+
+# Compact dtypes applied to every backend (columns missing from a source are skipped)
+INVENTORY_DTYPES = {
+    "sku": "category",
+    "product_name": "string",
+    "brand": "category",
+    "category": "category",
+    "location": "category",
+    "current_stock": "int32",
+    "required_stock": "int32",
+    "max_capacity": "int32",
+    "price": "float64"
+}
+
+FORECAST_DTYPES = {
+    "sku": "category",
+    "forecast_7d": "int32",
+    "forecast_30d": "int32"
+}
+
+
+# ---------- Backends ----------
+class DataSource:
+    """
+    A backend returns a frame (optionally only some columns) and a cheap
+    version token that changes whenever the underlying data changes. A
+    version of None means the backend cannot tell, so the cache falls back
+    to DATA_CACHE_TTL.
+    """
+
+    def __init__(self, dtypes: dict):
+        self.dtypes = dtypes
+
+    def version(self):
+        return None
+
+    def read(self, columns: list = None) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def load(self, columns: list = None) -> pd.DataFrame:
+        df = self.read(columns)
+        dtypes = {c: t for c, t in self.dtypes.items() if c in df.columns and df[c].dtype != t}
+        return df.astype(dtypes) if dtypes else df
+
+
+class BuiltinSource(DataSource):
+    """
+    Bundled sample data, used until a real source is configured.
+    """
+
+    def __init__(self, data: dict, dtypes: dict):
+        super().__init__(dtypes)
+        self.data = data
+
+    def version(self):
+        return 0
+
+    def read(self, columns=None):
+        df = pd.DataFrame(self.data)
+        return df if columns is None else df[columns]
+
+
+class FileSource(DataSource):
+
+    def __init__(self, path: str, dtypes: dict):
+        super().__init__(dtypes)
+        self.path = path
+
+    def version(self):
+        stat = os.stat(self.path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+
+class CSVSource(FileSource):
+
+    def read(self, columns=None):
+        # dtypes are applied while parsing so categoricals never materialize as objects
+        dtypes = {c: t for c, t in self.dtypes.items() if columns is None or c in columns}
+        return pd.read_csv(self.path, usecols=columns, dtype=dtypes)
+
+
+class ParquetSource(FileSource):
+
+    def read(self, columns=None):
+        return pd.read_parquet(self.path, columns=columns)
+
+
+class SQLSource(DataSource):
+    """
+    Reads a table through sqlite3 for "sqlite" and SQLAlchemy for any
+    other URL.
+    """
+
+    def __init__(self, uri: str, table: str, dtypes: dict, use_sqlalchemy: bool = False):
+        super().__init__(dtypes)
+        self.uri = uri
+        self.table = table
+        self.use_sqlalchemy = use_sqlalchemy
+        self._engine = None
+
+    def version(self):
+        if self.use_sqlalchemy:
+            return None
+        # A write touches the database file or its WAL
+        stats = [os.stat(p) for p in (self.uri, self.uri + "-wal") if os.path.exists(p)]
+        return tuple((s.st_mtime_ns, s.st_size) for s in stats)
+
+    def _query(self, columns):
+        cols = "*" if columns is None else ", ".join('"%s"' % c.replace('"', '""') for c in columns)
+        return 'SELECT %s FROM "%s"' % (cols, self.table.replace('"', '""'))
+
+    def read(self, columns=None):
+        if not self.use_sqlalchemy:
+            # sqlite3's own context manager only ends the transaction
+            with closing(sqlite3.connect(f"file:{self.uri}?mode=ro", uri=True)) as conn:
+                return pd.read_sql_query(self._query(columns), conn)
+
+        if self._engine is None:
+            from sqlalchemy import create_engine  # optional dependency
+            self._engine = create_engine(self.uri)
+        return pd.read_sql_query(self._query(columns), self._engine)
+
+
+class ColumnStoreSource(DataSource):
+    """
+    Memory-mapped columnar snapshot (see core/column_store.py). Columns are
+    stored already typed, so no dtype conversion (and no copy) happens here.
+    """
+
+    def __init__(self, root: str, dtypes: dict):
+        super().__init__(dtypes)
+        self.root = root
+
+    def version(self):
+        return current_version(self.root)
+
+    def load(self, columns=None):
+        return open_column_store(self.root, columns)
+
+
+def create_source(kind: str, uri: str, table: str, dtypes: dict, builtin_data: dict) -> DataSource:
+    if kind == "builtin":
+        return BuiltinSource(builtin_data, dtypes)
+    if kind == "csv":
+        return CSVSource(uri, dtypes)
+    if kind == "parquet":
+        return ParquetSource(uri, dtypes)
+    if kind == "sqlite":
+        return SQLSource(uri, table, dtypes)
+    if kind == "sqlalchemy":
+        return SQLSource(uri, table, dtypes, use_sqlalchemy=True)
+    if kind == "mmap":
+        return ColumnStoreSource(uri, dtypes)
+    raise ValueError(f"Unknown data source: {kind}")
+
+
+# ---------- Process-level Cache ----------
+class CachedLoader:
+    """
+    Keeps loaded frames per column projection for the life of the process.
+    An entry is reused while the source reports the same version token (or,
+    for version-less sources, for DATA_CACHE_TTL seconds). A projection is
+    served from an already cached full frame when possible.
+    """
+
+    def __init__(self, source: DataSource, ttl: float = None):
+        self.source = source
+        self.ttl = config.DATA_CACHE_TTL if ttl is None else ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def version(self):
+        version = self.source.version()
+        if version is None and self.ttl > 0:
+            # Roll the version over every TTL window
+            version = ("ttl", int(time.time() // self.ttl))
+        return version
+
+    def load(self, columns: list = None) -> pd.DataFrame:
+        version = self.version()
+        key = None if columns is None else tuple(columns)
+
+        df = self._lookup(key, version)
+        if df is not None:
+            return df
+
+        with self._lock:
+            df = self._lookup(key, version)
+            if df is None:
+                df = self.source.load(columns)
+                if version is not None:
+                    self._entries = {k: v for k, v in self._entries.items() if v[0] == version}
+                    self._entries[key] = (version, df)
+        return df
+
+    def _lookup(self, key, version):
+        if version is None:
+            return None
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        full = self._entries.get(None)
+        if key is not None and full is not None and full[0] == version:
+            return full[1][list(key)]
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
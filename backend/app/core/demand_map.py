@@ -0,0 +1,427 @@
+# core/demand_map.py
+
+import hashlib
+import json
+import threading
+import time
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+
+from core import config, jobs
+from core.snapshot import current_version, refresh_snapshot
+from core.geocoding import resolve_many
+from core.event_store import get_calendar
+from core.spatial_index import GridIndex
+from models.geo_demand_map import compute_region_spikes, HIGH_SPIKE, MODERATE_SPIKE
+
+# Regions shown as cards on the demand map landing page
+SUMMARY_REGIONS = ["California", "Texas", "New York", "Florida"]
+# Reason shown for a spike with no calendar event behind it
+SPIKE_REASON = "Detected via ML pattern"
+SPIKE_DURATION = "2 days"
+
+# Viewport queries below this zoom return clusters instead of regions
+CLUSTER_MAX_ZOOM = 6
+
+# Inputs that decide a region's spike numbers; a region is recomputed
+# only when the fingerprint of these columns changes
+_INPUT_COLUMNS = ["sku", "forecasted_demand", "required_stock", "current_stock"]
+
+
+class DemandMapTiles:
+    """
+    Materialized demand map for one region level: the per-region spike
+    table, grid cells per zoom level and the pre-encoded endpoint payloads
+    with their ETags. Immutable once built; a refresh builds a new one.
+    """
+
+    def __init__(self, version, level, table, fingerprints, cells, surplus):
+        self.version = version
+        self.level = level
+        self.table = table
+        self.fingerprints = fingerprints
+        self.cells = cells
+        self.surplus = surplus
+
+        # Spatial index over the regions that have coordinates
+        located = table[table["lat"].notna() & table["lng"].notna()]
+        self.located = located
+        self.index = GridIndex(located["lat"].to_numpy(dtype=float), located["lng"].to_numpy(dtype=float))
+        self.built_at = time.time()
+        self._payloads = {}
+        self._payload_lock = threading.Lock()
+
+    def payload(self, key, build, *args) -> tuple:
+        """
+        Returns (json bytes, etag) for `build(self, *args)`, encoded once
+        per tiles and `args`.
+        """
+        key = (key, *args)
+        value = self._payloads.get(key)
+        if value is None:
+            with self._payload_lock:
+                value = self._payloads.get(key)
+                if value is None:
+                    value = encode_payload(build(self, *args))
+                    self._payloads[key] = value
+        return value
+
+
+def encode_payload(payload) -> tuple:
+    """
+    (json bytes, etag) for a payload; the ETag is a hash of the bytes.
+    """
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    return body, '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+
+
+# ---------- Building ----------
+def _region_fingerprints(df: pd.DataFrame, level: str) -> dict:
+    # Order-independent per-region hash of the rows feeding the spike numbers
+    # (uint64 sums wrap around, which is fine for change detection)
+    hashes = pd.util.hash_pandas_object(df[_INPUT_COLUMNS], index=False)
+    sums = hashes.groupby(df[level], observed=True, sort=False).sum()
+    return dict(zip(sums.index.astype(str), sums.to_numpy().tolist()))
+
+
+def _sku_surplus(df: pd.DataFrame, level: str) -> pd.Series:
+    # Whole units above required stock per (sku, region), at least one,
+    # sorted so that per-SKU lookups are binary searches. Forecasts are the
+    # snapshot's integer ones, so surplus matches the inventory matrix.
+    required = np.maximum(df["forecasted_demand"].to_numpy(), df["required_stock"].to_numpy())
+    units = np.floor(df["current_stock"].to_numpy() - required).astype(np.int64)
+    has_surplus = units >= 1
+    return pd.Series(units[has_surplus]).groupby(
+        [df["sku"].astype(str).to_numpy()[has_surplus], df[level].astype(str).to_numpy()[has_surplus]]
+    ).sum().rename_axis(["sku", "region"])
+
+
+def _scored_inventory() -> tuple:
+    # (version, rows) from the shared snapshot, brought up to date first:
+    # no model pass of its own, and the same integer forecasts as the
+    # inventory matrix. Spikes compare against the required stock as loaded.
+    snapshot = refresh_snapshot()
+    columns = [column for column in snapshot.frame.columns if column != "required_stock"]
+    df = snapshot.frame[columns].rename(columns={"source_required_stock": "required_stock"})
+    return snapshot.version, df
+
+
+def _with_coordinates(table: pd.DataFrame) -> pd.DataFrame:
+    regions = [str(region) for region in table.index]
+    coords = resolve_many(regions)
+    return table.assign(
+        lat=[coords[region]["lat"] for region in regions],
+        lng=[coords[region]["lng"] for region in regions]
+    )
+
+
+def build_cells(table: pd.DataFrame, zoom: int) -> pd.DataFrame:
+    """
+    Aggregates the region table into a lat/lng grid of 360 / 2**zoom degree
+    cells: summed demand, recomputed spike level and a demand-weighted centre.
+    """
+    located = table[table["lat"].notna() & table["lng"].notna()]
+    size = 360.0 / (2 ** zoom)
+    lat = located["lat"].to_numpy(dtype=float)
+    lng = located["lng"].to_numpy(dtype=float)
+    weight = np.maximum(located["forecasted_demand"].to_numpy(dtype=float), 1)
+
+    cells = pd.DataFrame({
+        "x": np.floor((lng + 180) / size).astype(int),
+        "y": np.floor((lat + 90) / size).astype(int),
+        "forecasted_demand": located["forecasted_demand"].to_numpy(dtype=float),
+        "required_stock": located["required_stock"].to_numpy(dtype=float),
+        "lat_w": lat * weight,
+        "lng_w": lng * weight,
+        "weight": weight,
+        "spike_regions": located["is_spike"].to_numpy().astype(int),
+        "regions": 1
+    }).groupby(["x", "y"], sort=True).sum()
+
+    required = cells["required_stock"].to_numpy()
+    spike = np.round(100 * (cells["forecasted_demand"].to_numpy() - required) / np.maximum(required, 1), 2)
+    cells["lat"] = cells["lat_w"] / cells["weight"]
+    cells["lng"] = cells["lng_w"] / cells["weight"]
+    cells["spike_percent"] = spike
+    cells["demand_level"] = np.select([spike > HIGH_SPIKE, spike > MODERATE_SPIKE], ["High", "Moderate"], "Mild")
+    cells["zoom"] = zoom
+    return cells.drop(columns=["lat_w", "lng_w", "weight"]).reset_index()
+
+
+def build_tiles(level: str = "location", previous: DemandMapTiles = None) -> DemandMapTiles:
+    """
+    Materializes the demand map. With `previous`, only regions whose
+    inventory or forecast rows changed are recomputed and re-geocoded;
+    the rest are carried over. Grid cells are re-aggregated from the
+    (small) region table.
+    """
+    version, df = _scored_inventory()
+    fingerprints = _region_fingerprints(df, level)
+
+    if previous is not None:
+        changed = [region for region, fp in fingerprints.items() if previous.fingerprints.get(region) != fp]
+        unchanged = fingerprints.keys() - set(changed)
+        kept = previous.table[previous.table.index.isin(unchanged)]
+        kept_surplus = previous.surplus[previous.surplus.index.get_level_values("region").isin(unchanged)]
+        rows = df[df[level].astype(str).isin(changed)]
+    else:
+        changed, kept, kept_surplus, rows = list(fingerprints), None, None, df
+
+    fresh = compute_region_spikes(rows, level=level) if len(changed) else None
+    if fresh is not None:
+        fresh = _with_coordinates(fresh)
+    parts = [part for part in (kept, fresh) if part is not None and len(part)]
+    table = pd.concat(parts) if parts else compute_region_spikes(df.iloc[:0], level=level).assign(lat=[], lng=[])
+    table.index = table.index.astype(str)
+    # Carried-over and recomputed regions back in region order
+    table = table.sort_index(kind="stable")
+
+    surplus_parts = [part for part in (kept_surplus, _sku_surplus(rows, level)) if part is not None]
+    surplus = pd.concat(surplus_parts).sort_index()
+    table["surplus_units"] = surplus.groupby(level="region").sum().reindex(table.index, fill_value=0)
+
+    cells = {zoom: build_cells(table, zoom) for zoom in config.DEMAND_MAP_ZOOM_LEVELS}
+    tiles = DemandMapTiles(version, level, table, fingerprints, cells, surplus)
+    tiles.recomputed_regions = len(changed)
+    return tiles
+
+
+# ---------- Event Reasons ----------
+def event_context() -> tuple:
+    """
+    (calendar, today) that spike reasons are looked up against. Payloads
+    carrying reasons are cached per tiles and context, so an event ingest
+    or a new day re-encodes them.
+    """
+    return get_calendar(), date.today()
+
+
+def _event_reason(event: dict) -> tuple:
+    start = date.fromisoformat(event["date"])
+    days = (date.fromisoformat(event["end_date"] or event["date"]) - start).days + 1
+    return f"{event['event_name']} ({event['expected_impact']})", f"{days} day{'s' if days > 1 else ''}"
+
+
+def spike_reasons(regions, context: tuple = None) -> dict:
+    """
+    region -> (reason, duration): the first calendar event in the region
+    running within DEMAND_MAP_EVENT_WINDOW_DAYS (e.g. "Black Friday (+59%
+    demand)", "1 day"), or the generic ML reason when there is none.
+    """
+    calendar, today = context or event_context()
+    regions = [str(region) for region in regions]
+    reasons = {}
+    if regions:
+        window_end = today + timedelta(days=config.DEMAND_MAP_EVENT_WINDOW_DAYS)
+        for event in calendar.query(today, window_end, regions=regions):
+            reasons.setdefault(event["region"], _event_reason(event))
+    return {region: reasons.get(region, (SPIKE_REASON, SPIKE_DURATION)) for region in regions}
+
+
+# ---------- Payloads ----------
+def _spike_entries(spikes: pd.DataFrame, context: tuple = None) -> list:
+    reasons = spike_reasons(spikes.index, context)
+    return [
+        {
+            "region": region,
+            "lat": lat,
+            "lng": lng,
+            "spike_percent": float(spike_pct),
+            "demand_level": demand_level,
+            "reason": reasons[region][0],
+            "duration": reasons[region][1],
+            "products": products
+        }
+        for region, lat, lng, spike_pct, demand_level, products in zip(
+            spikes.index, spikes["lat"], spikes["lng"], spikes["spike_percent"],
+            spikes["demand_level"], spikes["products"]
+        )
+    ]
+
+
+def spikes_payload(tiles: DemandMapTiles, context: tuple = None) -> dict:
+    return {"regions": [
+        {
+            "region": entry["region"],
+            "demand_level": entry["demand_level"],
+            "spike_percentage": entry["spike_percent"],
+            "reason": entry["reason"],
+            "duration": entry["duration"],
+            "affected_products": entry["products"]
+        }
+        for entry in _spike_entries(tiles.table[tiles.table["is_spike"]], context)
+    ]}
+
+
+def summary_cards_payload(tiles: DemandMapTiles, context: tuple = None) -> list:
+    # Regions without inventory show up as flat, non-spiking cards
+    table = tiles.table.reindex(SUMMARY_REGIONS)
+    spike_pct = table["spike_percent"].fillna(0.0)
+    demand_level = table["demand_level"].fillna("Mild")
+    is_spike = table["is_spike"].fillna(False).astype(bool)
+    reasons = spike_reasons(table.index[is_spike.to_numpy()], context)
+    return [
+        {
+            "region": region,
+            "spike_percentage": float(pct),
+            "reason": reasons[region][0] if spiking else "No spike detected",
+            "duration": reasons[region][1] if spiking else "-",
+            "demand_level": level
+        }
+        for region, pct, level, spiking in zip(SUMMARY_REGIONS, spike_pct, demand_level, is_spike)
+    ]
+
+
+def overlay_payload(tiles: DemandMapTiles, context: tuple = None) -> list:
+    return _spike_entries(tiles.table[tiles.table["is_spike"]], context)
+
+
+def cells_payload(zoom: int):
+    def build(tiles: DemandMapTiles) -> list:
+        cells = tiles.cells[zoom]
+        return [
+            {
+                "zoom": zoom, "x": int(x), "y": int(y), "lat": float(lat), "lng": float(lng),
+                "regions": int(regions), "spike_regions": int(spike_regions),
+                "spike_percent": float(spike_pct), "demand_level": demand_level
+            }
+            for x, y, lat, lng, regions, spike_regions, spike_pct, demand_level in zip(
+                cells["x"], cells["y"], cells["lat"], cells["lng"], cells["regions"],
+                cells["spike_regions"], cells["spike_percent"], cells["demand_level"]
+            )
+        ]
+    return build
+
+
+def viewport_payload(tiles: DemandMapTiles, bbox: tuple, zoom: int = None, context: tuple = None) -> list:
+    """
+    Spiking regions inside `bbox` (south, west, north, east). Below
+    CLUSTER_MAX_ZOOM they are merged into clusters per zoom-level grid
+    cell. Work is proportional to the regions in view.
+    """
+    located = tiles.located
+    in_view = located.iloc[tiles.index.query_bbox(*bbox)]
+    spikes = in_view[in_view["is_spike"]]
+
+    if zoom is None or zoom >= CLUSTER_MAX_ZOOM:
+        return _spike_entries(spikes, context)
+
+    size = 360.0 / (2 ** zoom)
+    lat = spikes["lat"].to_numpy(dtype=float)
+    lng = spikes["lng"].to_numpy(dtype=float)
+    clusters = pd.DataFrame({
+        "x": np.floor((lng + 180) / size).astype(int),
+        "y": np.floor((lat + 90) / size).astype(int),
+        "lat": lat, "lng": lng,
+        "spike_percent": spikes["spike_percent"].to_numpy(dtype=float),
+        "region": spikes.index.to_numpy()
+    }).sort_values("spike_percent", ascending=False, kind="stable").groupby(["x", "y"], sort=True).agg(
+        lat=("lat", "mean"), lng=("lng", "mean"), count=("region", "size"),
+        spike_percent=("spike_percent", "first"), top_region=("region", "first")
+    )
+    spike = clusters["spike_percent"].to_numpy()
+    levels = np.select([spike > HIGH_SPIKE, spike > MODERATE_SPIKE], ["High", "Moderate"], "Mild")
+    return [
+        {
+            "cluster": True, "zoom": zoom, "x": int(x), "y": int(y), "lat": float(lat), "lng": float(lng),
+            "count": int(count), "spike_percent": float(spike_pct), "demand_level": demand_level,
+            "top_region": top_region
+        }
+        for (x, y), lat, lng, count, spike_pct, demand_level, top_region in zip(
+            clusters.index, clusters["lat"], clusters["lng"], clusters["count"],
+            clusters["spike_percent"], levels, clusters["top_region"]
+        )
+    ]
+
+
+def nearest_surplus(tiles: DemandMapTiles, region: str, k: int = 5, skus: list = None) -> dict:
+    """
+    The k warehouses (regions) closest to `region` holding surplus stock of
+    `skus`, which default to the region's spiking products. Raises
+    KeyError for an unknown or unlocated region.
+    """
+    if region not in tiles.located.index:
+        raise KeyError(region)
+    origin = tiles.located.loc[region]
+    skus = list(skus or origin["products"])
+
+    if skus:
+        # Not index.levels: after an incremental refresh they keep SKUs
+        # whose surplus rows were dropped
+        present = list(tiles.surplus.index.get_level_values("sku").unique().intersection(skus))
+        units = tiles.surplus.loc[present].groupby(level="region").sum() if present else pd.Series(dtype=float)
+    else:
+        units = tiles.table["surplus_units"]
+        units = units[units > 0]
+
+    names = tiles.located.index
+    mask = names.isin(units.index) & (names != region)
+    positions, distances = tiles.index.nearest(float(origin["lat"]), float(origin["lng"]), k, mask)
+    warehouses = tiles.located.iloc[positions]
+    return {
+        "region": region,
+        "products": skus,
+        "warehouses": [
+            {
+                "region": name, "lat": float(lat), "lng": float(lng),
+                "distance_km": round(float(distance), 1), "surplus_units": int(units[name])
+            }
+            for name, lat, lng, distance in zip(warehouses.index, warehouses["lat"], warehouses["lng"], distances)
+        ]
+    }
+
+
+# ---------- Materializer ----------
+# One tiles object per region level, refreshed in the background
+_tiles = {}
+_refresh_lock = threading.Lock()
+
+# Counters exposed for monitoring the materializer
+materializer_stats = {"refreshes": 0, "recomputed_regions": 0, "stale_served": 0}
+
+
+def refresh_tiles(level: str = "location") -> DemandMapTiles:
+    """
+    Rebuilds the tiles for `level` if the data or model version moved.
+    """
+    with _refresh_lock:
+        tiles = _tiles.get(level)
+        if tiles is not None and tiles.version == current_version():
+            return tiles
+        tiles = build_tiles(level, previous=tiles)
+        _tiles[level] = tiles
+        materializer_stats["refreshes"] += 1
+        materializer_stats["recomputed_regions"] += tiles.recomputed_regions
+        return tiles
+
+
+def get_tiles(level: str = "location") -> DemandMapTiles:
+    """
+    Current tiles for `level`. Outdated tiles are still served while the
+    "materialize" job (see core/jobs.py) refreshes them; only the very
+    first call, or one without the scheduler, builds inline.
+    """
+    tiles = _tiles.get(level)
+    if tiles is None:
+        return refresh_tiles(level)
+    if tiles.version != current_version():
+        if jobs.trigger("materialize") is None:
+            return refresh_tiles(level)
+        materializer_stats["stale_served"] += 1
+    return tiles
+
+
+def refresh_all():
+    """
+    Refreshes every level served so far. A level that fails keeps its
+    previous tiles; the first error is raised once all levels were tried.
+    """
+    errors = []
+    for level in list(_tiles) or ["location"]:
+        try:
+            refresh_tiles(level)
+        except Exception as exc:
+            errors.append(exc)
+    if errors:
+        raise errors[0]
@@ -0,0 +1,155 @@
+# core/event_store.py
+
+import threading
+from typing import List
+import numpy as np
+
+from models.event_model import UPCOMING_EVENTS, score_event_impacts, impact_label
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def _day(value) -> np.datetime64:
+    return np.datetime64(value, "D")
+
+
+def _span_class(spans: np.ndarray) -> np.ndarray:
+    # 0 for single-day events, k for spans of [2**(k-1), 2**k) days
+    days = spans.astype(np.int64)
+    return np.where(days > 0, np.floor(np.log2(np.maximum(days, 1))).astype(np.int64) + 1, 0)
+
+
+def _postings(events: list, values_of) -> dict:
+    postings = {}
+    for position, event in enumerate(events):
+        for value in values_of(event):
+            postings.setdefault(value, []).append(position)
+    return {value: np.array(positions, dtype=np.int64) for value, positions in postings.items()}
+
+
+def _lookup(postings: dict, values: List[str]) -> np.ndarray:
+    # OR within a filter
+    found = [postings[v] for v in values if v in postings]
+    if not found:
+        return _EMPTY
+    return found[0] if len(found) == 1 else np.unique(np.concatenate(found))
+
+
+class _SpanBucket:
+    """
+    The events of one span class, sorted by start date, with their own
+    region and category posting lists (local positions). Spans in a class
+    differ by less than 2x, so widening a window by the class's longest
+    span only adds events about as long as the ones that match.
+    """
+
+    def __init__(self, positions: np.ndarray, starts: np.ndarray, ends: np.ndarray, events: list):
+        self.positions = positions
+        self.starts = starts[positions]
+        self.ends = ends[positions]
+        self.max_span = (self.ends - self.starts).max()
+        members = [events[i] for i in positions]
+        self.by_region = _postings(members, lambda e: [e["region"]])
+        self.by_category = _postings(members, lambda e: e.get("categories") or [])
+
+    def query(self, start, end, regions, categories) -> np.ndarray:
+        # Calendar positions of this bucket's matches
+        lo, hi = 0, len(self.positions)
+        if end is not None:
+            hi = int(np.searchsorted(self.starts, end, side="right"))
+        if start is not None:
+            lo = int(np.searchsorted(self.starts, start - self.max_span, side="left"))
+        # Filters narrow their posting lists to the date range first, so the
+        # work is bounded by the matches rather than the bucket size
+        local = None
+        for postings, values in ((self.by_region, regions), (self.by_category, categories)):
+            if values:
+                matches = _lookup(postings, values)
+                matches = matches[np.searchsorted(matches, lo):np.searchsorted(matches, hi)]
+                local = matches if local is None else np.intersect1d(local, matches, assume_unique=True)
+        if local is None:
+            local = np.arange(lo, max(lo, hi))
+        if start is not None:
+            local = local[self.ends[local] >= start]
+        return self.positions[local]
+
+
+class EventCalendar:
+    """
+    Immutable, indexed event calendar. Events are sorted by start date and
+    split into buckets by span (single-day, then power-of-two day ranges).
+    A date window is two binary searches per bucket, widened by that
+    bucket's longest span, so one long event does not widen the search
+    for all the others. Region and category filters intersect sorted
+    posting lists. expected_impact is scored once when the calendar is
+    built; an event ending before it starts is rejected with ValueError.
+    """
+
+    def __init__(self, events: list):
+        events = [dict(event) for event in events]
+        for event in events:
+            event.setdefault("end_date", None)
+
+        starts = np.array([_day(e["date"]) for e in events], dtype="datetime64[D]")
+        ends = np.array([_day(e["end_date"] or e["date"]) for e in events], dtype="datetime64[D]")
+        backwards = np.flatnonzero(ends < starts)
+        if len(backwards):
+            event = events[backwards[0]]
+            raise ValueError(f"end_date {event['end_date']} is before date {event['date']} ({event['event_name']})")
+
+        impacts = score_event_impacts(
+            [e["region"] for e in events], [e["event_type"] for e in events], [e["score"] for e in events]
+        )
+        for event, multiplier in zip(events, impacts["demand_multiplier"]):
+            event["expected_impact"] = impact_label(multiplier)
+
+        order = np.argsort(starts, kind="stable")
+        self.events = [events[i] for i in order]
+        self.starts = starts[order]
+        self.ends = ends[order]
+
+        classes = _span_class((self.ends - self.starts).astype(np.int64))
+        self.buckets = [
+            _SpanBucket(np.flatnonzero(classes == span_class), self.starts, self.ends, self.events)
+            for span_class in np.unique(classes)
+        ]
+
+    def query(self, start=None, end=None, regions: List[str] = None, categories: List[str] = None) -> list:
+        """
+        Events overlapping [start, end] (either bound optional) that match
+        any of `regions` and any of `categories`, in start-date order.
+        """
+        start = None if start is None else _day(start)
+        end = None if end is None else _day(end)
+        found = [bucket.query(start, end, regions, categories) for bucket in self.buckets]
+        if not found:
+            return []
+        # Calendar positions follow start-date order
+        positions = found[0] if len(found) == 1 else np.sort(np.concatenate(found))
+        return [self.events[i] for i in positions]
+
+
+# -- Process calendar, built from the bundled events on first use
+_calendar = None
+_lock = threading.Lock()
+
+
+def get_calendar() -> EventCalendar:
+    global _calendar
+    if _calendar is None:
+        with _lock:
+            if _calendar is None:
+                _calendar = EventCalendar(UPCOMING_EVENTS)
+    return _calendar
+
+
+def ingest_events(events: list) -> EventCalendar:
+    """
+    Adds events to the calendar: the new calendar is built (and scored)
+    off to the side, then swapped in.
+    """
+    global _calendar
+    with _lock:
+        current = _calendar.events if _calendar is not None else UPCOMING_EVENTS
+        _calendar = EventCalendar(list(current) + list(events))
+        return _calendar
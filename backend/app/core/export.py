@@ -0,0 +1,132 @@
+# core/export.py
+
+import io
+import zlib
+from typing import Iterator
+import pandas as pd
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+# Rows serialized per chunk; bounds the memory held by one export
+DEFAULT_CHUNK_ROWS = 50_000
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet")
+}
+
+
+# ---------- Chunk Encoders ----------
+def _chunks(df: pd.DataFrame, chunk_rows: int, columns: list = None) -> Iterator[pd.DataFrame]:
+    # Columns are projected per chunk so the export never copies the whole frame
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield chunk if columns is None else chunk[columns]
+
+
+def iter_csv(df: pd.DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS, columns: list = None) -> Iterator[bytes]:
+    # Header goes out with the first chunk (or alone for an empty frame)
+    if df.empty:
+        yield (df if columns is None else df[columns]).to_csv(index=False).encode()
+        return
+    for i, chunk in enumerate(_chunks(df, chunk_rows, columns)):
+        yield chunk.to_csv(index=False, header=i == 0).encode()
+
+
+def iter_ndjson(df: pd.DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS, columns: list = None) -> Iterator[bytes]:
+    for chunk in _chunks(df, chunk_rows, columns):
+        lines = chunk.to_json(orient="records", lines=True, force_ascii=False)
+        yield (lines if lines.endswith("\n") else lines + "\n").encode()
+
+
+class _ParquetSink(io.RawIOBase):
+    """
+    Write-only file that hands out what was written since the last drain,
+    while reporting the absolute position the Parquet writer relies on.
+    """
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def iter_parquet(df: pd.DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS, columns: list = None) -> Iterator[bytes]:
+    # One row group per chunk; pyarrow is only needed for this format
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ParquetSink()
+    schema = pa.Schema.from_pandas(df.iloc[:0] if columns is None else df.iloc[:0][columns], preserve_index=False)
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in _chunks(df, chunk_rows, columns):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield sink.drain()
+    yield sink.drain()
+
+
+_ENCODERS = {"csv": iter_csv, "ndjson": iter_ndjson, "parquet": iter_parquet}
+
+
+def gzip_chunks(chunks: Iterator[bytes], level: int = 6) -> Iterator[bytes]:
+    """
+    Compresses a byte stream on the fly into a single gzip member.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+# ---------- Streaming Response ----------
+def export_response(df: pd.DataFrame, basename: str, export_format: str = "csv", gzip: bool = False,
+                    columns: list = None, chunk_rows: int = DEFAULT_CHUNK_ROWS, slot=None) -> StreamingResponse:
+    """
+    Streams `df` as csv / ndjson / parquet, chunk by chunk, so only one
+    encoded batch is held in memory and the first bytes leave immediately.
+    With a `slot` reserved on a stage (see core/stages.py), chunks are
+    encoded on that stage's pool and the export holds the slot until sent.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {list(EXPORT_FORMATS)}")
+    if export_format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+
+    media_type, extension = EXPORT_FORMATS[export_format]
+    filename = f"{basename}.{extension}"
+    chunks = _ENCODERS[export_format](df, chunk_rows, columns)
+
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        media_type = "application/gzip"
+        filename += ".gz"
+    if slot is not None:
+        chunks = slot.stage.stream(chunks, slot)
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
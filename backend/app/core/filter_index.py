@@ -0,0 +1,56 @@
+# core/filter_index.py
+
+import numpy as np
+import pandas as pd
+
+# Dimensions the inventory matrix can be filtered on
+FILTER_COLUMNS = ["brand", "category", "location", "status"]
+
+
+def build_filter_index(df: pd.DataFrame) -> dict:
+    """
+    Inverted index over the filter dimensions:
+    {column: {value: sorted np.ndarray of row positions}}
+
+    Built once per snapshot with one stable argsort of the category codes
+    per column, so a lookup never scans the frame.
+    """
+    index = {}
+    for column in FILTER_COLUMNS:
+        codes, uniques = pd.factorize(df[column], sort=False)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        index[column] = {
+            str(value): order[bounds[i]:bounds[i + 1]]
+            for i, value in enumerate(uniques)
+        }
+    return index
+
+
+def select_rows(index: dict, filters: dict):
+    """
+    Row positions matching every filter, or None when no filter is set.
+    `filters` maps a column to the list of accepted values: values of the
+    same column are OR-ed, columns are AND-ed. Cost depends on the size of
+    the posting lists involved, not on the size of the catalogue.
+    """
+    empty = np.empty(0, dtype=np.int64)
+    selections = []
+    for column, values in filters.items():
+        if not values:
+            continue
+        postings = [index[column].get(value, empty) for value in set(values)]
+        rows = postings[0] if len(postings) == 1 else np.sort(np.concatenate(postings))
+        selections.append(rows)
+
+    if not selections:
+        return None
+
+    # Intersect smallest-first so the work is bounded by the most selective filter
+    selections.sort(key=len)
+    selected = selections[0]
+    for rows in selections[1:]:
+        if not len(selected):
+            break
+        selected = np.intersect1d(selected, rows, assume_unique=True)
+    return selected
@@ -0,0 +1,302 @@
+# core/forecast_store.py
+
+import itertools
+import os
+import re
+import threading
+import time
+from datetime import date
+import numpy as np
+import pandas as pd
+
+from core import config
+
+# The demand model predicts a 7-day window (see models/xgb_model.predict_demand)
+MODEL_HORIZON_DAYS = 7
+_HORIZON_COLUMN = re.compile(r"forecast_(\d+)d")
+
+
+def horizon_column(days: int) -> str:
+    return f"forecast_{days}d"
+
+
+# ---------- Store ----------
+# Rows allocated the first time the store grows; later growth doubles
+_MIN_CAPACITY = 1024
+
+
+class _State:
+    # One generation of the store: the first `n` rows of the backing arrays.
+    # Rows past `n` are spare capacity that `put` fills before publishing a
+    # generation with a larger `n`, so readers of this one never see them.
+    def __init__(self, skus: list, rows: dict, values: np.ndarray, as_of: np.ndarray,
+                 version_codes: np.ndarray, versions: list, n: int):
+        self.skus = skus
+        self.rows = rows
+        self.values = values
+        self.as_of = as_of
+        self.version_codes = version_codes
+        self.versions = versions
+        self.n = n
+        self.frame = None  # bulk frame, built on first use
+
+    def position(self, sku: str) -> int:
+        i = self.rows.get(sku, -1)
+        return i if i < self.n else -1
+
+    def positions(self, skus: list) -> np.ndarray:
+        positions = np.array([self.rows.get(sku, -1) for sku in skus], dtype=np.int64)
+        positions[positions >= self.n] = -1
+        return positions
+
+
+def _grown(array: np.ndarray, capacity: int, fill) -> np.ndarray:
+    grown = np.full((capacity,) + array.shape[1:], fill, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class ForecastStore:
+    """
+    Precomputed per-SKU forecasts for every configured horizon, one matrix
+    row per SKU. Each row records the model version and as-of date it was
+    computed for, and is stale once either moves on. A single SKU is one
+    dict lookup; many SKUs are one fancy index. Persisted as an .npz file.
+
+    Writes update rows in place and append new SKUs into spare capacity
+    (doubled when full), so a batch costs its own size; a reader may see
+    a refreshed row before its version stamp. SKUs that leave the
+    catalogue are dropped by `prune`.
+    """
+
+    def __init__(self, path: str, horizons: list):
+        self.path = path
+        self.horizons = list(horizons)
+        self.columns = [horizon_column(h) for h in self.horizons]
+        self._state = _State([], {}, np.zeros((0, len(self.horizons))),
+                             np.zeros(0, dtype="datetime64[D]"), np.zeros(0, dtype=np.int32), [], 0)
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def empty(self) -> bool:
+        return self._state.n == 0
+
+    # -- Reads
+    def get(self, sku: str) -> dict:
+        state = self._state
+        i = state.position(sku)
+        if i < 0:
+            return None
+        return dict(zip(self.columns, state.values[i].tolist()))
+
+    def bulk(self, skus: list, columns: list = None) -> pd.DataFrame:
+        """
+        Forecasts for `skus` in the given order (NaN for unknown SKUs).
+        """
+        state = self._state
+        columns = columns or self.columns
+        positions = state.positions(skus)
+        picked = [self.columns.index(c) for c in columns]
+        values = state.values[np.maximum(positions, 0)][:, picked]
+        values[positions < 0] = np.nan
+        frame = pd.DataFrame(values, columns=columns)
+        frame.insert(0, "sku", list(skus))
+        return frame
+
+    def frame(self, columns: list = None) -> pd.DataFrame:
+        """
+        Every stored SKU (the shape load_forecast_data returns).
+        """
+        state = self._state
+        if state.frame is None:
+            frame = pd.DataFrame(state.values[:state.n].copy(), columns=self.columns)
+            frame.insert(0, "sku", pd.Categorical(state.skus[:state.n]))
+            state.frame = frame
+        return state.frame[columns] if columns else state.frame
+
+    def stale(self, skus: list, version: str, as_of: date) -> list:
+        """
+        SKUs that are missing or were computed for another version or day.
+        """
+        state = self._state
+        day = np.datetime64(as_of, "D")
+        current = state.versions.index(version) if version in state.versions else -1
+        positions = state.positions(skus)
+        known = positions >= 0
+        fresh = np.zeros(len(skus), dtype=bool)
+        fresh[known] = (state.as_of[positions[known]] == day) & (state.version_codes[positions[known]] == current)
+        return [sku for sku, ok in zip(skus, fresh) if not ok]
+
+    # -- Writes
+    def put(self, forecasts: pd.DataFrame, version: str, as_of: date):
+        """
+        Upserts rows of sku plus one column per horizon.
+        """
+        with self._lock:
+            state = self._state
+            skus = forecasts["sku"].astype(str).tolist()
+            rows = state.rows
+            new = [sku for sku in dict.fromkeys(skus) if sku not in rows]
+            n = state.n + len(new)
+
+            values, as_of_days, version_codes = state.values, state.as_of, state.version_codes
+            if n > len(values):
+                capacity = max(n, 2 * len(values), _MIN_CAPACITY)
+                values = _grown(values, capacity, 0.0)
+                as_of_days = _grown(as_of_days, capacity, np.datetime64(0, "D"))
+                version_codes = _grown(version_codes, capacity, -1)
+            versions = state.versions
+            if version not in versions:
+                versions.append(version)
+
+            # New rows are written before their SKUs become visible in `rows`
+            added = dict(zip(new, range(state.n, n)))
+            positions = np.array([rows[sku] if sku in rows else added[sku] for sku in skus], dtype=np.int64)
+            values[positions] = forecasts[self.columns].to_numpy(dtype=float)
+            as_of_days[positions] = np.datetime64(as_of, "D")
+            version_codes[positions] = versions.index(version)
+            state.skus.extend(new)
+            rows.update(added)
+
+            self._state = _State(state.skus, rows, values, as_of_days, version_codes, versions, n)
+
+    def prune(self, skus) -> int:
+        """
+        Drops the SKUs that are not in `skus` (the current catalogue).
+        Returns how many were dropped.
+        """
+        with self._lock:
+            state = self._state
+            catalogue = set(skus)
+            keep = np.fromiter((sku in catalogue for sku in state.skus[:state.n]), dtype=bool, count=state.n)
+            dropped = state.n - int(keep.sum())
+            if dropped:
+                kept = list(itertools.compress(state.skus, keep))
+                self._state = _State(
+                    kept, dict(zip(kept, range(len(kept)))), state.values[:state.n][keep],
+                    state.as_of[:state.n][keep], state.version_codes[:state.n][keep],
+                    list(state.versions), len(kept)
+                )
+            return dropped
+
+    def save(self):
+        state = self._state
+        n = state.n
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        staging = f"{self.path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            staging, horizons=np.array(self.horizons), skus=np.array(state.skus[:n], dtype=str),
+            values=state.values[:n], as_of=state.as_of[:n], version_codes=state.version_codes[:n],
+            versions=np.array(state.versions, dtype=str)
+        )
+        os.replace(staging, self.path)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with np.load(self.path) as saved:
+            if saved["horizons"].tolist() != self.horizons:
+                return  # horizons changed: recompute everything
+            skus = saved["skus"].tolist()
+            self._state = _State(
+                skus, dict(zip(skus, range(len(skus)))), saved["values"], saved["as_of"],
+                saved["version_codes"], saved["versions"].tolist(), len(skus)
+            )
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_forecast_store() -> ForecastStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ForecastStore(config.FORECAST_STORE_PATH, config.FORECAST_HORIZONS)
+        return _store
+
+
+# ---------- Computation ----------
+def current_version() -> str:
+    """
+    Forecasts depend on the demand model and on the forecast feed.
+    """
+    from core.utils import get_forecast_loader  # to avoid circular import at top-level
+    from models.xgb_model import get_model_version
+    return f"{get_model_version()}|{get_forecast_loader().version()}"
+
+
+def compute_forecasts(skus: list, horizons: list) -> pd.DataFrame:
+    """
+    One row per SKU with forecast_<h>d for every horizon. A horizon present
+    in the forecast feed is taken from it; others scale the daily rate of
+    the nearest feed horizon, or of the demand model for SKUs the feed
+    does not cover.
+    """
+    from core.utils import get_forecast_loader, load_inventory_data  # to avoid circular import at top-level
+    from models.xgb_model import predict_features, feature_cols
+
+    index = pd.Index(skus, name="sku")
+    feed = get_forecast_loader().load()
+    feed = feed.set_index(feed["sku"].astype(str))
+    feed = feed[~feed.index.duplicated()].reindex(index)
+    feed_horizons = sorted(
+        int(match.group(1)) for match in map(_HORIZON_COLUMN.fullmatch, feed.columns) if match
+    )
+
+    inventory_df = load_inventory_data(["sku"] + feature_cols)
+    inventory_df = inventory_df[inventory_df["sku"].astype(str).isin(index)]
+    # A subset of the catalogue: leave the full-catalogue fast path alone
+    predicted = pd.Series(
+        predict_features(inventory_df, remember=False), index=inventory_df["sku"].astype(str).to_numpy()
+    )
+    model_rate = predicted.groupby(level=0).mean().reindex(index).to_numpy(dtype=float) / MODEL_HORIZON_DAYS
+
+    out = pd.DataFrame(index=index)
+    for h in horizons:
+        column = horizon_column(h)
+        value = np.full(len(index), np.nan)
+        if column in feed:
+            value = feed[column].to_numpy(dtype=float)
+        # Fill from the nearest feed horizon, then from the model
+        for nearest in sorted(feed_horizons, key=lambda f: abs(f - h)):
+            rate = feed[horizon_column(nearest)].to_numpy(dtype=float) / nearest
+            value = np.where(np.isnan(value), rate * h, value)
+        value = np.where(np.isnan(value), model_rate * h, value)
+        out[column] = np.nan_to_num(np.round(value, 2))
+    return out.reset_index()
+
+
+# ---------- Refresh Job ----------
+refresh_stats = {"runs": 0, "refreshed": 0, "last_seconds": None, "last_run": None}
+
+
+def refresh_stale(batch_size: int = None) -> dict:
+    """
+    Recomputes forecasts only for SKUs that are new or stale (other model
+    or feed version, or an earlier as-of date), in batches, drops SKUs no
+    longer in the inventory, then persists the store. Run periodically by the "forecasts" job (see core/jobs.py).
+    """
+    from core.utils import load_inventory_data  # to avoid circular import at top-level
+    batch_size = batch_size or config.FORECAST_REFRESH_BATCH
+    store = get_forecast_store()
+    started = time.perf_counter()
+
+    version, today = current_version(), date.today()
+    skus = load_inventory_data(["sku"])["sku"].astype(str).unique().tolist()
+    pruned = store.prune(skus)
+    stale = store.stale(skus, version, today)
+    for start in range(0, len(stale), batch_size):
+        batch = stale[start:start + batch_size]
+        store.put(compute_forecasts(batch, store.horizons), version, today)
+    if stale or pruned:
+        store.save()
+
+    refresh_stats.update(
+        runs=refresh_stats["runs"] + 1, refreshed=refresh_stats["refreshed"] + len(stale),
+        last_seconds=round(time.perf_counter() - started, 3), last_run=time.time()
+    )
+    return {"skus": len(skus), "refreshed": len(stale), "pruned": pruned, "seconds": refresh_stats["last_seconds"]}
+
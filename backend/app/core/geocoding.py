@@ -0,0 +1,199 @@
+# core/geocoding.py
+
+import asyncio
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Dict, List
+import httpx
+
+from core import config
+from core.jobs import scheduler
+
+# Offline fallback: approximate centroids for the regions the app ships with
+GAZETTEER = {
+    "Alabama": (32.81, -86.79), "Alaska": (61.37, -152.40), "Arizona": (33.73, -111.43),
+    "Arkansas": (34.97, -92.37), "California": (36.78, -119.42), "Colorado": (39.06, -105.31),
+    "Connecticut": (41.60, -72.76), "Delaware": (39.32, -75.51), "Florida": (27.77, -81.69),
+    "Georgia": (33.04, -83.64), "Hawaii": (21.09, -157.50), "Idaho": (44.24, -114.48),
+    "Illinois": (40.35, -88.99), "Indiana": (39.85, -86.26), "Iowa": (42.01, -93.21),
+    "Kansas": (38.53, -96.73), "Kentucky": (37.67, -84.67), "Louisiana": (31.17, -91.87),
+    "Maine": (44.69, -69.38), "Maryland": (39.06, -76.80), "Massachusetts": (42.23, -71.53),
+    "Michigan": (43.33, -84.54), "Minnesota": (45.69, -93.90), "Mississippi": (32.74, -89.68),
+    "Missouri": (38.46, -92.29), "Montana": (46.92, -110.45), "Nebraska": (41.13, -98.27),
+    "Nevada": (38.31, -117.06), "New Hampshire": (43.45, -71.56), "New Jersey": (40.30, -74.52),
+    "New Mexico": (34.84, -106.25), "New York": (42.17, -74.95), "North Carolina": (35.63, -79.81),
+    "North Dakota": (47.53, -99.78), "Ohio": (40.39, -82.76), "Oklahoma": (35.57, -96.93),
+    "Oregon": (44.57, -122.07), "Pennsylvania": (40.59, -77.21), "Rhode Island": (41.68, -71.51),
+    "South Carolina": (33.86, -80.95), "South Dakota": (44.30, -99.44), "Tennessee": (35.75, -86.69),
+    "Texas": (31.05, -97.56), "Utah": (40.15, -111.86), "Vermont": (44.05, -72.71),
+    "Virginia": (37.77, -78.17), "Washington": (47.40, -121.49), "West Virginia": (38.49, -80.95),
+    "Wisconsin": (44.27, -89.62), "Wyoming": (42.76, -107.30),
+    "Bangalore": (12.97, 77.59), "Mumbai": (19.08, 72.88), "Delhi": (28.70, 77.10),
+    "Chennai": (13.08, 80.27), "Hyderabad": (17.39, 78.49), "Kolkata": (22.57, 88.36)
+}
+
+
+class GeocodeCache:
+    """
+    Persistent region -> (lat, lng) cache in SQLite, mirrored in a dict so
+    repeated lookups never touch the disk.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._memory = {}
+        self._lock = threading.Lock()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                "region TEXT PRIMARY KEY, lat REAL, lng REAL, source TEXT, updated_at REAL)"
+            )
+            for region, lat, lng in conn.execute("SELECT region, lat, lng FROM geocode"):
+                self._memory[region] = (lat, lng)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def get(self, region: str):
+        return self._memory.get(region)
+
+    def put(self, region: str, coords: tuple, source: str, persist: bool = True):
+        """
+        Blocks on SQLite when persisting; async callers run it in a thread.
+        """
+        self._memory[region] = coords
+        if not persist:
+            return
+        with self._lock:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?, ?)",
+                    (region, coords[0], coords[1], source, time.time())
+                )
+
+
+class Geocoder:
+    """
+    Async geocoder: cache first, then one pooled httpx request per region.
+    Concurrent lookups of the same region share a single in-flight request,
+    and the gazetteer answers when the API is unreachable or unconfigured.
+    """
+
+    def __init__(self, cache: GeocodeCache, api_key: str = None, url: str = None):
+        self.cache = cache
+        self.api_key = api_key
+        self.url = url or config.GOOGLE_GEOCODE_URL
+        self._client = None
+        self._in_flight = {}
+        self.api_calls = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=config.GEOCODE_TIMEOUT,
+                limits=httpx.Limits(max_connections=config.GEOCODE_MAX_CONNECTIONS)
+            )
+        return self._client
+
+    async def resolve(self, region: str) -> Dict:
+        coords = self.cache.get(region)
+        if coords is None:
+            task = self._in_flight.get(region)
+            if task is None:
+                task = asyncio.ensure_future(self._lookup(region))
+                self._in_flight[region] = task
+                task.add_done_callback(lambda _: self._in_flight.pop(region, None))
+            coords = await asyncio.shield(task)
+        return {"lat": coords[0], "lng": coords[1]}
+
+    async def resolve_many(self, regions: List[str]) -> Dict[str, Dict]:
+        unique = list(dict.fromkeys(regions))
+        results = await asyncio.gather(*(self.resolve(region) for region in unique))
+        return dict(zip(unique, results))
+
+    async def _lookup(self, region: str) -> tuple:
+        if self.api_key:
+            coords = await self._fetch(region)
+            if coords is not None:
+                # The SQLite write blocks, so it runs off the event loop
+                await asyncio.to_thread(self.cache.put, region, coords, "api")
+                return coords
+
+        fallback = GAZETTEER.get(region)
+        if fallback is not None:
+            # Kept in memory only, so a later API answer can replace it on disk
+            self.cache.put(region, fallback, "gazetteer", persist=False)
+            return fallback
+        # Unknown and unreachable: not cached, so it is retried next time
+        return (None, None)
+
+    async def _fetch(self, region: str):
+        self.api_calls += 1
+        try:
+            response = await self._get_client().get(
+                self.url, params={"address": region, "key": self.api_key}
+            )
+            response.raise_for_status()
+            data = response.json()
+            if data.get("status") != "OK":
+                return None
+            loc = data["results"][0]["geometry"]["location"]
+            return (float(loc["lat"]), float(loc["lng"]))
+        except (httpx.HTTPError, ValueError, KeyError, IndexError, TypeError, AttributeError):
+            # Unreachable, an error status or a malformed payload: fall back
+            return None
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# ---------- Shared Instance ----------
+# All lookups run on one background event loop so that sync and async
+# callers share the connection pool and the in-flight coalescing.
+_loop = None
+_geocoder = None
+_init_lock = threading.Lock()
+
+
+def get_geocoder() -> Geocoder:
+    _ensure_started()
+    return _geocoder
+
+
+def _ensure_started():
+    global _loop, _geocoder
+    if _loop is not None:
+        return
+    with _init_lock:
+        if _loop is not None:
+            return
+        # The job scheduler's loop; lookups are I/O-bound and never block it
+        loop = scheduler.ensure_loop()
+        _geocoder = Geocoder(GeocodeCache(config.GEOCODE_CACHE_PATH), config.GOOGLE_MAPS_API_KEY)
+        _loop = loop
+
+
+async def resolve_many_async(regions: List[str]) -> Dict[str, Dict]:
+    """
+    Awaitable from any event loop; the work runs on the geocoder loop.
+    """
+    _ensure_started()
+    future = asyncio.run_coroutine_threadsafe(_geocoder.resolve_many(regions), _loop)
+    return await asyncio.wrap_future(future)
+
+
+def resolve_many(regions: List[str]) -> Dict[str, Dict]:
+    """
+    Blocking variant for sync code paths. Cached regions return without
+    touching the event loop.
+    """
+    geocoder = get_geocoder()
+    cached = {region: geocoder.cache.get(region) for region in regions}
+    if all(coords is not None for coords in cached.values()):
+        return {region: {"lat": c[0], "lng": c[1]} for region, c in cached.items()}
+    future = asyncio.run_coroutine_threadsafe(geocoder.resolve_many(regions), _loop)
+    return future.result()
@@ -0,0 +1,244 @@
+# core/jobs.py
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core import config
+
+
+class Job:
+    """
+    A named unit of background work. A run first waits for in-flight runs
+    of the jobs it depends on, and a successful run triggers every job that
+    depends on it, so a pipeline refreshes in order.
+    """
+
+    def __init__(self, name: str, run, depends_on: list, interval: float = None):
+        self.name = name
+        self.run = run
+        self.depends_on = list(depends_on)
+        self.interval = interval
+        self.task = None      # in-flight asyncio task, shared by concurrent triggers
+        self.state = "idle"   # idle | queued | running
+        self.rerun = False    # triggered while running: run again once done
+        self.runs = 0
+        self.failures = 0
+        self.triggers = 0
+        self.deduplicated = 0
+        self.total_seconds = 0.0
+        self.last_seconds = None
+        self.max_seconds = None
+        self.last_started = None
+        self.last_finished = None
+        self.last_error = None
+        self.next_run = None
+
+    def status(self) -> dict:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "depends_on": self.depends_on,
+            "interval_seconds": self.interval,
+            "runs": self.runs,
+            "failures": self.failures,
+            "triggers": self.triggers,
+            "deduplicated": self.deduplicated,
+            "last_seconds": self.last_seconds,
+            "avg_seconds": round(self.total_seconds / self.runs, 3) if self.runs else None,
+            "max_seconds": self.max_seconds,
+            "last_started": self.last_started,
+            "last_finished": self.last_finished,
+            "next_run": self.next_run,
+            "last_error": self.last_error
+        }
+
+
+class JobScheduler:
+    """
+    In-process scheduler: an asyncio loop on a daemon thread decides what
+    runs when (periodic ticks, triggers, dependency order) and job bodies
+    run on a thread pool. Triggering a job that is already queued or
+    running joins that run instead of starting another.
+    """
+
+    def __init__(self, max_workers: int):
+        self.jobs = {}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.loop = None
+        self.running = False
+        self._lock = threading.Lock()
+
+    def register(self, name: str, run, depends_on: list = (), interval: float = None) -> Job:
+        """
+        Adds a job; dependencies must be registered first (so the graph has no cycles).
+        """
+        unknown = [dep for dep in depends_on if dep not in self.jobs]
+        if unknown:
+            raise ValueError(f"Unknown dependencies for job {name}: {unknown}")
+        job = self.jobs[name] = Job(name, run, depends_on, interval)
+        if self.running:
+            self.loop.call_soon_threadsafe(self._start_job, job)
+        return job
+
+    def ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        The scheduler's event loop, started on first use. Other background
+        async work (e.g. geocoding) shares it.
+        """
+        with self._lock:
+            if self.loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="jobs", daemon=True).start()
+                self.loop = loop
+            return self.loop
+
+    def start(self):
+        """
+        Starts the periodic schedules (idempotent). Jobs without
+        dependencies run once right away, which cascades to the rest.
+        """
+        loop = self.ensure_loop()
+        with self._lock:
+            if self.running:
+                return
+            self.running = True
+        for job in list(self.jobs.values()):
+            loop.call_soon_threadsafe(self._start_job, job)
+
+    def trigger(self, name: str):
+        """
+        Thread-safe. Returns a concurrent future resolving to the run's result.
+        """
+        job = self.jobs[name]
+        return asyncio.run_coroutine_threadsafe(self._join(job), self.ensure_loop())
+
+    def status(self) -> list:
+        return [job.status() for job in self.jobs.values()]
+
+    # -- Loop thread only
+    def _start_job(self, job: Job):
+        if job.interval:
+            self.loop.create_task(self._periodic(job))
+        if not job.depends_on:
+            self._trigger(job)
+
+    async def _periodic(self, job: Job):
+        while True:
+            job.next_run = time.time() + job.interval
+            await asyncio.sleep(job.interval)
+            self._trigger(job)
+
+    async def _join(self, job: Job):
+        # Shielded: a caller giving up must not cancel the shared run
+        return await asyncio.shield(self._trigger(job))
+
+    def _trigger(self, job: Job) -> asyncio.Task:
+        job.triggers += 1
+        if job.task is not None and not job.task.done():
+            job.deduplicated += 1
+            if job.state == "running":
+                job.rerun = True  # the current run may have missed newer inputs
+            return job.task
+        job.state = "queued"
+        job.task = self.loop.create_task(self._execute(job))
+        return job.task
+
+    async def _execute(self, job: Job):
+        upstream = [self.jobs[dep].task for dep in job.depends_on]
+        upstream = [task for task in upstream if task is not None and not task.done()]
+        if upstream:
+            await asyncio.gather(*upstream, return_exceptions=True)
+
+        job.state = "running"
+        job.last_started = time.time()
+        started = time.perf_counter()
+        result = None
+        try:
+            result = await self.loop.run_in_executor(self.executor, job.run)
+            job.last_error = None
+        except Exception as exc:
+            job.failures += 1
+            job.last_error = repr(exc)  # readers keep the previous results
+        finally:
+            elapsed = round(time.perf_counter() - started, 3)
+            job.runs += 1
+            job.total_seconds += elapsed
+            job.last_seconds = elapsed
+            job.max_seconds = max(job.max_seconds or 0, elapsed)
+            job.last_finished = time.time()
+            job.state = "idle"
+
+        if job.last_error is None:
+            for dependent in self.jobs.values():
+                if job.name in dependent.depends_on:
+                    self._trigger(dependent)
+        if job.rerun:
+            job.rerun = False
+            self.loop.call_soon(self._trigger, job)
+        return result
+
+
+scheduler = JobScheduler(config.JOB_WORKERS)
+
+
+def trigger(name: str):
+    """
+    Requests a background run of `name`. Returns None (and does nothing)
+    while the scheduler is not started, so callers can fall back to
+    running the work themselves.
+    """
+    if not scheduler.running or name not in scheduler.jobs:
+        return None
+    return scheduler.trigger(name)
+
+
+# ---------- Pipeline ----------
+# load data -> score -> aggregate -> materialize; every stage is a no-op
+# when the data and model versions it was built for are still current.
+def _load_data():
+    from core.utils import get_inventory_loader, get_forecast_loader  # to avoid circular import at top-level
+    get_inventory_loader().load()
+    get_forecast_loader().load()
+
+
+def _score():
+    from core.snapshot import refresh_snapshot
+    refresh_snapshot()
+
+
+def _aggregate():
+    from core.kpi_aggregates import get_aggregates
+    from core.dashboard_metrics import COMPONENTS
+    get_aggregates()
+    # Recomputes only the components whose version moved or TTL ran out
+    for component in COMPONENTS:
+        component.start()
+
+
+def _materialize():
+    from core.demand_map import refresh_all
+    refresh_all()
+
+
+def _refresh_forecasts():
+    from core.forecast_store import refresh_stale
+    return refresh_stale()
+
+
+_pipeline_lock = threading.Lock()
+
+
+def start_jobs():
+    """
+    Registers the pipeline and starts the scheduler (idempotent).
+    """
+    with _pipeline_lock:
+        if "load_data" not in scheduler.jobs:
+            scheduler.register("load_data", _load_data, interval=config.DATA_REFRESH_SECONDS)
+            scheduler.register("score", _score, ["load_data"])
+            scheduler.register("aggregate", _aggregate, ["score"])
+            scheduler.register("materialize", _materialize, ["aggregate"], interval=config.DEMAND_MAP_REFRESH_SECONDS)
+            scheduler.register("forecasts", _refresh_forecasts, interval=config.FORECAST_REFRESH_SECONDS)
+    scheduler.start()
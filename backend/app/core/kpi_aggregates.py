@@ -0,0 +1,175 @@
+# core/kpi_aggregates.py
+
+import threading
+import numpy as np
+import pandas as pd
+
+from core.snapshot import get_snapshot, STATUS_LABELS
+
+# Status buckets of core/snapshot.py as thresholds on stock_ratio (right-inclusive)
+_CRITICAL_MAX, _LOW_MAX = 0.4, 1.0
+
+
+def _status_code(stock: int, divisor: int) -> int:
+    ratio = stock / divisor
+    return 0 if ratio <= _CRITICAL_MAX else 1 if ratio <= _LOW_MAX else 2
+
+
+def _status_codes(stock: np.ndarray, divisor: np.ndarray) -> np.ndarray:
+    ratio = stock / divisor
+    return np.where(ratio <= _CRITICAL_MAX, 0, np.where(ratio <= _LOW_MAX, 1, 2)).astype(np.int8)
+
+
+class KPIAggregates:
+    """
+    Running inventory KPIs for one data version. Built once with a full
+    pass, then kept current by stock deltas in O(1) per event: each event
+    moves one row between status buckets and adjusts the reorder count and
+    the stock total. Capacity, revenue impact and SKU count do not depend
+    on stock and are fixed per data version.
+
+    The applied deltas are also kept as a net change per (sku, location)
+    and replayed over the source stock when the aggregates are rebuilt, so
+    reloading the source does not lose them.
+
+    Everything is read from one snapshot frame, so positions, stock and
+    targets always describe the same rows.
+    """
+
+    def __init__(self, version, frame: pd.DataFrame, deltas: dict = None):
+        data_version, _ = version
+        self.version = data_version
+        n = len(frame)
+
+        skus = frame['sku'].astype(str).tolist()
+        locations = frame['location'].astype(str).tolist() if 'location' in frame else [None] * n
+        self._positions = dict(zip(zip(skus, locations), range(n)))
+
+        # Dashboard KPIs use the source required_stock; status buckets use the
+        # snapshot's forecast-adjusted one (see rescore)
+        self.stock = frame['current_stock'].to_numpy(dtype=np.int64).copy()
+        self.required = frame['source_required_stock'].to_numpy(dtype=np.int64)
+
+        # Replay the deltas received so far; pairs no longer in the source are dropped
+        self.deltas = {}
+        for key, delta in (deltas or {}).items():
+            i = self._positions.get(key)
+            if i is not None:
+                self.stock[i] = max(int(self.stock[i]) + delta, 0)
+                self.deltas[key] = delta
+
+        self.reorder_required = int(np.count_nonzero(self.stock < self.required))
+        self.stock_total = int(self.stock.sum())
+        self.capacity_total = int(frame['max_capacity'].to_numpy(dtype=np.int64).sum())
+        self.revenue_total = float(frame['price'].to_numpy(dtype=float) @ self.required)
+        self.total_skus = int(frame['sku'].nunique())
+        self.events_applied = 0
+        self.rescore(version, frame)
+
+    def rescore(self, version, frame: pd.DataFrame):
+        """
+        Re-buckets the current stock against the required stock of a new
+        snapshot of the same data (a model reload), keeping the stock.
+        """
+        divisor = frame['required_stock'].to_numpy(dtype=np.int64).copy()
+        divisor[divisor == 0] = 1  # 0 counts as 1, as in the snapshot
+        status = _status_codes(self.stock, divisor)
+        self.divisor, self.status = divisor, status
+        self.status_counts = np.bincount(status, minlength=len(STATUS_LABELS)).tolist()
+        self.scored_version = version
+
+    def apply(self, sku: str, location: str, delta: int) -> bool:
+        """
+        Applies one stock delta; False when (sku, location) is unknown.
+        """
+        key = (sku, location)
+        i = self._positions.get(key)
+        if i is None:
+            return False
+
+        old_stock = int(self.stock[i])
+        new_stock = max(old_stock + delta, 0)
+        self.stock[i] = new_stock
+        self.stock_total += new_stock - old_stock
+        self.deltas[key] = self.deltas.get(key, 0) + new_stock - old_stock
+
+        required = self.required[i]
+        self.reorder_required += int(new_stock < required) - int(old_stock < required)
+
+        old_status = self.status[i]
+        new_status = _status_code(new_stock, self.divisor[i])
+        if new_status != old_status:
+            self.status_counts[old_status] -= 1
+            self.status_counts[new_status] += 1
+            self.status[i] = new_status
+
+        self.events_applied += 1
+        return True
+
+    def inventory_metrics(self) -> dict:
+        critical, low, sufficient = self.status_counts
+        return {
+            "total_skus": self.total_skus,
+            "reorder_required": critical + low,
+            "critical_items": critical,
+            "low_items": low,
+            "sufficient_items": sufficient
+        }
+
+    def dashboard_kpis(self) -> dict:
+        capacity = self.capacity_total
+        return {
+            "total_skus": self.total_skus,
+            "reorder_required": self.reorder_required,
+            "capacity_utilization": round(self.stock_total / capacity * 100, 2) if capacity else 0.0,
+            "revenue_impact": round(self.revenue_total / 1_000_000, 2)  # in $M
+        }
+
+
+# -- Aggregates for the current data version. A model reload only
+# re-buckets the status counts; a new data version (including the TTL
+# roll-over of version-less sources) rebuilds from the new snapshot and
+# replays the stock deltas. Both follow the snapshot actually served, which
+# may be an outdated one while the "score" job rebuilds it. Rebuilds and event batches run under _lock.
+_aggregates = None
+_lock = threading.Lock()
+
+
+def _current_aggregates() -> KPIAggregates:
+    # Caller holds _lock
+    global _aggregates
+    snapshot = get_snapshot()
+    data_version, _ = snapshot.version
+    aggregates = _aggregates
+    if aggregates is None or aggregates.version != data_version:
+        deltas = None if aggregates is None else aggregates.deltas
+        aggregates = KPIAggregates(snapshot.version, snapshot.frame, deltas)
+        _aggregates = aggregates
+    elif aggregates.scored_version != snapshot.version:
+        aggregates.rescore(snapshot.version, snapshot.frame)
+    return aggregates
+
+
+def get_aggregates() -> KPIAggregates:
+    aggregates = _aggregates
+    if aggregates is not None and aggregates.scored_version == get_snapshot().version:
+        return aggregates
+    with _lock:
+        return _current_aggregates()
+
+
+def apply_stock_events(events) -> tuple:
+    """
+    Applies (sku, location, delta) events in order under one lock, held
+    from reading the current aggregates to the last event.
+    Returns (applied count, events for unknown (sku, location) pairs).
+    """
+    applied, unknown = 0, []
+    with _lock:
+        aggregates = _current_aggregates()
+        for sku, location, delta in events:
+            if aggregates.apply(sku, location, delta):
+                applied += 1
+            else:
+                unknown.append((sku, location, delta))
+    return applied, unknown
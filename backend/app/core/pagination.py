@@ -0,0 +1,129 @@
+# core/pagination.py
+
+import base64
+import json
+import numpy as np
+import pandas as pd
+
+# Columns the inventory matrix can be sorted by
+SORTABLE_COLUMNS = [
+    "sku", "stock_ratio", "forecasted_demand", "current_stock", "required_stock"
+]
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+
+def row_keys(df: pd.DataFrame) -> np.ndarray:
+    """
+    Stable, unique tie-breaker for every row (sku + location).
+    """
+    return (df['sku'].astype(str) + '|' + df['location'].astype(str)).to_numpy(dtype=object)
+
+
+def build_sort_index(df: pd.DataFrame, sort_by: str) -> dict:
+    """
+    Pre-sorts the frame by (sort_by, row key) once so every page is a
+    binary search plus a slice:
+    - order:  row positions in ascending sort order
+    - values: sort column in that order
+    - keys:   row keys in that order
+    - rank:   inverse of `order` (row position -> sorted position)
+    """
+    values = df[sort_by].to_numpy()
+    keys = row_keys(df)
+    order = np.lexsort((keys, values))
+
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+
+    return {
+        "order": order,
+        "values": values[order],
+        "keys": keys[order],
+        "rank": rank
+    }
+
+
+def encode_cursor(sort_by: str, descending: bool, value, key: str) -> str:
+    if hasattr(value, "item"):
+        value = value.item()
+    payload = json.dumps({"s": sort_by, "d": descending, "v": value, "k": key})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str, sort_by: str, descending: bool) -> tuple:
+    """
+    Returns the (value, key) of the last row of the previous page.
+    Raises ValueError for malformed cursors or a cursor issued for a
+    different sort.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        value, key = payload["v"], payload["k"]
+        same_sort = payload["s"] == sort_by and payload["d"] == descending
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Malformed cursor")
+    if not same_sort:
+        raise ValueError("Cursor was issued for a different sort order")
+    return value, key
+
+
+def _seek(sort_index: dict, value, key: str, descending: bool) -> int:
+    """
+    Sorted position where the next page starts (ascending) or ends
+    (descending, exclusive), found by binary search on (value, key).
+    Works across snapshot rebuilds since it does not rely on positions.
+    """
+    values, keys = sort_index["values"], sort_index["keys"]
+    lo = np.searchsorted(values, value, side="left")
+    hi = np.searchsorted(values, value, side="right")
+    side = "left" if descending else "right"
+    return int(lo + np.searchsorted(keys[lo:hi], key, side=side))
+
+
+def paginate(sort_index: dict, selected: np.ndarray = None, limit: int = DEFAULT_PAGE_SIZE,
+             cursor: tuple = None, descending: bool = False) -> tuple:
+    """
+    Returns (row positions of the page in display order, (value, key) of the
+    last row or None when there are no more rows).
+
+    `selected` restricts the page to those row positions (filters). Cost is
+    O(log n + limit) without filters and O(k log k) for k selected rows,
+    independent of how deep the cursor is.
+    """
+    order = sort_index["order"]
+    n = len(order)
+
+    if selected is None:
+        sorted_positions = None
+        size = n
+    else:
+        sorted_positions = np.sort(sort_index["rank"][selected])
+        size = len(sorted_positions)
+
+    # Index range [start, stop) within the (possibly filtered) sorted order
+    if descending:
+        stop = size
+        if cursor is not None:
+            bound = _seek(sort_index, cursor[0], cursor[1], descending=True)
+            stop = bound if sorted_positions is None else int(np.searchsorted(sorted_positions, bound))
+        start = max(stop - limit, 0)
+    else:
+        start = 0
+        if cursor is not None:
+            bound = _seek(sort_index, cursor[0], cursor[1], descending=False)
+            start = bound if sorted_positions is None else int(np.searchsorted(sorted_positions, bound))
+        stop = min(start + limit, size)
+
+    page = np.arange(start, stop) if sorted_positions is None else sorted_positions[start:stop]
+    if descending:
+        page = page[::-1]
+
+    has_more = start > 0 if descending else stop < size
+    next_cursor = None
+    if has_more and len(page):
+        last = page[-1]
+        next_cursor = (sort_index["values"][last], sort_index["keys"][last])
+
+    return order[page], next_cursor
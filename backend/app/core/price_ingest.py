@@ -0,0 +1,175 @@
+# core/price_ingest.py
+
+import os
+import threading
+import time
+from typing import Iterator
+import numpy as np
+import pandas as pd
+
+from core import config
+
+# Long format: one observed price per (sku, competitor). Wide feeds with
+# <competitor>_price columns (e.g. amazon_price, walmart_price) are melted.
+KEY_COLUMNS = ["sku", "competitor"]
+FEED_EXTENSIONS = (".csv", ".jsonl", ".ndjson")
+PROCESSED_DIR = "processed"
+
+
+# ---------- Feed Reading ----------
+def read_feed_chunks(path: str, chunk_rows: int = None) -> Iterator[pd.DataFrame]:
+    """
+    Streams a CSV or JSONL feed in normalized chunks of sku, competitor,
+    price and observed_at (defaulting to the file's mtime).
+    """
+    chunk_rows = chunk_rows or config.PRICE_INGEST_CHUNK_ROWS
+    if path.endswith(".csv"):
+        reader = pd.read_csv(path, chunksize=chunk_rows, dtype={"sku": str})
+    else:
+        reader = pd.read_json(path, lines=True, chunksize=chunk_rows, dtype={"sku": str})
+
+    file_time = pd.Timestamp(os.path.getmtime(path), unit="s")
+    with reader:
+        for chunk in reader:
+            yield _normalize(chunk, file_time)
+
+
+def _normalize(chunk: pd.DataFrame, file_time: pd.Timestamp) -> pd.DataFrame:
+    if "competitor" not in chunk:
+        wide = [c for c in chunk.columns if c.endswith("_price")]
+        id_cols = [c for c in ("sku", "observed_at") if c in chunk]
+        chunk = chunk.melt(id_vars=id_cols, value_vars=wide, var_name="competitor", value_name="price")
+        chunk["competitor"] = chunk["competitor"].str[:-len("_price")]
+
+    observed = pd.to_datetime(chunk["observed_at"]) if "observed_at" in chunk else file_time
+    return pd.DataFrame({
+        "sku": chunk["sku"].astype(str),
+        "competitor": chunk["competitor"].astype(str),
+        "price": pd.to_numeric(chunk["price"], errors="coerce"),
+        "observed_at": observed
+    }, index=chunk.index).dropna(subset=["price"])
+
+
+# ---------- Price History ----------
+class PriceHistory:
+    """
+    Competitor price history as Parquet partitioned by observation day,
+    plus the latest price per (sku, competitor) used to detect changes.
+    Appending a chunk returns only the rows whose price changed.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.latest_path = os.path.join(root, "latest.parquet")
+        os.makedirs(root, exist_ok=True)
+        # (sku, competitor) -> latest price; lookups and updates cost O(chunk)
+        self.latest = {}
+        if os.path.exists(self.latest_path):
+            saved = pd.read_parquet(self.latest_path)
+            self.latest = dict(zip(zip(saved["sku"], saved["competitor"]), saved["price"].tolist()))
+        self._lock = threading.Lock()
+
+    def append(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if chunk.empty:
+            return chunk.assign(previous_price=pd.Series(dtype=float))
+
+        with self._lock:
+            # Full history, partitioned by day
+            table = pa.Table.from_pandas(
+                chunk.assign(day=chunk["observed_at"].dt.strftime("%Y-%m-%d")), preserve_index=False
+            )
+            pq.write_to_dataset(table, os.path.join(self.root, "history"), partition_cols=["day"])
+
+            # Deltas: last observation per key in this chunk vs the known price
+            last = chunk.sort_values("observed_at", kind="stable").drop_duplicates(KEY_COLUMNS, keep="last")
+            keys = list(zip(last["sku"], last["competitor"]))
+            previous = np.array([self.latest.get(key, np.nan) for key in keys], dtype=float)
+            price = last["price"].to_numpy(dtype=float)
+            changed = np.isnan(previous) | ~np.isclose(previous, price)
+
+            deltas = last[changed].assign(previous_price=previous[changed])
+            for key, value in zip((k for k, c in zip(keys, changed) if c), price[changed].tolist()):
+                self.latest[key] = value
+            return deltas.reset_index(drop=True)
+
+    def save_latest(self):
+        with self._lock:
+            keys = list(self.latest)
+            pd.DataFrame({
+                "sku": [sku for sku, _ in keys],
+                "competitor": [competitor for _, competitor in keys],
+                "price": list(self.latest.values())
+            }).to_parquet(self.latest_path, index=False)
+
+    def latest_wide(self, skus: list = None) -> pd.DataFrame:
+        """
+        Latest prices as one row per sku with a <competitor>_price column each.
+        """
+        wanted = None if skus is None else set(skus)
+        items = [(key, price) for key, price in self.latest.items() if wanted is None or key[0] in wanted]
+        latest = pd.Series(
+            [price for _, price in items],
+            index=pd.MultiIndex.from_tuples([key for key, _ in items], names=KEY_COLUMNS), dtype=float
+        )
+        wide = latest.unstack("competitor")
+        wide.columns = [f"{competitor}_price" for competitor in wide.columns]
+        return wide.rename_axis("sku").reset_index()
+
+
+_history = None
+_history_lock = threading.Lock()
+
+def get_price_history() -> PriceHistory:
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = PriceHistory(config.PRICE_HISTORY_DIR)
+        return _history
+
+
+# ---------- Directory Ingestion ----------
+# Callables receiving each non-empty delta frame (e.g. pricing rescoring)
+_delta_listeners = []
+
+def on_price_deltas(listener):
+    _delta_listeners.append(listener)
+    return listener
+
+
+def ingest_feed_directory(feed_dir: str = None) -> dict:
+    """
+    Ingests every feed file in `feed_dir` chunk by chunk, then moves it to
+    `processed/` so it is not read twice. Returns the files, row count and
+    the concatenated price deltas (sku, competitor, price, previous_price,
+    observed_at).
+    """
+    feed_dir = feed_dir or config.COMPETITOR_FEED_DIR
+    history = get_price_history()
+    processed_dir = os.path.join(feed_dir, PROCESSED_DIR)
+    os.makedirs(processed_dir, exist_ok=True)
+
+    files = sorted(
+        name for name in os.listdir(feed_dir)
+        if name.endswith(FEED_EXTENSIONS) and os.path.isfile(os.path.join(feed_dir, name))
+    )
+    rows, deltas = 0, []
+    for name in files:
+        path = os.path.join(feed_dir, name)
+        for chunk in read_feed_chunks(path):
+            rows += len(chunk)
+            delta = history.append(chunk)
+            if len(delta):
+                deltas.append(delta)
+                for listener in _delta_listeners:
+                    listener(delta)
+        os.replace(path, os.path.join(processed_dir, f"{int(time.time())}-{name}"))
+
+    if files:
+        history.save_latest()
+    changed = pd.concat(deltas, ignore_index=True) if deltas else pd.DataFrame(
+        columns=["sku", "competitor", "price", "observed_at", "previous_price"]
+    )
+    return {"files": files, "rows": rows, "deltas": changed}
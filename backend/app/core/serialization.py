@@ -0,0 +1,45 @@
+# core/serialization.py
+
+from typing import Type
+import pandas as pd
+from pydantic import BaseModel
+from fastapi import Request
+from fastapi.responses import Response
+
+# Column dtype used for each schema field type before encoding
+_FIELD_CASTS = {int: "int64", float: "float64", bool: "bool", str: str}
+
+
+def frame_to_records_json(df: pd.DataFrame, model: Type[BaseModel]) -> str:
+    """
+    Serializes the rows of `df` as a JSON array of `model` objects without
+    building a Python object per row. Columns are projected and cast to the
+    schema's field types, then encoded in one pass by pandas' C JSON writer.
+    """
+    columns = {}
+    for name, field in model.model_fields.items():
+        cast = _FIELD_CASTS.get(field.annotation)
+        columns[name] = df[name].astype(cast) if cast is not None else df[name]
+
+    out = pd.DataFrame(columns, index=df.index)
+    return out.to_json(orient="records", force_ascii=False, double_precision=15)
+
+
+def json_response(body: str) -> Response:
+    """
+    Wraps pre-encoded JSON so FastAPI skips re-validating it against the
+    route's response_model (which is kept for the OpenAPI docs).
+    """
+    return Response(content=body, media_type="application/json")
+
+
+def etag_response(request: Request, body: bytes, etag: str) -> Response:
+    """
+    Serves pre-encoded JSON with an ETag, answering 304 Not Modified when
+    the client's If-None-Match already holds it.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")) or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,143 @@
+# core/snapshot.py
+
+import threading
+import pandas as pd
+
+from core import jobs
+from core.utils import load_inventory_data, get_data_version
+from models.xgb_model import predict_demand_matrix_with_price, get_model_version
+
+STATUS_BINS = [-float('inf'), 0.4, 1.0, float('inf')]
+STATUS_LABELS = ["Critical", "Low", "Sufficient"]
+DIMENSION_COLUMNS = ["brand", "category", "location"]
+
+# -- One snapshot per (data version, model version)
+_snapshot = None
+_build_lock = threading.Lock()
+
+# Counters exposed for monitoring / benchmarking the cache
+snapshot_stats = {"builds": 0, "hits": 0, "stale_served": 0}
+
+
+class InventorySnapshot:
+    """
+    Enriched inventory frame plus lazily built, read-only structures derived
+    from it (sort orders, filter indexes). Derived structures live and die
+    with the snapshot, so they never outlive the data they index.
+    """
+
+    def __init__(self, version, frame: pd.DataFrame):
+        self.version = version
+        self.frame = frame
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+
+    def derived(self, key, build):
+        """
+        Returns `build(frame)` memoized under `key` for this snapshot.
+        """
+        value = self._derived.get(key)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = build(self.frame)
+                    self._derived[key] = value
+        return value
+
+
+def current_version():
+    return (get_data_version(), get_model_version())
+
+
+def build_inventory_snapshot(inventory_df: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Loads the inventory once, runs a single forecast pass over it and adds
+    forecasted_demand, required_stock, stock_ratio, status and price_action
+    (plus source_required_stock, the required stock as loaded).
+    """
+    if inventory_df is None:
+        inventory_df = load_inventory_data()
+
+    forecast_df = predict_demand_matrix_with_price(inventory_df)
+
+    # Shallow copy: base columns stay shared with the loader (and with the
+    # memory-mapped store when one is configured)
+    df = inventory_df.copy(deep=False)
+    # Low-cardinality dimensions as categoricals (compact, fast to index)
+    for column in DIMENSION_COLUMNS:
+        if column in df and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+
+    # Forecast rows are aligned with the inventory rows, so assign by index
+    # rather than merging on sku (which duplicates multi-location SKUs).
+    df['forecasted_demand'] = forecast_df['forecasted_demand'].fillna(0).astype(int)
+    df['price_action'] = forecast_df['price_action'].fillna("Hold Price")
+
+    # Required stock and stock ratio; the loaded target is kept for the
+    # demand map, whose spikes compare the forecast against it
+    df['source_required_stock'] = df['required_stock']
+    df['required_stock'] = df[['forecasted_demand', 'required_stock']].max(axis=1)
+    df['stock_ratio'] = df['current_stock'] / df['required_stock'].replace(0, 1)
+
+    # Status buckets
+    df['status'] = pd.cut(
+        df['stock_ratio'],
+        bins=STATUS_BINS,
+        labels=STATUS_LABELS
+    )
+
+    return df.reset_index(drop=True)
+
+
+def get_snapshot() -> InventorySnapshot:
+    """
+    Returns the shared inventory snapshot. Once the job scheduler runs, an
+    outdated snapshot is served while the "score" job rebuilds it; only
+    the very first call (or one without the scheduler) builds inline.
+    Treat it as read-only.
+    """
+    version = current_version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        snapshot_stats["hits"] += 1
+        return snapshot
+    if snapshot is not None and jobs.trigger("score") is not None:
+        snapshot_stats["stale_served"] += 1
+        return snapshot
+    return refresh_snapshot()
+
+
+def refresh_snapshot() -> InventorySnapshot:
+    """
+    Rebuilds the snapshot if the source data or the demand model changed.
+    Concurrent callers wait on a single build instead of each running
+    their own.
+    """
+    global _snapshot
+
+    version = current_version()
+    with _build_lock:
+        snapshot = _snapshot
+        if snapshot is not None and snapshot.version == version:
+            snapshot_stats["hits"] += 1
+            return snapshot
+
+        snapshot = InventorySnapshot(version, build_inventory_snapshot())
+        _snapshot = snapshot
+        snapshot_stats["builds"] += 1
+
+    return snapshot
+
+
+def get_inventory_snapshot() -> pd.DataFrame:
+    """
+    Shortcut for the enriched frame of the current snapshot.
+    """
+    return get_snapshot().frame
+
+
+def invalidate_snapshot():
+    global _snapshot
+    with _build_lock:
+        _snapshot = None
@@ -0,0 +1,107 @@
+# core/spatial_index.py
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+# Lower bound of km per degree of latitude, so degree radii derived from
+# a distance never undershoot
+_KM_PER_DEG = 110.5
+
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """
+    Great-circle distance in km from one point to arrays of points.
+    """
+    lat1, lng1 = np.radians(lat), np.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+class GridIndex:
+    """
+    Static lat/lng grid index: points are bucketed into cell_deg x cell_deg
+    cells and sorted by cell id, so a bounding box becomes one binary
+    search per grid row instead of a scan over every point.
+    """
+
+    def __init__(self, lats, lngs, cell_deg: float = 1.0):
+        self.lats = np.asarray(lats, dtype=float)
+        self.lngs = np.asarray(lngs, dtype=float)
+        self.cell_deg = cell_deg
+        self.n_rows = int(np.ceil(180 / cell_deg))
+        self.n_cols = int(np.ceil(360 / cell_deg))
+
+        cell_ids = self._rows(self.lats) * self.n_cols + self._cols(self.lngs)
+        self.order = np.argsort(cell_ids, kind="stable")
+        self.cell_ids = cell_ids[self.order]
+
+    def __len__(self):
+        return len(self.lats)
+
+    def _rows(self, lats):
+        return np.clip(np.floor((np.asarray(lats) + 90) / self.cell_deg), 0, self.n_rows - 1).astype(np.int64)
+
+    def _cols(self, lngs):
+        return np.clip(np.floor((np.asarray(lngs) + 180) / self.cell_deg), 0, self.n_cols - 1).astype(np.int64)
+
+    def query_bbox(self, south: float, west: float, north: float, east: float) -> np.ndarray:
+        """
+        Positions of the points inside the box, in ascending order. A box
+        with west > east crosses the antimeridian.
+        """
+        if east - west >= 360:
+            west, east = -180.0, 180.0
+        else:
+            west = (west + 180) % 360 - 180
+            east = (east + 180) % 360 - 180 if east != 180 else 180.0
+        if west > east:
+            return np.union1d(
+                self.query_bbox(south, west, north, 180.0),
+                self.query_bbox(south, -180.0, north, east)
+            )
+        south, north = max(south, -90.0), min(north, 90.0)
+        if south > north or not len(self):
+            return np.empty(0, dtype=np.int64)
+
+        grid_rows = np.arange(self._rows(south), self._rows(north) + 1)
+        starts = np.searchsorted(self.cell_ids, grid_rows * self.n_cols + self._cols(west), side="left")
+        stops = np.searchsorted(self.cell_ids, grid_rows * self.n_cols + self._cols(east), side="right")
+        candidates = np.concatenate([self.order[a:b] for a, b in zip(starts, stops)])
+
+        lats, lngs = self.lats[candidates], self.lngs[candidates]
+        inside = (lats >= south) & (lats <= north) & (lngs >= west) & (lngs <= east)
+        return np.sort(candidates[inside])
+
+    def nearest(self, lat: float, lng: float, k: int, mask: np.ndarray = None) -> tuple:
+        """
+        The k points closest to (lat, lng) among those where `mask` is
+        True, as (positions, distances in km), nearest first. The search
+        box grows until it holds k candidates, then is widened once to the
+        k-th distance so no closer point outside it is missed.
+        """
+        eligible = len(self) if mask is None else int(mask.sum())
+        k = min(k, eligible)
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        def candidates(half_lat, half_lng):
+            found = self.query_bbox(lat - half_lat, lng - half_lng, lat + half_lat, lng + half_lng)
+            return found if mask is None else found[mask[found]]
+
+        half = self.cell_deg
+        while True:
+            found = candidates(half, half)
+            if len(found) >= k or half >= 360:
+                break
+            half *= 2
+
+        distances = haversine_km(lat, lng, self.lats[found], self.lngs[found])
+        radius_deg = np.partition(distances, k - 1)[k - 1] / _KM_PER_DEG
+        max_lat = min(abs(lat) + radius_deg, 90.0)
+        half_lng = 360.0 if max_lat >= 89.9 else radius_deg / np.cos(np.radians(max_lat))
+        found = candidates(radius_deg, min(half_lng, 360.0))
+
+        distances = haversine_km(lat, lng, self.lats[found], self.lngs[found])
+        nearest = np.argsort(distances, kind="stable")[:k]
+        return found[nearest], distances[nearest]
@@ -0,0 +1,155 @@
+# core/stages.py
+
+import asyncio
+import functools
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterator
+from fastapi import HTTPException
+
+from core import config
+
+# Sentinel for an exhausted iterator (StopIteration cannot cross an executor future)
+_DONE = object()
+
+
+class Stage:
+    """
+    A class of request work with its own sized thread pool. At most
+    `workers` requests run at once and `queue` more may wait; beyond that
+    new requests get 429 immediately, so a burst of one kind of work (e.g.
+    exports) queues against its own limit instead of starving the others.
+    Handlers stay `async def` and await the stage.
+    """
+
+    def __init__(self, name: str, workers: int, queue: int):
+        self.name = name
+        self.workers = workers
+        self.queue = queue
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"stage-{name}")
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self.stats = {"completed": 0, "rejected": 0, "failed": 0, "busy_seconds": 0.0}
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue
+
+    def _reject_if_full(self):
+        # Caller holds the lock
+        if self.in_flight >= self.capacity:
+            self.stats["rejected"] += 1
+            raise HTTPException(
+                status_code=429, detail=f"Too many concurrent {self.name} requests, retry shortly",
+                headers={"Retry-After": "1"}
+            )
+
+    def _admit(self):
+        with self._lock:
+            self._reject_if_full()
+            self.in_flight += 1
+
+    def _release(self, started: float, failed: bool = False):
+        with self._lock:
+            self.in_flight -= 1
+            self.stats["failed" if failed else "completed"] += 1
+            self.stats["busy_seconds"] += time.perf_counter() - started
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Runs `func(*args, **kwargs)` on this stage's pool (429 when saturated).
+        """
+        self._admit()
+        started, failed = time.perf_counter(), True
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+            failed = False
+            return result
+        finally:
+            self._release(started, failed)
+
+    def reserve(self) -> "Slot":
+        """
+        Takes a slot now (429 when saturated) for work that starts later, a
+        streamed body: admission has to be decided before the response
+        starts, since a body cannot turn into a 429 once its headers are
+        sent. Hand the slot to `stream`, which releases it; used as a
+        context manager, it is released if the handler fails first.
+        """
+        self._admit()
+        return Slot(self)
+
+    def stream(self, chunks: Iterator[bytes], slot: "Slot") -> AsyncIterator[bytes]:
+        """
+        Encodes a synchronous chunk iterator on this stage's pool, holding
+        `slot` (from `reserve`) until the body is sent or the client goes
+        away. The slot is also released if the body is never started.
+        """
+        body = self._stream(chunks, slot)
+        weakref.finalize(body, slot.release)
+        return body
+
+    async def _stream(self, chunks: Iterator[bytes], slot: "Slot") -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        failed = True
+        try:
+            while True:
+                chunk = await loop.run_in_executor(self.executor, next, chunks, _DONE)
+                if chunk is _DONE:
+                    break
+                yield chunk
+            failed = False
+        finally:
+            slot.release(failed)
+
+    def status(self) -> dict:
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "queue": self.queue,
+            "in_flight": self.in_flight,
+            **{key: round(value, 3) if isinstance(value, float) else value for key, value in self.stats.items()}
+        }
+
+
+class Slot:
+    """
+    One admitted request on a stage, reserved ahead of its work. Released
+    exactly once, however many paths try.
+    """
+
+    def __init__(self, stage: Stage):
+        self.stage = stage
+        self.started = time.perf_counter()
+        self._released = False
+        self._lock = threading.Lock()
+
+    def release(self, failed: bool = True):
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self.stage._release(self.started, failed)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.release()
+
+
+# read: answers from precomputed state; compute: model / pandas work per
+# request; export: streamed files and large reports; ingest: writes
+STAGES = {name: Stage(name, workers, queue) for name, (workers, queue) in config.REQUEST_STAGES.items()}
+read = STAGES["read"]
+compute = STAGES["compute"]
+export = STAGES["export"]
+ingest = STAGES["ingest"]
+
+
+def stages_status() -> list:
+    return [stage.status() for stage in STAGES.values()]
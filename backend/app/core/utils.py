@@ -1,21 +1,77 @@
 import pandas as pd
 
-def load_inventory_data():
-    # TODO: Load real inventory data
-    data = {
-        'sku': ['SKU1', 'SKU2', 'SKU3'],
-        'current_stock': [100, 50, 200],
-        'required_stock': [120, 60, 180],
-        'max_capacity': [200, 200, 200],
-        'price': [10.0, 20.0, 15.0]
-    }
-    return pd.DataFrame(data)
-
-def load_forecast_data():
-    # TODO: Load real forecast data
-    data = {
-        'sku': ['SKU1', 'SKU2', 'SKU3'],
-        'forecast_7d': [110, 55, 190],
-        'forecast_30d': [130, 65, 210]
-    }
-    return pd.DataFrame(data) 
\ No newline at end of file
+from core import config
+from core.data_sources import (
+    CachedLoader, create_source, INVENTORY_DTYPES, FORECAST_DTYPES
+)
+
+# Bumped whenever the underlying inventory/forecast data changes so that
+# derived views (see core/snapshot.py) know when to rebuild.
+_data_version = 0
+
+# Bundled sample data, served while no real source is configured
+SAMPLE_INVENTORY = {
+    'sku': ['SKU1', 'SKU2', 'SKU3'],
+    'current_stock': [100, 50, 200],
+    'required_stock': [120, 60, 180],
+    'max_capacity': [200, 200, 200],
+    'price': [10.0, 20.0, 15.0]
+}
+
+SAMPLE_FORECAST = {
+    'sku': ['SKU1', 'SKU2', 'SKU3'],
+    'forecast_7d': [110, 55, 190],
+    'forecast_30d': [130, 65, 210]
+}
+
+# -- Process-level loaders (one per dataset), created on first use
+_inventory_loader = None
+_forecast_loader = None
+
+def get_inventory_loader() -> CachedLoader:
+    global _inventory_loader
+    if _inventory_loader is None:
+        _inventory_loader = CachedLoader(create_source(
+            config.INVENTORY_SOURCE, config.INVENTORY_URI, config.INVENTORY_TABLE,
+            INVENTORY_DTYPES, SAMPLE_INVENTORY
+        ))
+    return _inventory_loader
+
+def get_forecast_loader() -> CachedLoader:
+    global _forecast_loader
+    if _forecast_loader is None:
+        _forecast_loader = CachedLoader(create_source(
+            config.FORECAST_SOURCE, config.FORECAST_URI, config.FORECAST_TABLE,
+            FORECAST_DTYPES, SAMPLE_FORECAST
+        ))
+    return _forecast_loader
+
+def get_data_version():
+    return (_data_version, get_inventory_loader().version())
+
+def mark_data_changed():
+    global _data_version
+    _data_version += 1
+    get_inventory_loader().clear()
+    get_forecast_loader().clear()
+
+def load_inventory_data(columns: list = None) -> pd.DataFrame:
+    """
+    Inventory from the configured source, cached per process. Pass
+    `columns` to load only the fields the caller uses. The result is a
+    shallow copy, so callers may add columns without touching the cache.
+    """
+    return get_inventory_loader().load(columns).copy(deep=False)
+
+def load_forecast_data(columns: list = None) -> pd.DataFrame:
+    """
+    Per-SKU forecasts (forecast_<h>d per configured horizon) from the
+    forecast store, which a background job keeps current (see
+    core/forecast_store.py). Until its first pass has run, the raw
+    forecast feed is served; nothing is computed inline.
+    """
+    from core.forecast_store import get_forecast_store  # to avoid circular import at top-level
+    store = get_forecast_store()
+    if store.empty:
+        return get_forecast_loader().load(columns).copy(deep=False)
+    return store.frame(columns).copy(deep=False)
@@ -1,10 +1,29 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from .api import pricing, demand
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.cors import CORSMiddleware
+from .api import inventory, dashboard, events, pricing, demand, admin
+from models.registry import load_all_models
+from core.jobs import start_jobs
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load every model in parallel before the first request is served
+    await run_in_threadpool(load_all_models)
+    # Load -> score -> aggregate -> materialize (and forecasts) run as
+    # background jobs; request handlers only read their finished results
+    start_jobs()
+    yield
 
+app = FastAPI(lifespan=lifespan)
+
+# Every path is served by exactly one router (see tests/test_main.py)
+app.include_router(inventory.router)
+app.include_router(dashboard.router)
+app.include_router(events.router)
 app.include_router(pricing.router)
 app.include_router(demand.router)
+app.include_router(admin.router)
 
 @app.get("/")
 def read_root():
@@ -20,4 +39,5 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allow all HTTP methods
     allow_headers=["*"],  # Allow all headers
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag"],  # Inventory matrix pagination, demand map caching
 )
\ No newline at end of file
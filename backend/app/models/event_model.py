@@ -0,0 +1,116 @@
+# models/event_model.py
+
+import numpy as np
+import pandas as pd
+
+# Demand lift per score point by event type, and how strongly each region
+# reacts to events (1.0 when unlisted)
+EVENT_TYPE_WEIGHTS = {
+    "Festival": 0.08,
+    "Holiday": 0.10,
+    "Sale": 0.07,
+    "Sports": 0.05,
+    "Concert": 0.04,
+    "Weather": 0.06
+}
+DEFAULT_EVENT_WEIGHT = 0.03
+
+REGION_SENSITIVITY = {
+    "Mumbai": 1.20, "Delhi": 1.15, "Bangalore": 1.10, "Chennai": 1.05,
+    "Hyderabad": 1.05, "Kolkata": 1.05,
+    "California": 1.10, "New York": 1.15, "Texas": 1.05, "Florida": 1.05
+}
+
+# Bundled sample calendar, served while no event feed is configured.
+# Multi-day events carry an inclusive end_date.
+UPCOMING_EVENTS = [
+    {"event_name": "Diwali", "event_type": "Festival", "region": "Bangalore",
+     "date": "2026-11-08", "end_date": "2026-11-12", "score": 9.0, "categories": ["Electronics", "Apparel", "Sweets"]},
+    {"event_name": "Black Friday", "event_type": "Sale", "region": "California",
+     "date": "2026-11-27", "score": 8.5, "categories": ["Electronics", "Toys"]},
+    {"event_name": "Thanksgiving", "event_type": "Holiday", "region": "New York",
+     "date": "2026-11-26", "score": 7.0, "categories": ["Food", "Home"]},
+    {"event_name": "Christmas", "event_type": "Holiday", "region": "Texas",
+     "date": "2026-12-25", "score": 9.5, "categories": ["Toys", "Apparel", "Food"]}
+]
+
+
+# ---------- Vectorized Scoring ----------
+def score_event_impacts(regions, event_types, scores) -> pd.DataFrame:
+    """
+    Scores many (region, event_type, score) scenarios in one pass.
+    Lookups run once per distinct region / event type and are broadcast
+    back with the factorized codes. Returns region, event_type, score,
+    demand_multiplier, duration and explanation columns.
+    """
+    scores = np.asarray(scores, dtype=float)
+    region_codes, region_values = pd.factorize(np.asarray(regions, dtype=object))
+    type_codes, type_values = pd.factorize(np.asarray(event_types, dtype=object))
+
+    sensitivity = np.array([REGION_SENSITIVITY.get(r, 1.0) for r in region_values])[region_codes]
+    weight = np.array([EVENT_TYPE_WEIGHTS.get(t, DEFAULT_EVENT_WEIGHT) for t in type_values])[type_codes]
+
+    clipped = np.clip(scores, 0, 10)
+    multiplier = np.round(1 + weight * clipped * sensitivity, 2)
+    days = np.ceil(1 + clipped / 2).astype(int)
+
+    region = pd.Series(pd.Categorical.from_codes(region_codes, region_values)).astype(str)
+    event_type = pd.Series(pd.Categorical.from_codes(type_codes, type_values)).astype(str)
+    lift = pd.Series(np.round((multiplier - 1) * 100).astype(int)).astype(str)
+
+    return pd.DataFrame({
+        "region": region,
+        "event_type": event_type,
+        "score": scores,
+        "demand_multiplier": multiplier,
+        "duration": pd.Series(days).astype(str) + " days",
+        "explanation": event_type + " in " + region + " lifts demand by about " + lift + "%"
+    })
+
+
+def calculate_event_impact(region: str, event_type: str, score: float) -> dict:
+    row = score_event_impacts([region], [event_type], [score]).iloc[0]
+    return {
+        "demand_multiplier": float(row["demand_multiplier"]),
+        "duration": row["duration"],
+        "explanation": row["explanation"]
+    }
+
+
+def impact_label(multiplier: float) -> str:
+    return "+{}% demand".format(int(round((multiplier - 1) * 100)))
+
+
+def get_upcoming_events() -> list:
+    """
+    Every calendar event with its expected_impact, scored at ingest (see core/event_store.py).
+    """
+    from core.event_store import get_calendar  # to avoid circular import at top-level
+    return get_calendar().events
+
+
+# ---------- Region Spike Lookups ----------
+def get_region_spike_forecast(region: str) -> dict:
+    from core.demand_map import get_tiles  # to avoid circular import at top-level
+    table = get_tiles().table
+    if region not in table.index:
+        return {"demand_level": "Mild", "spike_percentage": 0.0, "top_products": []}
+    row = table.loc[region]
+    return {
+        "demand_level": row["demand_level"],
+        "spike_percentage": float(row["spike_percent"]),
+        "top_products": list(row["products"])
+    }
+
+
+def get_event_metadata(region: str) -> dict:
+    """
+    Reason and duration of a region's spike, from its calendar events (see
+    core/demand_map.py spike_reasons).
+    """
+    from core.demand_map import get_tiles, spike_reasons  # to avoid circular import at top-level
+    table = get_tiles().table
+    if region in table.index and bool(table.loc[region, "is_spike"]):
+        reason, duration = spike_reasons([region])[region]
+        return {"reason": reason, "duration": duration}
+    return {"reason": "No spike detected", "duration": "-"}
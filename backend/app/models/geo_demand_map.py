@@ -1,40 +1,147 @@
 # models/geo_demand.py
 
 from typing import List, Dict
+import numpy as np
 import pandas as pd
-import requests
-import os
 
-from models.xgb_model import predict_demand_matrix
+from models.xgb_model import predict_features
 from core.utils import load_inventory_data
+from core.geocoding import resolve_many
 
-GOOGLE_GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+# Region hierarchy, coarsest first; "location" is the warehouse region column
+REGION_LEVELS = ["country", "state", "city", "location"]
 
-# 🔐 API key should be loaded from env
-GOOGLE_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
+# Spike rules: report regions at or above SPIKE_THRESHOLD percent, and
+# label them High above HIGH_SPIKE, Moderate above MODERATE_SPIKE, else Mild
+SPIKE_THRESHOLD = 10
+HIGH_SPIKE = 30
+MODERATE_SPIKE = 20
+TOP_K_PRODUCTS = 5
 
 
 def resolve_lat_lng(region_name: str) -> Dict:
     """
-    Get latitude and longitude using Google Geocoding API.
+    Get latitude and longitude for a region (cached, see core/geocoding.py).
     """
-    params = {
-        "address": region_name,
-        "key": GOOGLE_API_KEY
-    }
-    response = requests.get(GOOGLE_GEOCODE_URL, params=params)
-    data = response.json()
+    return resolve_many([region_name])[region_name]
 
-    if data["status"] == "OK":
-        loc = data["results"][0]["geometry"]["location"]
-        return {"lat": loc["lat"], "lng": loc["lng"]}
-    else:
-        return {"lat": None, "lng": None}
 
-
-def get_geo_demand_spikes() -> List[Dict]:
+def region_path(df: pd.DataFrame, level: str) -> list:
+    """
+    Hierarchy columns of `df` from the coarsest down to `level`, so that a
+    region is identified together with its ancestors (e.g. a city name
+    that exists in two states is two regions).
+    """
+    if level not in df.columns:
+        raise ValueError(f"Region level '{level}' is not present in the data")
+    if level not in REGION_LEVELS:
+        return [level]
+    return [column for column in REGION_LEVELS[:REGION_LEVELS.index(level) + 1] if column in df.columns]
+
+
+def _per_sku_totals(df: pd.DataFrame, path: list) -> pd.DataFrame:
+    # One row per (region path, sku) with summed forecast and required stock
+    return (
+        df.groupby(path + ["sku"], observed=True, sort=False)[["forecasted_demand", "required_stock"]]
+        .sum()
+        .reset_index()
+    )
+
+
+def _spike_table(per_sku: pd.DataFrame, path: list, threshold, top_k, high, moderate) -> pd.DataFrame:
+    # Region totals, spike metrics and top-K SKUs from per-(region, sku) totals
+    table = per_sku.groupby(path, observed=True, sort=True).agg(
+        forecasted_demand=("forecasted_demand", "sum"),
+        required_stock=("required_stock", "sum")
+    )
+
+    required = table["required_stock"].to_numpy(dtype=float)
+    forecast = table["forecasted_demand"].to_numpy(dtype=float)
+    spike = np.round(100 * (forecast - required) / np.maximum(required, 1), 2)
+
+    table["spike_percent"] = spike
+    table["demand_level"] = np.select([spike > high, spike > moderate], ["High", "Moderate"], "Mild")
+    table["is_spike"] = spike >= threshold
+
+    # Top-K products, computed only for the spiking regions: one stable sort
+    # by forecast, then the first K rows of every region
+    keys = pd.MultiIndex.from_frame(per_sku[path]) if len(path) > 1 else pd.Index(per_sku[path[0]])
+    rows = per_sku[keys.isin(table.index[table["is_spike"].to_numpy()])]
+    top = (
+        rows.sort_values("forecasted_demand", ascending=False, kind="stable")
+        .groupby(path, observed=True, sort=False)
+        .head(top_k)
+    )
+    products = top["sku"].astype(str).groupby([top[column] for column in path], observed=True, sort=False).agg(list)
+    products = products.reindex(table.index)
+    table["products"] = [value if isinstance(value, list) else [] for value in products]
+
+    # Index by the region itself; its ancestors stay as columns
+    return table.reset_index(level=path[:-1]) if len(path) > 1 else table
+
+
+def compute_region_spikes(
+    df: pd.DataFrame,
+    level: str = "location",
+    threshold: float = SPIKE_THRESHOLD,
+    top_k: int = TOP_K_PRODUCTS,
+    high: float = HIGH_SPIKE,
+    moderate: float = MODERATE_SPIKE
+) -> pd.DataFrame:
+    """
+    Spike table for every region at `level` in one pass: a single groupby
+    for the totals, vectorized spike_percent / demand_level, and one sort
+    for the top-K SKUs of the spiking regions (instead of re-filtering the
+    frame per region). `df` needs sku, forecasted_demand, required_stock
+    and the `level` column; coarser hierarchy columns it also has are kept
+    as columns (see region_path).
+
+    Returns one row per region (indexed by region, sorted) with
+    forecasted_demand, required_stock, spike_percent, demand_level,
+    is_spike and products (SKUs ranked by forecast summed in the region).
+    """
+    path = region_path(df, level)
+    return _spike_table(_per_sku_totals(df, path), path, threshold, top_k, high, moderate)
+
+
+def compute_hierarchy_spikes(
+    df: pd.DataFrame,
+    levels: list = None,
+    threshold: float = SPIKE_THRESHOLD,
+    top_k: int = TOP_K_PRODUCTS,
+    high: float = HIGH_SPIKE,
+    moderate: float = MODERATE_SPIKE
+) -> Dict[str, pd.DataFrame]:
+    """
+    Spike tables for every hierarchy level in `levels` (default: those of
+    REGION_LEVELS present in `df`), coarsest first. The rows are grouped
+    once at the finest level; each coarser level is rolled up from the
+    per-(region, sku) totals of the level below it, so a country's spike
+    and top SKUs come from its states' totals without rescanning the rows.
+    """
+    levels = [level for level in (levels or REGION_LEVELS) if level in df.columns]
+    if not levels:
+        raise ValueError(f"None of the region levels {REGION_LEVELS} is present in the data")
+
+    tables = {}
+    per_sku = _per_sku_totals(df, levels)
+    for depth in range(len(levels), 0, -1):
+        path = levels[:depth]
+        if depth < len(levels):
+            per_sku = _per_sku_totals(per_sku, path)
+        tables[path[-1]] = _spike_table(per_sku, path, threshold, top_k, high, moderate)
+    return {level: tables[level] for level in levels}
+
+
+def get_geo_demand_spikes(
+    level: str = "location",
+    threshold: float = SPIKE_THRESHOLD,
+    top_k: int = TOP_K_PRODUCTS
+) -> List[Dict]:
     """
     Detect demand spikes and return enriched geospatial response for map overlays.
+    `level` selects the region hierarchy level (country, state, city or location);
+    regions come back sorted by name within their ancestors.
     Output:
     [
         {
@@ -51,47 +158,27 @@ def get_geo_demand_spikes() -> List[Dict]:
     ]
     """
     df = load_inventory_data()
-    forecast = predict_demand_matrix(df)
-    df["forecasted_demand"] = df["sku"].map(forecast)
-
-    region_group = df.groupby("location").agg({
-        "forecasted_demand": "sum",
-        "required_stock": "sum"
-    }).reset_index()
-
-    results = []
-
-    for _, row in region_group.iterrows():
-        location = row["location"]
-        total_forecast = row["forecasted_demand"]
-        total_required = row["required_stock"]
-        spike_pct = round(100 * (total_forecast - total_required) / max(total_required, 1), 2)
-
-        # Only return if spike is significant
-        if spike_pct < 10:
-            continue
-
-        level = (
-            "High" if spike_pct > 30 else
-            "Moderate" if spike_pct > 20 else
-            "Mild"
-        )
+    df["forecasted_demand"] = predict_features(df)
 
-        # Get top 5 products driving spike
-        top_products = df[df["location"] == location].nlargest(5, "forecasted_demand")["sku"].tolist()
+    table = compute_region_spikes(df, level=level, threshold=threshold, top_k=top_k)
+    spikes = table[table["is_spike"]]
 
-        # Get lat/lng using Google Maps
-        coords = resolve_lat_lng(location)
+    # Resolve every spiking region concurrently (cache hits are free)
+    regions = [str(region) for region in spikes.index]
+    coords = resolve_many(regions)
 
-        results.append({
-            "region": location,
-            "lat": coords["lat"],
-            "lng": coords["lng"],
-            "spike_percent": spike_pct,
-            "demand_level": level,
+    return [
+        {
+            "region": region,
+            "lat": coords[region]["lat"],
+            "lng": coords[region]["lng"],
+            "spike_percent": float(spike_pct),
+            "demand_level": demand_level,
             "reason": "Detected via ML pattern",
             "duration": "2 days",
-            "products": top_products
-        })
-
-    return results
+            "products": products
+        }
+        for region, spike_pct, demand_level, products in zip(
+            regions, spikes["spike_percent"], spikes["demand_level"], spikes["products"]
+        )
+    ]
@@ -1,7 +1,80 @@
-import pickle
-import os
+import numpy as np
+import pandas as pd
 
-MODEL_PATH = os.path.join(os.path.dirname(__file__), '../../model_weights/should_lower_price_model.pkl')
+from models.registry import get_model
 
-with open(MODEL_PATH, 'rb') as f:
-    should_lower_price_model = pickle.load(f) 
\ No newline at end of file
+MODEL_NAME = "should_lower_price"  # weights: model_weights/should_lower_price_model.pkl
+
+# Classifier inputs, in training order (price_gap = sale_price - amazon_price)
+PRICE_FEATURES = ["sale_price", "amazon_price", "price_gap", "brand", "category", "available"]
+
+def get_price_model():
+    """
+    Current should-lower-price classifier, loaded (and hot-swapped) by the
+    model registry instead of at import time.
+    """
+    return get_model(MODEL_NAME)
+
+
+# ---------- Batch Pricing Engine ----------
+def price_feature_matrix(sale_price, amazon_price, brand=0, category=0, available=1) -> np.ndarray:
+    """
+    Float32 matrix in PRICE_FEATURES order; scalars broadcast over rows.
+    """
+    sale_price = np.asarray(sale_price, dtype=np.float32)
+    amazon_price = np.asarray(amazon_price, dtype=np.float32)
+    n = len(sale_price)
+    matrix = np.empty((n, len(PRICE_FEATURES)), dtype=np.float32)
+    matrix[:, 0] = sale_price
+    matrix[:, 1] = amazon_price
+    matrix[:, 2] = sale_price - amazon_price
+    matrix[:, 3] = np.broadcast_to(np.asarray(brand, dtype=np.float32), n)
+    matrix[:, 4] = np.broadcast_to(np.asarray(category, dtype=np.float32), n)
+    matrix[:, 5] = np.broadcast_to(np.asarray(available, dtype=np.float32), n)
+    return matrix
+
+def predict_should_lower(matrix: np.ndarray) -> np.ndarray:
+    """
+    0/1 classifier decision for every row, in a single predict call.
+    """
+    if not len(matrix):
+        return np.empty(0, dtype=np.int8)
+    return np.asarray(get_price_model().predict(matrix)).astype(np.int8)
+
+def price_actions(overstock: np.ndarray = None, ml_lower: np.ndarray = None) -> np.ndarray:
+    """
+    Combines the demand-vs-stock rule with the classifier: lower the price
+    only where every available signal agrees. `overstock` (forecast below
+    stock) and `ml_lower` are boolean arrays; either may be None, and NaN
+    entries in a float `ml_lower` mean no competitor data for that row.
+    """
+    signals = []
+    if overstock is not None:
+        signals.append(np.asarray(overstock, dtype=bool))
+    if ml_lower is not None:
+        ml_lower = np.asarray(ml_lower, dtype=float)
+        signals.append(np.where(np.isnan(ml_lower), True, ml_lower > 0))
+    lower = np.logical_and.reduce(signals) if signals else np.zeros(0, dtype=bool)
+    return np.where(lower, "Lower Price", "Hold Price")
+
+def score_catalogue(inventory_df: pd.DataFrame) -> np.ndarray:
+    """
+    Classifier signal for a catalogue frame (NaN where there is no
+    competitor price). Rows with an `amazon_price` are scored in one call.
+    """
+    signal = np.full(len(inventory_df), np.nan)
+    if "amazon_price" not in inventory_df:
+        return signal
+
+    competitor = inventory_df["amazon_price"].to_numpy(dtype=float)
+    rows = ~np.isnan(competitor)
+    if rows.any():
+        def column(name, default):
+            return inventory_df[name].to_numpy(dtype=float)[rows] if name in inventory_df else default
+        matrix = price_feature_matrix(
+            inventory_df["price"].to_numpy(dtype=float)[rows], competitor[rows],
+            column("brand_index", 0), column("category_index", 0),
+            (inventory_df["current_stock"].to_numpy()[rows] > 0) if "current_stock" in inventory_df else 1
+        )
+        signal[rows] = predict_should_lower(matrix)
+    return signal
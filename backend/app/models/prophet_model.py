@@ -0,0 +1,17 @@
+# models/prophet_model.py
+
+import numpy as np
+
+from core.utils import load_forecast_data
+
+def average_forecasted_demand() -> float:
+    """
+    Seasonal demand shift in percent: the average daily demand of the
+    30-day forecast against that of the 7-day forecast (e.g. 23.0 for +23%).
+    """
+    forecast_df = load_forecast_data(['forecast_7d', 'forecast_30d'])
+    daily_7d = forecast_df['forecast_7d'].to_numpy(dtype=float).sum() / 7
+    daily_30d = forecast_df['forecast_30d'].to_numpy(dtype=float).sum() / 30
+    if daily_7d <= 0:
+        return 0.0
+    return round(float(100 * (daily_30d / daily_7d - 1)), 2)
@@ -0,0 +1,176 @@
+# models/registry.py
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import joblib
+
+from core import config
+
+# name -> (weights file in MODEL_WEIGHTS_DIR, loader)
+MODEL_SPECS = {
+    "xgb_demand": ("xgb_demand_model.pkl", joblib.load),
+    "should_lower_price": ("should_lower_price_model.pkl", joblib.load),
+    "required_stock": ("required_stock_model.pkl", joblib.load)
+}
+
+
+class ModelEntry:
+    """
+    An immutable loaded model plus its metadata. Swapping weights replaces
+    the whole entry, so a request holding the previous entry keeps a
+    consistent (model, version) pair until it finishes.
+    """
+
+    def __init__(self, name, path, model, version, mtime, load_seconds, size_bytes):
+        self.name = name
+        self.path = path
+        self.model = model
+        self.version = version
+        self.mtime = mtime
+        self.loaded_at = time.time()
+        self.load_seconds = load_seconds
+        self.size_bytes = size_bytes
+
+    def info(self) -> dict:
+        return {
+            "name": self.name,
+            "status": "loaded",
+            "path": self.path,
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "load_seconds": round(self.load_seconds, 4),
+            "size_bytes": self.size_bytes
+        }
+
+
+_entries = {}
+_errors = {}
+_lock = threading.Lock()
+
+
+def model_path(name: str) -> str:
+    filename, _ = MODEL_SPECS[name]
+    return os.path.abspath(os.path.join(config.MODEL_WEIGHTS_DIR, filename))
+
+
+def _file_version(path: str) -> str:
+    # Content hash, so re-deploying identical weights is not a new version
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def weights_version(data: bytes) -> str:
+    """
+    Version of an in-memory weights file (same value as the registry's).
+    """
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def _load(name: str) -> ModelEntry:
+    _, loader = MODEL_SPECS[name]
+    path = model_path(name)
+    mtime = os.path.getmtime(path)
+    version = _file_version(path)
+
+    started = time.perf_counter()
+    model = loader(path)
+    load_seconds = time.perf_counter() - started
+
+    # In-memory footprint estimated from the serialized model
+    size_bytes = len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+    return ModelEntry(name, path, model, version, mtime, load_seconds, size_bytes)
+
+
+def reload_model(name: str) -> ModelEntry:
+    """
+    Loads `name` from disk and atomically swaps it in. In-flight requests
+    keep using the entry they already fetched.
+    """
+    try:
+        entry = _load(name)
+    except Exception as exc:
+        with _lock:
+            _errors[name] = f"{type(exc).__name__}: {exc}"
+        raise
+    with _lock:
+        _entries[name] = entry
+        _errors.pop(name, None)
+    return entry
+
+
+def load_all_models(max_workers: int = None) -> list:
+    """
+    Loads every registered model in parallel (used at startup). Models
+    whose weights are missing or broken are reported, not raised.
+    """
+    def try_load(name):
+        try:
+            reload_model(name)
+        except Exception:
+            pass
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(MODEL_SPECS)) as pool:
+        list(pool.map(try_load, MODEL_SPECS))
+    return models_info()
+
+
+def reload_changed_models() -> list:
+    """
+    Reloads models whose weights file changed on disk; returns their names.
+    """
+    changed = []
+    for name in MODEL_SPECS:
+        entry = _entries.get(name)
+        try:
+            mtime = os.path.getmtime(model_path(name))
+        except OSError:
+            continue
+        if entry is None or entry.mtime != mtime:
+            try:
+                if reload_model(name).version != (entry.version if entry else None):
+                    changed.append(name)
+            except Exception:
+                pass
+    return changed
+
+
+def get_entry(name: str) -> ModelEntry:
+    """
+    Current entry for `name`, loading it on first use if startup did not.
+    """
+    entry = _entries.get(name)
+    if entry is None:
+        entry = reload_model(name)
+    return entry
+
+
+def get_model(name: str):
+    return get_entry(name).model
+
+
+def get_version(name: str):
+    entry = _entries.get(name)
+    return entry.version if entry is not None else None
+
+
+def models_info() -> list:
+    info = []
+    for name in MODEL_SPECS:
+        entry = _entries.get(name)
+        if entry is not None:
+            info.append(entry.info())
+        else:
+            info.append({
+                "name": name,
+                "status": "error" if name in _errors else "not_loaded",
+                "path": model_path(name),
+                "error": _errors.get(name)
+            })
+    return info
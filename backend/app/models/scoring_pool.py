@@ -0,0 +1,118 @@
+# models/scoring_pool.py
+
+import io
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import joblib
+
+from core import config
+from models.registry import weights_version
+
+# -- Per-worker state: the model is loaded once per process and version
+_worker_model = None
+_worker_version = None
+
+
+class StaleWeightsError(RuntimeError):
+    """
+    The weights file on disk no longer matches the version being served.
+    """
+
+
+def _load_worker_model(path: str, version):
+    global _worker_model, _worker_version
+    if _worker_model is None or _worker_version != version:
+        # Hash and load the same bytes, so a file replaced in between
+        # cannot slip in weights the registry is not serving
+        with open(path, "rb") as f:
+            data = f.read()
+        if weights_version(data) != version:
+            raise StaleWeightsError(f"{path} changed on disk; expected version {version}")
+        _worker_model = joblib.load(io.BytesIO(data))
+        _worker_version = version
+    return _worker_model
+
+
+def _worker_score(path: str, version, features_name: str, output_name: str,
+                  shape: tuple, start: int, stop: int) -> int:
+    """
+    Runs in a pool process: attaches to the shared feature/output blocks,
+    scores rows [start, stop) and writes the predictions in place.
+    """
+    model = _load_worker_model(path, version)
+    features_shm = shared_memory.SharedMemory(name=features_name)
+    output_shm = shared_memory.SharedMemory(name=output_name)
+    features = output = None
+    try:
+        features = np.ndarray(shape, dtype=np.float32, buffer=features_shm.buf)
+        output = np.ndarray((shape[0],), dtype=np.float32, buffer=output_shm.buf)
+        output[start:stop] = model.predict(features[start:stop])
+    finally:
+        # Views must go before close(), or it raises BufferError over the real error
+        del features, output
+        features_shm.close()
+        output_shm.close()
+    return stop - start
+
+
+# -- Process pool, created on first use
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(workers: int = None) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers or config.SCORING_WORKERS)
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def score_matrix(matrix: np.ndarray, model_path: str, version, workers: int = None) -> np.ndarray:
+    """
+    Scores a float32 feature matrix across the process pool. The matrix is
+    copied once into shared memory; each worker scores a contiguous shard
+    and writes into a shared output array, so nothing is pickled besides
+    the shard bounds and results come back in row order. Workers load the
+    weights at `model_path` only if they hash to `version`, and raise
+    StaleWeightsError otherwise.
+    """
+    workers = workers or config.SCORING_WORKERS
+    n_rows = len(matrix)
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+
+    features_shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+    output_shm = shared_memory.SharedMemory(create=True, size=max(n_rows * 4, 1))
+    features = output = None
+    try:
+        features = np.ndarray(matrix.shape, dtype=np.float32, buffer=features_shm.buf)
+        features[:] = matrix
+
+        bounds = np.linspace(0, n_rows, workers + 1, dtype=np.int64)
+        pool = get_pool(workers)
+        futures = [
+            pool.submit(_worker_score, model_path, version, features_shm.name, output_shm.name,
+                        matrix.shape, int(start), int(stop))
+            for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start
+        ]
+        for future in futures:
+            future.result()
+
+        output = np.ndarray((n_rows,), dtype=np.float32, buffer=output_shm.buf)
+        return output.copy()
+    finally:
+        del features, output  # release buffer views before closing
+        features_shm.close()
+        features_shm.unlink()
+        output_shm.close()
+        output_shm.unlink()
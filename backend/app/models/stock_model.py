@@ -1 +1,6 @@
-required_stock_model = None 
\ No newline at end of file
+from models.registry import get_model
+
+MODEL_NAME = "required_stock"  # weights: model_weights/required_stock_model.pkl
+
+def get_required_stock_model():
+    return get_model(MODEL_NAME)
@@ -1,5 +1,158 @@
-# Placeholder for trend spike detection model loader
+# models/trend_model.py
+
+import threading
+from datetime import date
+import numpy as np
+
+# EWMA smoothing of per-period sales, the z-score that counts as a spike,
+# and how many closed periods a SKU needs before it can be flagged
+SPIKE_ALPHA = 0.1
+SPIKE_Z_THRESHOLD = 3.0
+SPIKE_WARMUP_PERIODS = 7
+# Std floor so a SKU with perfectly flat sales is not flagged for +1 unit
+_MIN_STD = 1.0
+# Empty periods folded in after an idle gap; older ones would barely move the EWMA
+_MAX_CATCHUP_PERIODS = 30
+
+
+class TrendSpikeDetector:
+    """
+    Streaming spike detector over per-SKU sales. Each SKU has a slot in
+    flat NumPy arrays holding the EWMA mean and variance of its closed
+    periods (days) plus the running total of the open one. A sale is O(1):
+    it bumps the open total and flags the SKU once that total is
+    SPIKE_Z_THRESHOLD deviations above its mean. Closing a period folds
+    every open total into the statistics in one vectorized pass; history
+    is never rescanned.
+    """
+
+    def __init__(self, alpha: float = SPIKE_ALPHA, threshold: float = SPIKE_Z_THRESHOLD,
+                 warmup: int = SPIKE_WARMUP_PERIODS, capacity: int = 1024):
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.skus = []
+        self._slots = {}
+        self.mean = np.zeros(capacity)
+        self.var = np.zeros(capacity)
+        self.periods = np.zeros(capacity, dtype=np.int32)
+        self.current = np.zeros(capacity)
+        # Open-period total that makes each SKU spike (inf while warming up)
+        self.trigger = np.full(capacity, np.inf)
+        self.spiking = set()
+        self.period = date.today()
+        self._lock = threading.RLock()
+
+    # -- Slots
+    def _grow(self, needed: int):
+        capacity = len(self.mean)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2)
+        for name, fill in (("mean", 0), ("var", 0), ("periods", 0), ("current", 0), ("trigger", np.inf)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def slot(self, sku: str) -> int:
+        i = self._slots.get(sku)
+        if i is None:
+            i = self._slots[sku] = len(self.skus)
+            self.skus.append(sku)
+            self._grow(i + 1)
+        return i
+
+    def slots(self, skus) -> np.ndarray:
+        lookup = self._slots.get
+        found = [lookup(sku) for sku in skus]
+        if None in found:
+            found = [self.slot(sku) if i is None else i for sku, i in zip(skus, found)]
+        return np.array(found, dtype=np.int64)
+
+    # -- Observations
+    def add_sale(self, sku: str, quantity: float = 1.0):
+        with self._lock:
+            self._roll()
+            i = self.slot(sku)
+            self.current[i] += quantity
+            if self.current[i] >= self.trigger[i]:
+                self.spiking.add(i)
+
+    def add_sales(self, skus, quantities):
+        """
+        Batch of sales in the open period; repeated SKUs accumulate.
+        """
+        with self._lock:
+            self._roll()
+            slots = self.slots(skus)
+            np.add.at(self.current, slots, np.asarray(quantities, dtype=float))
+            self.spiking.update(slots[self.current[slots] >= self.trigger[slots]].tolist())
+
+    def close_period(self):
+        """
+        Folds the open totals into the EWMA statistics (SKUs without sales
+        observe 0) and starts a new period. Spiking SKUs are then those whose
+        closed period was a spike, until new sales flag others.
+        """
+        with self._lock:
+            n = len(self.skus)
+            x, mean, var, periods = self.current[:n], self.mean[:n], self.var[:n], self.periods[:n]
+            ready = periods >= self.warmup
+            z = (x - mean) / np.maximum(np.sqrt(var), _MIN_STD)
+            self.spiking = set(np.flatnonzero(ready & (z >= self.threshold)).tolist())
+
+            # Incremental EWMA mean / variance. Until 1 / alpha periods are
+            # seen the weights are equal (a running mean and variance), so
+            # the statistics are not anchored to the first period; the first
+            # period seeds the mean
+            rate = np.maximum(self.alpha, 1.0 / (periods + 1))
+            diff = x - mean
+            increment = rate * diff
+            mean += increment
+            var[:] = (1 - rate) * (var + diff * increment)
+            periods += 1
+            x[:] = 0
+
+            ready = periods >= self.warmup
+            self.trigger[:n] = np.where(
+                ready, mean + self.threshold * np.maximum(np.sqrt(var), _MIN_STD), np.inf
+            )
+
+    def _roll(self, today: date = None):
+        # Close every period that ended since the last observation
+        today = today or date.today()
+        if (today - self.period).days > _MAX_CATCHUP_PERIODS:
+            self.period = date.fromordinal(today.toordinal() - _MAX_CATCHUP_PERIODS)
+        while self.period < today:
+            self.close_period()
+            self.period = date.fromordinal(self.period.toordinal() + 1)
+
+    def spiking_skus(self) -> list:
+        with self._lock:
+            self._roll()
+            return [self.skus[i] for i in sorted(self.spiking)]
+
+
+_detector = TrendSpikeDetector()
+
+
+def get_detector() -> TrendSpikeDetector:
+    return _detector
+
+
+def record_sales(sales):
+    """
+    Feeds (sku, quantity) pairs into the process detector.
+    """
+    sales = list(sales)
+    if sales:
+        _detector.add_sales([sku for sku, _ in sales], [quantity for _, quantity in sales])
+
+
+def forecast_trend_spike() -> list:
+    """
+    SKUs whose sales are spiking now.
+    """
+    return _detector.spiking_skus()
 
-def forecast_trend_spike():
-    # TODO: Load model from model_weights/xgb_trend_predictor.pkl and predict
-    return ["SKU123", "SKU456"]  # Dummy list of items with spikes
@@ -1,47 +1,278 @@
 # models/xgb_model.py
 
+import threading
+import time
+import numpy as np
 import pandas as pd
-import joblib
-import os
 
-MODEL_PATH = os.path.join("models", "xgb_demand_model.pkl")
+from core import config
+from models.registry import get_entry, get_model
+from models.scoring_pool import score_matrix, StaleWeightsError
+from models.price_model import price_actions, score_catalogue
+
+MODEL_NAME = "xgb_demand"  # weights: model_weights/xgb_demand_model.pkl (see models/registry.py)
 feature_cols = ["price", "rating", "discount", "brand_index", "category_index"]
 
-# -- Load model only once
-xgb_model = None
+def get_model_version():
+    """
+    Version of the demand model currently served by the registry.
+    """
+    return get_entry(MODEL_NAME).version
 
 def load_model_once():
-    global xgb_model
-    if xgb_model is None:
-        xgb_model = joblib.load(MODEL_PATH)
-    return xgb_model
+    return get_model(MODEL_NAME)
+
+
+# ---------- Inference Layer ----------
+def feature_matrix(inventory_df: pd.DataFrame) -> np.ndarray:
+    """
+    Contiguous float32 feature matrix in `feature_cols` order.
+    """
+    return np.ascontiguousarray(inventory_df[feature_cols].fillna(0).to_numpy(dtype=np.float32))
+
+def row_hashes(matrix: np.ndarray) -> np.ndarray:
+    """
+    One uint64 hash per feature row, computed column-wise (no Python loop).
+    """
+    hashes = np.zeros(len(matrix), dtype=np.uint64)
+    for j in range(matrix.shape[1]):
+        hashes = hashes * np.uint64(1099511628211) ^ pd.util.hash_array(matrix[:, j])
+    return hashes
+
+
+class PredictionCache:
+    """
+    Predictions keyed by feature-row hash for a single model version (a
+    new version starts from an empty cache). Keys, values and last-use
+    stamps live in NumPy arrays behind a pandas hash index, so a batch of
+    lookups is one vectorized get_indexer and a batch of inserts one
+    append. Past `capacity`, the least recently used entries are dropped.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.version = None
+        self._clear()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _clear(self):
+        self._keys = np.empty(0, dtype=np.uint64)
+        self._values = np.empty(0, dtype=np.float32)
+        self._stamps = np.empty(0, dtype=np.int64)
+        self._index = None  # hash index over _keys, rebuilt after inserts
+        self._clock = 0
+
+    def _positions(self, keys: np.ndarray) -> np.ndarray:
+        # Position of every key in the arrays, -1 when absent
+        if self._index is None:
+            self._index = pd.Index(self._keys)
+        return self._index.get_indexer(keys)
+
+    def get_many(self, version, keys: np.ndarray) -> tuple:
+        """
+        Returns (predictions with NaN where missing, boolean mask of misses).
+        """
+        values = np.full(len(keys), np.nan, dtype=np.float32)
+        with self._lock:
+            if version != self.version:
+                self._clear()
+                self.version = version
+            positions = self._positions(keys)
+            found = positions >= 0
+            values[found] = self._values[positions[found]]
+            self._clock += 1
+            self._stamps[positions[found]] = self._clock
+        missing = ~found
+        hit_count = int(found.sum())
+        self.hits += hit_count
+        self.misses += len(keys) - hit_count
+        return values, missing
+
+    def put_many(self, version, keys: np.ndarray, values: np.ndarray):
+        keys, first = np.unique(keys, return_index=True)
+        values = np.asarray(values, dtype=np.float32)[first]
+        with self._lock:
+            if version != self.version:
+                return
+            positions = self._positions(keys)
+            known = positions >= 0
+            self._values[positions[known]] = values[known]
+            if known.all():
+                return
+            self._clock += 1
+            self._keys = np.concatenate([self._keys, keys[~known]])
+            self._values = np.concatenate([self._values, values[~known]])
+            self._stamps = np.concatenate([self._stamps, np.full(int((~known).sum()), self._clock)])
+            if len(self._keys) > self.capacity:
+                keep = np.argpartition(-self._stamps, self.capacity - 1)[:self.capacity]
+                self._keys, self._values, self._stamps = self._keys[keep], self._values[keep], self._stamps[keep]
+            self._index = None
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent predict calls for the same model version: the
+    first caller of a version waits one batch window if other predict
+    calls are in flight, then runs a single model.predict over every
+    matrix of that version submitted in the meantime and hands each
+    caller its slice. A caller with nobody else in flight runs at once.
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window = window_seconds
+        self._lock = threading.Lock()
+        self._pending = {}   # version -> slots waiting for that version's leader
+        self._leaders = set()
+        self._in_flight = 0
+        self.batches = 0
+
+    def predict(self, model, matrix: np.ndarray, version=None) -> np.ndarray:
+        slot = {"matrix": matrix, "done": threading.Event(), "result": None, "error": None}
+        with self._lock:
+            self._in_flight += 1
+            self._pending.setdefault(version, []).append(slot)
+            lead = version not in self._leaders
+            if lead:
+                self._leaders.add(version)
+            wait = lead and self.window > 0 and self._in_flight > 1
+
+        try:
+            if lead:
+                if wait:
+                    time.sleep(self.window)
+                with self._lock:
+                    batch = self._pending.pop(version)
+                    self._leaders.discard(version)
+                # Every slot in the batch was submitted for this version, so
+                # scoring them with the leader's model is consistent
+                self._run(model, batch)
+
+            slot["done"].wait()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        if slot["error"] is not None:
+            raise slot["error"]
+        return slot["result"]
+
+    def _run(self, model, batch: list):
+        try:
+            matrices = [slot["matrix"] for slot in batch]
+            stacked = matrices[0] if len(matrices) == 1 else np.concatenate(matrices)
+            predictions = np.asarray(model.predict(stacked), dtype=np.float32)
+            self.batches += 1
+            offset = 0
+            for slot in batch:
+                size = len(slot["matrix"])
+                slot["result"] = predictions[offset:offset + size]
+                offset += size
+        except Exception as exc:
+            for slot in batch:
+                slot["error"] = exc
+        finally:
+            for slot in batch:
+                slot["done"].set()
+
+
+prediction_cache = PredictionCache(config.PREDICTION_CACHE_SIZE)
+micro_batcher = MicroBatcher(config.PREDICTION_BATCH_WINDOW_MS / 1000)
+
+# Last full result, so an unchanged catalogue skips even the per-row lookups
+_last_prediction = None
+
+def predict_features(inventory_df: pd.DataFrame, remember: bool = True) -> np.ndarray:
+    """
+    Demand predictions for every row of `inventory_df`. Rows whose features
+    were already scored by the current model come from the cache; only new
+    or changed rows reach the model, batched with concurrent callers.
+    Pass `remember=False` when scoring part of the catalogue, so the last
+    full result (the unchanged-catalogue fast path) is kept.
+    """
+    global _last_prediction
+
+    entry = get_entry(MODEL_NAME)  # one consistent (model, version) pair per call
+    model, version = entry.model, entry.version
+    matrix = feature_matrix(inventory_df)
+    keys = row_hashes(matrix)
+
+    last = _last_prediction
+    if last is not None and last[0] == version and np.array_equal(last[1], keys):
+        return last[2].copy()
+
+    predictions, missing = prediction_cache.get_many(version, keys)
+    if missing.any():
+        rows = matrix[missing]
+        fresh = None
+        if config.SCORING_WORKERS > 1 and len(rows) >= config.SCORING_POOL_MIN_ROWS:
+            # Full-catalogue rescoring: shard across the process pool
+            try:
+                fresh = score_matrix(rows, entry.path, version)
+            except StaleWeightsError:
+                pass  # weights replaced on disk since this entry loaded: score in process
+        if fresh is None:
+            fresh = micro_batcher.predict(model, rows, version)
+        predictions[missing] = fresh
+        prediction_cache.put_many(version, keys[missing], fresh)
+
+    if remember:
+        _last_prediction = (version, keys, predictions)
+    return predictions.copy()
 
 # --- Use Case 1: Dictionary Output for Visualizations ---
 def predict_demand_matrix(inventory_df: pd.DataFrame) -> dict:
-    model = load_model_once()
-    features_df = inventory_df[feature_cols].fillna(0)
-    predictions = model.predict(features_df)
+    predictions = predict_features(inventory_df)
     return dict(zip(inventory_df["sku"], predictions))
 
-# --- Use Case 2: Full Enriched DataFrame Output for Reorder/CSV ---
-def predict_demand_matrix_with_price() -> pd.DataFrame:
-    from core.utils import load_inventory_data  # to avoid circular import at top-level
+# --- Use Case 1b: Per-SKU Forecast / Accuracy for the Dashboard ---
+def predict_demand(return_accuracy: bool = False):
+    """
+    Per-SKU demand forecast (mean over locations). With `return_accuracy`,
+    returns the model's accuracy in percent instead: 100 - MAPE against the
+    7-day forecast feed, for the SKUs present in both.
+    """
+    from core.utils import load_inventory_data, get_forecast_loader  # to avoid circular import at top-level
+    inventory_df = load_inventory_data(["sku"] + feature_cols)
+    per_sku = pd.Series(predict_features(inventory_df), index=inventory_df["sku"].astype(str))
+    per_sku = per_sku.groupby(level=0).mean()
+    if not return_accuracy:
+        return per_sku.to_dict()
 
-    inventory_df = load_inventory_data()
-    model = load_model_once()
-    features_df = inventory_df[feature_cols].fillna(0)
+    # Scored against the raw feed: the forecast store fills feed gaps from this model
+    forecast_df = get_forecast_loader().load(["sku", "forecast_7d"])
+    actual = forecast_df.set_index(forecast_df["sku"].astype(str))["forecast_7d"]
+    actual = actual[~actual.index.duplicated()].reindex(per_sku.index).dropna()
+    if actual.empty:
+        return 0.0
+    predicted = per_sku.loc[actual.index].to_numpy()
+    observed = actual.to_numpy(dtype=float)
+    mape = np.mean(np.abs(predicted - observed) / np.maximum(observed, 1))
+    return round(float(max(0.0, 100 * (1 - mape))), 2)
 
-    inventory_df["forecasted_demand"] = model.predict(features_df)
+# --- Use Case 2: Full Enriched DataFrame Output for Reorder/CSV ---
+def predict_demand_matrix_with_price(inventory_df: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Returns one row per inventory row (same index) with forecasted_demand,
+    required_stock and price_action. Pass `inventory_df` to score an
+    already-loaded frame instead of loading the inventory again.
+    """
+    if inventory_df is None:
+        from core.utils import load_inventory_data  # to avoid circular import at top-level
+        inventory_df = load_inventory_data()
+    else:
+        inventory_df = inventory_df.copy(deep=False)
+
+    inventory_df["forecasted_demand"] = predict_features(inventory_df)
 
     # Business logic: Required stock is max of current logic and predicted
     inventory_df["required_stock"] = inventory_df[["forecasted_demand", "required_stock"]].max(axis=1)
 
-    # Pricing decision logic
-    inventory_df["price_action"] = inventory_df.apply(
-        lambda row: "Lower Price" if row["forecasted_demand"] < row["current_stock"] else "Hold Price",
-        axis=1
+    # Pricing decision: demand-vs-stock rule, confirmed by the price
+    # classifier for rows with a competitor price (see models/price_model.py)
+    inventory_df["price_action"] = price_actions(
+        overstock=inventory_df["forecasted_demand"].to_numpy() < inventory_df["current_stock"].to_numpy(),
+        ml_lower=score_catalogue(inventory_df)
     )
 
     return inventory_df[["sku", "forecasted_demand", "required_stock", "price_action"]]
-
-
@@ -1,3 +1,5 @@
+from pydantic import BaseModel
+from typing import List
 # ---------- Response Schemas ----------
 class InventoryItem(BaseModel):
     sku: str
@@ -44,3 +46,14 @@ class RegionCard(BaseModel):
     reason: str
     duration: str
     demand_level: str
+
+class RegionSpike(BaseModel):
+    region: str
+    demand_level: str
+    spike_percentage: float
+    reason: str
+    duration: str
+    affected_products: List[str]
+
+class AllSpikes(BaseModel):
+    regions: List[RegionSpike]
@@ -1,3 +1,5 @@
+from pydantic import BaseModel
+from typing import List, Optional
 # ---------- Response Schemas ----------
 class InventoryItem(BaseModel):
     sku: str
@@ -53,6 +55,27 @@ class UpcomingEvent(BaseModel):
     event_type: str
     region: str
     date: str
+    end_date: Optional[str] = None
     score: float
     expected_impact: str
     categories: List[str]
+
+class CalendarEventIn(BaseModel):
+    event_name: str
+    event_type: str
+    region: str
+    date: str
+    end_date: Optional[str] = None
+    score: float
+    categories: List[str] = []
+
+class EventScenarioGrid(BaseModel):
+    regions: List[str]
+    event_types: List[str]
+    score_min: float = 0.0
+    score_max: float = 10.0
+    score_step: float = 1.0
+
+class EventBatchRequest(BaseModel):
+    scenarios: List[EventEstimateRequest] = []
+    grid: Optional[EventScenarioGrid] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 # ---------- Response Schemas ----------
 class InventoryItem(BaseModel):
     sku: str
@@ -31,3 +31,11 @@ class ReorderReport(BaseModel):
     total_reorder_items: int
     items: List[ReorderItem]
 
+class StockEvent(BaseModel):
+    sku: str
+    location: Optional[str] = None
+    delta: int  # + received, - picked
+
+class StockEventResult(BaseModel):
+    applied: int
+    unknown: List[StockEvent]
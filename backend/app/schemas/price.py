@@ -1,9 +1,20 @@
 from pydantic import BaseModel
+from typing import Optional
 
 class PriceInput(BaseModel):
     walmart_price: float
     amazon_price: float
     # Add other features as needed
+    brand: int = 0
+    category: int = 0
+    available: int = 1
+    # Optional demand-vs-stock inputs for the combined decision
+    forecasted_demand: Optional[float] = None
+    current_stock: Optional[float] = None
 
 class PriceOutput(BaseModel):
     should_lower_price: int
+
+class PriceDecision(BaseModel):
+    should_lower_price: int
+    price_action: str
@@ -1 +1,133 @@
-ECHO is on.
+# utils/match_titles.py
+
+import re
+import unicodedata
+from typing import List
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Features shared by more listings than this carry almost no IDF weight
+# but dominate the candidate work, so they are left out of the index
+DEFAULT_MAX_POSTINGS = 2000
+DEFAULT_BATCH_SIZE = 512
+
+
+def normalize_title(title: str) -> str:
+    """
+    Lowercase ASCII words separated by single spaces ("Café-Table 2x" -> "cafe table 2x").
+    """
+    ascii_title = unicodedata.normalize("NFKD", str(title)).encode("ascii", "ignore").decode()
+    return _NON_ALNUM.sub(" ", ascii_title.lower()).strip()
+
+
+def title_features(title: str) -> List[str]:
+    """
+    Word tokens plus character trigrams of longer words (marked with '#'),
+    so small typos and plural forms still share most features.
+    """
+    words = normalize_title(title).split()
+    trigrams = ["#" + word[i:i + 3] for word in words if len(word) > 3 for i in range(len(word) - 2)]
+    return words + trigrams
+
+
+def _count_matrix(titles, vocabulary: dict, grow: bool) -> sparse.csr_matrix:
+    rows, cols = [], []
+    for row, title in enumerate(titles):
+        for feature in title_features(title):
+            col = vocabulary.setdefault(feature, len(vocabulary)) if grow else vocabulary.get(feature)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+    counts = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64))),
+        shape=(len(titles), len(vocabulary))
+    )
+    counts.sum_duplicates()
+    return counts
+
+
+def _tfidf(counts: sparse.csr_matrix, idf: np.ndarray) -> sparse.csr_matrix:
+    # Sublinear tf, idf weighting, then L2-normalized rows (dot = cosine)
+    weights = counts.copy()
+    weights.data = (1 + np.log(weights.data)) * idf[weights.indices]
+    norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms).dot(weights).tocsr().astype(np.float32)
+
+
+class TitleIndex:
+    """
+    TF-IDF inverted index over competitor listing titles. Matching a batch
+    of our titles is one sparse product against the postings, so the work
+    grows with the listings that share a feature with each title, not with
+    every (title, listing) pair.
+    """
+
+    def __init__(self, titles, max_postings: int = DEFAULT_MAX_POSTINGS):
+        self.titles = list(titles)
+        self.vocabulary = {}
+        counts = _count_matrix(self.titles, self.vocabulary, grow=True)
+
+        df = np.bincount(counts.indices, minlength=len(self.vocabulary))
+        self.idf = (np.log((1 + len(self.titles)) / (1 + df)) + 1).astype(np.float32)
+        self.idf[df > max_postings] = 0  # dropped from the postings and from queries
+
+        weights = _tfidf(counts, self.idf)
+        weights.eliminate_zeros()
+        self.postings = weights.T.tocsr()  # feature -> listings
+
+    def vectorize(self, titles) -> sparse.csr_matrix:
+        return _tfidf(_count_matrix(list(titles), self.vocabulary, grow=False), self.idf)
+
+    def match(self, titles, top_k: int = 1, min_score: float = 0.0,
+              batch_size: int = DEFAULT_BATCH_SIZE) -> pd.DataFrame:
+        """
+        Best `top_k` listings for every title, as rows of query (position in
+        `titles`), match (position in the indexed titles) and cosine score,
+        best first per query. Pairs below `min_score` are dropped.
+        """
+        titles = list(titles)
+        out_query, out_match, out_score = [], [], []
+        for start in range(0, len(titles), batch_size):
+            queries = self.vectorize(titles[start:start + batch_size])
+            scores = (queries @ self.postings).tocsr()
+            for row in range(scores.shape[0]):
+                lo, hi = scores.indptr[row], scores.indptr[row + 1]
+                if lo == hi:
+                    continue
+                data, cols = scores.data[lo:hi], scores.indices[lo:hi]
+                if hi - lo > top_k:
+                    best = np.argpartition(-data, top_k - 1)[:top_k]
+                    data, cols = data[best], cols[best]
+                order = np.argsort(-data, kind="stable")
+                keep = data[order] >= min_score
+                out_query.append(np.full(int(keep.sum()), start + row, dtype=np.int64))
+                out_match.append(cols[order][keep])
+                out_score.append(data[order][keep])
+
+        def flat(parts, dtype):
+            return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+        return pd.DataFrame({
+            "query": flat(out_query, np.int64),
+            "match": flat(out_match, np.int64),
+            "score": flat(out_score, np.float32)
+        })
+
+
+def match_titles(our_titles, their_titles, top_k: int = 1, min_score: float = 0.5,
+                 max_postings: int = DEFAULT_MAX_POSTINGS) -> pd.DataFrame:
+    """
+    Batch API: indexes `their_titles` once and matches all of `our_titles`.
+    Returns query, match, score plus both titles.
+    """
+    our_titles, their_titles = list(our_titles), list(their_titles)
+    matches = TitleIndex(their_titles, max_postings).match(our_titles, top_k, min_score)
+    return matches.assign(
+        title=[our_titles[i] for i in matches["query"]],
+        matched_title=[their_titles[i] for i in matches["match"]]
+    )
+
@@ -0,0 +1,72 @@
+# benchmarks/bench_event_store.py
+#
+# python backend/benchmarks/bench_event_store.py [events]
+#
+# Calendar window queries (core/event_store.py) on a calendar of mostly
+# single-day events plus one year-long event: the span-bucketed index
+# against a single start-sorted index widened by the longest span (the
+# previous layout), for a one-day and a one-week window.
+
+import common  # noqa: F401  (configures the app, must come first)
+
+import datetime
+import json
+import sys
+import numpy as np
+
+from core.event_store import EventCalendar
+
+DAY0 = datetime.date(2026, 1, 1)
+
+
+def calendar_events(n: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    offsets = rng.integers(0, 365, n)
+    spans = np.where(rng.random(n) < 0.9, 0, rng.integers(1, 7, n))
+    spans[0] = 365
+    events = []
+    for i in range(n):
+        start = DAY0 + datetime.timedelta(days=int(offsets[i]))
+        events.append({
+            "event_name": f"Event{i}", "event_type": "Sale", "region": f"Region{i % 50}", "score": 5.0,
+            "date": start.isoformat(),
+            "end_date": (start + datetime.timedelta(days=int(spans[i]))).isoformat() if spans[i] else None
+        })
+    return events
+
+
+def widened_query(calendar: EventCalendar, start, end) -> list:
+    # One start-sorted index, every window widened by the longest event
+    start, end = np.datetime64(start, "D"), np.datetime64(end, "D")
+    max_span = (calendar.ends - calendar.starts).max()
+    lo = int(np.searchsorted(calendar.starts, start - max_span, side="left"))
+    hi = int(np.searchsorted(calendar.starts, end, side="right"))
+    positions = np.arange(lo, max(lo, hi))
+    positions = positions[calendar.ends[positions] >= start]
+    return [calendar.events[i] for i in positions]
+
+
+def main(n_events: int) -> dict:
+    build_seconds, calendar = common.timed(EventCalendar, calendar_events(n_events))
+    report = {"events": n_events, "build_seconds": round(build_seconds, 2), "windows": []}
+    for days in (1, 7):
+        start = DAY0 + datetime.timedelta(days=300)
+        end = start + datetime.timedelta(days=days - 1)
+        widened_seconds, expected = common.timed(widened_query, calendar, start, end, repeat=5)
+        bucketed_seconds, found = common.timed(calendar.query, start, end, repeat=5)
+        assert found == expected
+        report["windows"].append({
+            "days": days,
+            "matches": len(found),
+            "widened_ms": round(widened_seconds * 1000, 2),
+            "bucketed_ms": round(bucketed_seconds * 1000, 2),
+            "speedup": round(widened_seconds / bucketed_seconds, 1)
+        })
+    return report
+
+
+if __name__ == "__main__":
+    try:
+        print(json.dumps(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000), indent=2))
+    finally:
+        common.cleanup()
@@ -0,0 +1,65 @@
+# benchmarks/bench_filters.py
+#
+# python backend/benchmarks/bench_filters.py [rows]
+#
+# Inventory-matrix filtering: boolean masks over object-dtype string
+# columns (the old route code) against the snapshot's filter index
+# (core/filter_index.py), for selective and broad filters. Both sides
+# end with the selected rows as a frame.
+
+import common  # noqa: F401  (configures the app, must come first)
+
+import json
+import sys
+import numpy as np
+
+from core.filter_index import build_filter_index, select_rows
+from core.snapshot import build_inventory_snapshot
+
+# name -> filters (values of one column are OR-ed, columns AND-ed)
+CASES = {
+    "selective: brand + location": {"brand": ["Brand7"], "location": ["Texas"]},
+    "selective: brand + category + location": {"brand": ["Brand7"], "category": ["Toys"], "location": ["Texas"]},
+    "multi-value: 3 brands": {"brand": ["Brand1", "Brand2", "Brand3"]},
+    "broad: category": {"category": ["Toys"]},
+    "broad: location": {"location": ["Texas"]},
+    "broad: 2 of 4 locations": {"location": ["Texas", "California"]}
+}
+
+
+def mask_filter(df, filters: dict):
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in filters.items():
+        mask &= df[column].isin(values).to_numpy() if len(values) > 1 else (df[column] == values[0]).to_numpy()
+    return df[mask]
+
+
+def main(rows: int) -> dict:
+    common.install_models()
+    df = build_inventory_snapshot(common.synthetic_inventory(rows))
+    # What the old routes filtered: plain object-dtype columns
+    legacy_df = df.astype({column: object for column in ["brand", "category", "location"]})
+
+    index_seconds, index = common.timed(build_filter_index, df)
+    report = {"rows": rows, "index_build_seconds": round(index_seconds, 3), "cases": []}
+    for name, filters in CASES.items():
+        mask_seconds, expected = common.timed(mask_filter, legacy_df, filters, repeat=5)
+        index_seconds, selected = common.timed(
+            lambda: df.iloc[select_rows(index, filters)], repeat=5
+        )
+        assert selected.index.equals(expected.index), name
+        report["cases"].append({
+            "case": name,
+            "matches": len(selected),
+            "mask_ms": round(mask_seconds * 1000, 2),
+            "index_ms": round(index_seconds * 1000, 2),
+            "speedup": round(mask_seconds / index_seconds, 1)
+        })
+    return report
+
+
+if __name__ == "__main__":
+    try:
+        print(json.dumps(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000), indent=2))
+    finally:
+        common.cleanup()
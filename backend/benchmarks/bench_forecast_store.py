@@ -0,0 +1,104 @@
+# benchmarks/bench_forecast_store.py
+#
+# python backend/benchmarks/bench_forecast_store.py [skus] [batch]
+#
+# Filling the forecast store (core/forecast_store.py) with `skus` new SKUs
+# in batches of `batch`, as the refresh job does: in-place growth against
+# the previous put, which rebuilt and copied the whole store (matrix,
+# stamps and row map) for every batch. Then a refresh of 10% of the rows
+# and a prune of 10% of the catalogue.
+
+import common  # noqa: F401  (configures the app, must come first)
+
+import datetime
+import json
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from core.forecast_store import ForecastStore
+
+HORIZONS = [7, 14, 30, 90]
+TODAY = datetime.date(2026, 10, 1)
+
+
+class CopyingStore:
+    """
+    The previous write path: every put builds a new full-size generation.
+    """
+
+    def __init__(self, columns: list):
+        self.columns = columns
+        self.skus, self.rows = [], {}
+        self.values = np.zeros((0, len(columns)))
+        self.as_of = np.zeros(0, dtype="datetime64[D]")
+        self.version_codes = np.zeros(0, dtype=np.int32)
+
+    def put(self, forecasts: pd.DataFrame, version: str, as_of):
+        skus = forecasts["sku"].astype(str).tolist()
+        new = [sku for sku in dict.fromkeys(skus) if sku not in self.rows]
+        old, n = len(self.skus), len(self.skus) + len(new)
+        values = np.zeros((n, len(self.columns)))
+        values[:old] = self.values
+        as_of_days = np.zeros(n, dtype="datetime64[D]")
+        as_of_days[:old] = self.as_of
+        version_codes = np.full(n, -1, dtype=np.int32)
+        version_codes[:old] = self.version_codes
+        rows = dict(self.rows)
+        rows.update(zip(new, range(old, n)))
+        positions = np.array([rows[sku] for sku in skus], dtype=np.int64)
+        values[positions] = forecasts[self.columns].to_numpy(dtype=float)
+        as_of_days[positions] = np.datetime64(as_of, "D")
+        version_codes[positions] = 0
+        self.skus, self.rows = self.skus + new, rows
+        self.values, self.as_of, self.version_codes = values, as_of_days, version_codes
+
+
+def fill(store, batches: list) -> float:
+    started = time.perf_counter()
+    for batch in batches:
+        store.put(batch, "v1", TODAY)
+    return time.perf_counter() - started
+
+
+def main(n_skus: int, batch_size: int) -> dict:
+    store = ForecastStore(os.path.join(common.WORK_DIR, "bench_store.npz"), HORIZONS)
+    rng = np.random.default_rng(0)
+    skus = [f"SKU{i}" for i in range(n_skus)]
+    batches = []
+    for start in range(0, n_skus, batch_size):
+        batch = pd.DataFrame({"sku": skus[start:start + batch_size]})
+        for column in store.columns:
+            batch[column] = rng.uniform(0, 100, len(batch)).round(2)
+        batches.append(batch)
+
+    copying = CopyingStore(store.columns)
+    copying_seconds = fill(copying, batches)
+    in_place_seconds = fill(store, batches)
+    assert np.array_equal(store.frame()[store.columns].to_numpy(), copying.values)
+
+    refresh = pd.concat(batches).sample(frac=0.1, random_state=0)
+    refresh_seconds, _ = common.timed(store.put, refresh, "v2", TODAY)
+    prune_seconds, dropped = common.timed(store.prune, skus[:int(n_skus * 0.9)])
+    return {
+        "skus": n_skus,
+        "batch": batch_size,
+        "batches": len(batches),
+        "copying_fill_seconds": round(copying_seconds, 2),
+        "in_place_fill_seconds": round(in_place_seconds, 2),
+        "speedup": round(copying_seconds / in_place_seconds, 1),
+        "refresh_10pct_seconds": round(refresh_seconds, 3),
+        "prune_seconds": round(prune_seconds, 3),
+        "pruned": dropped
+    }
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    n_skus, batch_size = (args + [2_000_000, 20_000][len(args):])[:2]
+    try:
+        print(json.dumps(main(n_skus, batch_size), indent=2))
+    finally:
+        common.cleanup()
@@ -0,0 +1,71 @@
+# benchmarks/bench_match_titles.py
+#
+# python backend/benchmarks/bench_match_titles.py [ours] [theirs]
+#
+# Competitor title matching (utils/match_titles.py): indexes `theirs`
+# synthetic listings and matches `ours` noisy copies of them (re-cased,
+# one character dropped), reporting index and match time and how often
+# the top match is the right product.
+
+import common  # noqa: F401  (configures the app, must come first)
+
+import json
+import sys
+import time
+from typing import List
+import numpy as np
+
+from utils.match_titles import TitleIndex
+
+
+def _pseudo_words(n: int, rng: np.random.Generator) -> List[str]:
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    return ["".join(rng.choice(letters, int(rng.integers(5, 10)))) for _ in range(n)]
+
+
+def synthetic_titles(n: int, rng: np.random.Generator) -> List[str]:
+    brands = _pseudo_words(2000, rng)
+    nouns = _pseudo_words(20000, rng)
+    adjectives = ["wireless", "stainless", "organic", "portable", "premium", "compact", "classic", "deluxe"]
+    sizes = ["small", "medium", "large", "xl", "2 pack", "4 pack", "500ml", "1kg"]
+    picks = zip(rng.integers(0, len(brands), n), rng.integers(0, len(adjectives), n),
+                rng.integers(0, len(nouns), n), rng.integers(0, len(sizes), n))
+    return [f"{brands[b]} {adjectives[a]} {nouns[o]} {sizes[s]}" for b, a, o, s in picks]
+
+
+def main(n_ours: int, n_theirs: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    theirs = synthetic_titles(n_theirs, rng)
+    truth = rng.integers(0, n_theirs, n_ours)
+    # Ours: the same products, re-cased and with a dropped character
+    ours = []
+    for i in truth:
+        title = theirs[i].upper()
+        cut = int(rng.integers(0, len(title)))
+        ours.append(title[:cut] + title[cut + 1:])
+
+    started = time.perf_counter()
+    index = TitleIndex(theirs)
+    indexed = time.perf_counter()
+    matches = index.match(ours, top_k=1)
+    matched = time.perf_counter()
+
+    # Duplicate listings count as a hit when the matched title is identical
+    found = matches.set_index("query")["match"].reindex(range(n_ours), fill_value=-1).to_numpy()
+    exact = np.array([m >= 0 and theirs[m] == theirs[t] for m, t in zip(found, truth)])
+    return {
+        "ours": n_ours,
+        "theirs": n_theirs,
+        "index_seconds": round(indexed - started, 2),
+        "match_seconds": round(matched - indexed, 2),
+        "accuracy": round(float(exact.mean()), 4)
+    }
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    n_ours, n_theirs = (args + [100_000, 1_000_000][len(args):])[:2]
+    try:
+        print(json.dumps(main(n_ours, n_theirs), indent=2))
+    finally:
+        common.cleanup()
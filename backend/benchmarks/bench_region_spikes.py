@@ -0,0 +1,92 @@
+# benchmarks/bench_region_spikes.py
+#
+# python backend/benchmarks/bench_region_spikes.py [rows] [regions] [legacy_regions]
+#
+# Region spike detection (models/geo_demand_map.py) on scored rows spread
+# over many regions: the old per-region loop (groupby, iterrows, then a
+# full-frame filter + nlargest per spiking region) against the vectorized
+# compute_region_spikes, plus the full country/state/location roll-up.
+# The loop filters the whole frame per region, so it is timed over the
+# first `legacy_regions` regions only and extrapolated.
+
+import common  # noqa: F401  (configures the app, must come first)
+
+import json
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from models.geo_demand_map import compute_hierarchy_spikes, compute_region_spikes
+
+
+def scored_rows(n_rows: int, n_regions: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    region = rng.permutation(np.arange(n_rows) % n_regions)
+    required = rng.integers(1, 200, n_rows)
+    df = pd.DataFrame({
+        "country": pd.Categorical.from_codes(region % 4, [f"Country{i}" for i in range(4)]),
+        "state": pd.Categorical.from_codes(region % 200, [f"State{i:03d}" for i in range(200)]),
+        "location": pd.Categorical.from_codes(region, [f"Region{i:05d}" for i in range(n_regions)]),
+        "sku": pd.Categorical.from_codes(rng.integers(0, n_rows // 10, n_rows),
+                                         [f"SKU{i}" for i in range(n_rows // 10)]),
+        "required_stock": required,
+    })
+    df["forecasted_demand"] = required * rng.uniform(0.6, 1.6, n_rows)
+    return df
+
+
+def legacy_spikes(df: pd.DataFrame, limit: int) -> list:
+    results = []
+    grouped = df.groupby("location", observed=True).agg(
+        {"forecasted_demand": "sum", "required_stock": "sum"}).reset_index()
+    for _, row in grouped.head(limit).iterrows():
+        spike_pct = round(100 * (row["forecasted_demand"] - row["required_stock"]) / max(row["required_stock"], 1), 2)
+        if spike_pct < 10:
+            continue
+        products = df[df["location"] == row["location"]].nlargest(5, "forecasted_demand")["sku"].tolist()
+        results.append((row["location"], spike_pct, products))
+    return results
+
+
+def main(rows: int, regions: int, legacy_regions: int) -> dict:
+    # Unique (location, sku) rows, so per-region sums equal the loop's per-row ranking
+    full = scored_rows(rows, regions).drop_duplicates(["location", "sku"], ignore_index=True)
+    # The app's inventory has no columns above location
+    df = full.drop(columns=["country", "state"])
+
+    start = time.perf_counter()
+    expected = legacy_spikes(df, legacy_regions)
+    legacy_seconds = time.perf_counter() - start
+
+    region_seconds, table = common.timed(compute_region_spikes, df, "location", repeat=3)
+    hierarchy_seconds, tables = common.timed(compute_hierarchy_spikes, full, ["country", "state", "location"], repeat=3)
+
+    spikes = table[table["is_spike"]]
+    head = spikes[spikes.index.isin(table.index[:legacy_regions])]
+    assert list(zip(head.index, head["spike_percent"], head["products"])) == expected
+    assert table.index.is_monotonic_increasing
+    rolled = tables["location"].sort_index()
+    assert np.array_equal(rolled["spike_percent"], table["spike_percent"])
+    assert rolled["products"].tolist() == table["products"].tolist()
+
+    legacy_estimate = legacy_seconds * regions / min(legacy_regions, regions)
+    return {
+        "rows": len(df),
+        "regions": regions,
+        "spiking_regions": int(table["is_spike"].sum()),
+        "legacy_seconds_estimated": round(legacy_estimate, 1),
+        "legacy_timed_regions": min(legacy_regions, regions),
+        "region_spikes_seconds": round(region_seconds, 3),
+        "hierarchy_spikes_seconds": round(hierarchy_seconds, 3),
+        "speedup": round(legacy_estimate / region_seconds, 1)
+    }
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:4]]
+    rows, regions, legacy_regions = (args + [1_000_000, 10_000, 200][len(args):])[:3]
+    try:
+        print(json.dumps(main(rows, regions, legacy_regions), indent=2))
+    finally:
+        common.cleanup()
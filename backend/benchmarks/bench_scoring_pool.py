@@ -0,0 +1,52 @@
+# benchmarks/bench_scoring_pool.py
+#
+# python backend/benchmarks/bench_scoring_pool.py [rows] [max_workers]
+#
+# Full-catalogue scoring through the process pool (models/scoring_pool.py)
+# at 1..max_workers workers (default: the core count), against a single
+# in-process predict of the same matrix. The model predicts single-threaded,
+# so the speedup over 1 worker is the pool's own scaling.
+
+import common  # noqa: F401  (configures the app, must come first)
+
+import json
+import os
+import sys
+import numpy as np
+
+from models.registry import get_entry
+from models.scoring_pool import score_matrix, shutdown_pool
+from models.xgb_model import MODEL_NAME, feature_matrix
+
+
+def main(rows: int, max_workers: int) -> dict:
+    common.install_models()
+    entry = get_entry(MODEL_NAME)
+    matrix = feature_matrix(common.synthetic_inventory(rows))
+
+    in_process, expected = common.timed(entry.model.predict, matrix)
+    report = {"rows": rows, "cores": os.cpu_count(), "in_process_seconds": round(in_process, 3), "pool": []}
+    base = None
+    for workers in range(1, max_workers + 1):
+        shutdown_pool()
+        score_matrix(matrix[:workers * 1000], entry.path, entry.version, workers)  # start workers, load model
+        seconds, scored = common.timed(score_matrix, matrix, entry.path, entry.version, workers, repeat=3)
+        assert np.allclose(scored, expected, rtol=1e-5)
+        base = base or seconds
+        report["pool"].append({
+            "workers": workers,
+            "seconds": round(seconds, 3),
+            "speedup": round(base / seconds, 2),
+            "efficiency": round(base / seconds / workers, 2)
+        })
+    shutdown_pool()
+    return report
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    rows, max_workers = (args + [2_000_000, os.cpu_count() or 1][len(args):])[:2]
+    try:
+        print(json.dumps(main(rows, max_workers), indent=2))
+    finally:
+        common.cleanup()
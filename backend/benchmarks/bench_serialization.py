@@ -0,0 +1,52 @@
+# benchmarks/bench_serialization.py
+#
+# python backend/benchmarks/bench_serialization.py [rows ...]
+#
+# Encoding the inventory matrix as JSON: the old per-row loop (iterrows,
+# one InventoryItem per row, then response_model serialization) against
+# the columnar encoder in core/serialization.py, on the same enriched
+# snapshot frame. Defaults to 10k, 100k and 1M rows.
+
+import common  # noqa: F401  (configures the app, must come first)
+
+import json
+import sys
+from typing import List
+from pydantic import TypeAdapter
+
+from core.serialization import frame_to_records_json
+from core.snapshot import build_inventory_snapshot
+from schemas.inventory import InventoryItem
+
+FIELDS = list(InventoryItem.model_fields)
+
+
+def legacy_encode(df) -> bytes:
+    items = [InventoryItem(**{field: row[field] for field in FIELDS}) for _, row in df.iterrows()]
+    return TypeAdapter(List[InventoryItem]).dump_json(items)
+
+
+def main(sizes: list) -> list:
+    common.install_models()
+    report = []
+    for rows in sizes:
+        df = build_inventory_snapshot(common.synthetic_inventory(rows))
+        legacy_seconds, legacy = common.timed(legacy_encode, df)
+        columnar_seconds, columnar = common.timed(frame_to_records_json, df, InventoryItem, repeat=3)
+        report.append({
+            "rows": rows,
+            "legacy_seconds": round(legacy_seconds, 3),
+            "columnar_seconds": round(columnar_seconds, 3),
+            "speedup": round(legacy_seconds / columnar_seconds, 1),
+            "identical": json.loads(legacy) == json.loads(columnar),
+            "mb": round(len(columnar.encode()) / 1e6, 1)
+        })
+        print(json.dumps(report[-1]), flush=True)
+    return report
+
+
+if __name__ == "__main__":
+    try:
+        main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
+    finally:
+        common.cleanup()
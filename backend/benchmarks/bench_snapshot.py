@@ -0,0 +1,99 @@
+# benchmarks/bench_snapshot.py
+#
+# python backend/benchmarks/bench_snapshot.py [rows] [rounds]
+#
+# The dashboard fires the four inventory calls at once. Before the shared
+# snapshot (core/snapshot.py) every call loaded the inventory twice and ran
+# its own model pass; now one enriched frame serves all of them until the
+# data or model version changes. Each round publishes a new inventory
+# version, then runs the four calls concurrently three ways:
+#   per_request  - the old enrichment, once per call (no responses encoded)
+#   cold         - the real routes right after the version change
+#   warm         - the real routes again on the same version
+
+import common  # noqa: F401  (configures the app, must come first)
+
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from fastapi import FastAPI
+
+from api import inventory
+from core.snapshot import snapshot_stats
+from core.utils import load_inventory_data
+from models.registry import get_model
+from models.xgb_model import feature_cols
+
+ROUTES = [
+    "/inventory-matrix",
+    "/inventory-matrix/metrics",
+    "/inventory-matrix/reorder-report",
+    "/inventory-matrix/download"
+]
+
+
+def per_request_enrichment():
+    # What each route did before the snapshot: load, load again and score
+    # inside predict_demand_matrix_with_price, price actions row by row,
+    # then merge (by position here, cheaper than the original sku merge)
+    df = load_inventory_data()
+    scored = load_inventory_data()
+    scored["forecasted_demand"] = get_model("xgb_demand").predict(scored[feature_cols].fillna(0))
+    scored["price_action"] = scored.apply(
+        lambda row: "Lower Price" if row["forecasted_demand"] < row["current_stock"] else "Hold Price",
+        axis=1
+    )
+    return df.join(scored[["forecasted_demand", "price_action"]])
+
+
+def run_per_request():
+    with ThreadPoolExecutor(max_workers=len(ROUTES)) as pool:
+        list(pool.map(lambda _: per_request_enrichment(), ROUTES))
+
+
+async def run_routes(http: httpx.AsyncClient):
+    responses = await asyncio.gather(*(http.get(path) for path in ROUTES))
+    for response in responses:
+        response.raise_for_status()
+
+
+async def main(rows: int, rounds: int):
+    common.install_models()
+    app = FastAPI()
+    app.include_router(inventory.router)
+
+    results = {"per_request": [], "cold": [], "warm": []}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as http:
+        for round_ in range(rounds):
+            # New prices each round, so cached predictions do not carry over
+            common.publish_inventory(common.synthetic_inventory(rows, seed=round_))
+            seconds, _ = common.timed(run_per_request)
+            results["per_request"].append(seconds)
+
+            common.publish_inventory(common.synthetic_inventory(rows, seed=rounds + round_))
+            for mode in ("cold", "warm"):
+                loop = asyncio.get_running_loop()
+                started = loop.time()
+                await run_routes(http)
+                results[mode].append(loop.time() - started)
+
+    report = {
+        mode: {"best_seconds": round(min(values), 3), "mean_seconds": round(sum(values) / len(values), 3)}
+        for mode, values in results.items()
+    }
+    report["rows"] = rows
+    report["concurrent_calls"] = len(ROUTES)
+    report["model_passes"] = {"per_request": len(ROUTES) * rounds, "snapshot": snapshot_stats["builds"]}
+    return report
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    rows, rounds = (args + [100_000, 3][len(args):])[:2]
+    try:
+        print(json.dumps(asyncio.run(main(rows, rounds)), indent=2))
+    finally:
+        common.cleanup()
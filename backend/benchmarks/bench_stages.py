@@ -0,0 +1,90 @@
+# benchmarks/bench_stages.py
+#
+# python backend/benchmarks/bench_stages.py [seconds] [concurrency] [rows]
+#
+# Mixed-traffic load test through the request stages (core/stages.py):
+# `concurrency` in-process clients send LOAD_MIX against the dashboard,
+# inventory and event routers for `seconds`. Reports per-class throughput,
+# latency percentiles and status counts (429s are stage rejections).
+
+import common  # noqa: F401  (configures the app, must come first)
+
+import asyncio
+import json
+import sys
+import time
+import httpx
+import numpy as np
+from fastapi import FastAPI
+
+from api import dashboard, inventory, events
+from core.jobs import start_jobs
+from core.stages import stages_status
+
+# (weight, method, path, json body) per traffic class; weights are requests per round
+LOAD_MIX = {
+    "dashboard": (8, "GET", "/dashboard/metrics", None),
+    "inventory_page": (6, "GET", "/inventory-matrix?limit=100&sort_by=sku", None),
+    "inventory_metrics": (4, "GET", "/inventory-matrix/metrics", None),
+    "event_batch": (2, "POST", "/event-estimator/batch", {
+        "scenarios": [], "grid": {"regions": ["Mumbai", "Texas", "Delhi"], "event_types": ["Festival", "Sale"],
+                                  "score_min": 0, "score_max": 10, "score_step": 0.001}
+    }),
+    "export": (2, "GET", "/inventory-matrix/download?format=csv", None)
+}
+
+
+async def load_test(app, seconds: float, concurrency: int, base_url: str = "http://loadtest") -> dict:
+    plan = [name for name, (weight, *_) in LOAD_MIX.items() for _ in range(weight)]
+    latencies = {name: [] for name in LOAD_MIX}
+    statuses = {name: {} for name in LOAD_MIX}
+    deadline = time.perf_counter() + seconds
+
+    async def client(worker: int, http: httpx.AsyncClient):
+        i = worker
+        while time.perf_counter() < deadline:
+            name = plan[i % len(plan)]
+            i += 1
+            _, method, path, body = LOAD_MIX[name]
+            started = time.perf_counter()
+            response = await http.request(method, path, json=body)
+            await response.aread()
+            latencies[name].append(time.perf_counter() - started)
+            statuses[name][response.status_code] = statuses[name].get(response.status_code, 0) + 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=None) as http:
+        await asyncio.gather(*(client(worker, http) for worker in range(concurrency)))
+
+    report = {}
+    for name, values in latencies.items():
+        values = np.array(values) * 1000
+        report[name] = {
+            "requests": len(values),
+            "rps": round(len(values) / seconds, 1),
+            "p50_ms": round(float(np.percentile(values, 50)), 1) if len(values) else None,
+            "p99_ms": round(float(np.percentile(values, 99)), 1) if len(values) else None,
+            "statuses": statuses[name]
+        }
+    report["stages"] = stages_status()
+    return report
+
+
+def main(seconds: float, concurrency: int, rows: int) -> dict:
+    common.install_models()
+    common.publish_inventory(common.synthetic_inventory(rows))
+
+    app = FastAPI()
+    for router in (dashboard.router, inventory.router, events.router):
+        app.include_router(router)
+    start_jobs()
+    return asyncio.run(load_test(app, seconds, concurrency))
+
+
+if __name__ == "__main__":
+    args = [float(arg) for arg in sys.argv[1:4]]
+    seconds, concurrency, rows = (args + [10.0, 64, 100_000][len(args):])[:3]
+    try:
+        print(json.dumps(main(seconds, int(concurrency), int(rows)), indent=2))
+    finally:
+        common.cleanup()
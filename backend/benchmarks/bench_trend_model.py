@@ -0,0 +1,66 @@
+# benchmarks/bench_trend_model.py
+#
+# python backend/benchmarks/bench_trend_model.py [skus] [days]
+#
+# Streaming trend spike detection (models/trend_model.py) on a detector
+# of its own: registering the SKUs, one batch of daily sales plus a period
+# close per day, then single sales. The last day plants spikes on the
+# first 100 SKUs, which should all be flagged.
+
+import common  # noqa: F401  (configures the app, must come first)
+
+import json
+import sys
+import time
+import numpy as np
+
+from models.trend_model import TrendSpikeDetector
+
+
+def main(n_skus: int, days: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    detector = TrendSpikeDetector(capacity=n_skus)
+    skus = [f"SKU{i}" for i in range(n_skus)]
+    base = rng.gamma(2.0, 10.0, n_skus)
+
+    slots_seconds, _ = common.timed(detector.slots, skus)
+
+    batch_seconds, close_seconds = 0.0, 0.0
+    for day in range(days):
+        sales = rng.poisson(base)
+        if day == days - 1:
+            sales[:100] *= 10  # planted spikes
+        started = time.perf_counter()
+        detector.add_sales(skus, sales)
+        batch_seconds += time.perf_counter() - started
+        started = time.perf_counter()
+        detector.close_period()
+        close_seconds += time.perf_counter() - started
+
+    single = 100_000
+    picks = rng.integers(0, n_skus, single)
+    started = time.perf_counter()
+    for i in picks:
+        detector.add_sale(skus[i])
+    sale_seconds = time.perf_counter() - started
+
+    flagged = set(detector.spiking)
+    return {
+        "skus": n_skus,
+        "days": days,
+        "register_seconds": round(slots_seconds, 2),
+        "daily_batch_ms": round(batch_seconds / days * 1000, 1),
+        "daily_close_ms": round(close_seconds / days * 1000, 1),
+        "single_sale_us": round(sale_seconds / single * 1e6, 2),
+        "planted_found": len(flagged & set(range(100))),
+        "flagged": len(flagged)
+    }
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    n_skus, days = (args + [1_000_000, 30][len(args):])[:2]
+    try:
+        print(json.dumps(main(n_skus, days), indent=2))
+    finally:
+        common.cleanup()
@@ -0,0 +1,105 @@
+# benchmarks/common.py
+#
+# Shared setup for the benchmark scripts in this directory. Importing it
+# points the app at a scratch directory (inventory file, model weights,
+# stores) through the usual WAREHOUSEIQ_* settings, so it must be imported
+# before any app module.
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+WEIGHTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "model_weights"))
+WORK_DIR = tempfile.mkdtemp(prefix="warehouseiq-bench-")
+INVENTORY_PATH = os.path.join(WORK_DIR, "inventory.parquet")
+
+sys.path.insert(0, APP_DIR)
+for name, value in {
+    "WAREHOUSEIQ_INVENTORY_SOURCE": "parquet",
+    "WAREHOUSEIQ_INVENTORY_URI": INVENTORY_PATH,
+    "WAREHOUSEIQ_MODEL_WEIGHTS_DIR": os.path.join(WORK_DIR, "model_weights"),
+    "WAREHOUSEIQ_FORECAST_STORE_PATH": os.path.join(WORK_DIR, "forecast_store.npz"),
+    "WAREHOUSEIQ_GEOCODE_CACHE_PATH": os.path.join(WORK_DIR, "geocode_cache.sqlite3"),
+    "WAREHOUSEIQ_PRICE_HISTORY_DIR": os.path.join(WORK_DIR, "price_history"),
+    "WAREHOUSEIQ_COMPETITOR_FEED_DIR": os.path.join(WORK_DIR, "competitor_feeds"),
+}.items():
+    os.environ.setdefault(name, value)
+
+REGIONS = ["California", "Texas", "New York", "Florida", "Illinois", "Ohio", "Georgia", "Washington"]
+BRANDS = [f"Brand{i}" for i in range(50)]
+CATEGORIES = ["Toys", "Food", "Electronics", "Home", "Garden", "Sports", "Beauty", "Books"]
+
+
+def synthetic_inventory(n_rows: int, n_locations: int = 4, seed: int = 0) -> pd.DataFrame:
+    """
+    Catalogue of n_rows SKU x location rows with the inventory and model
+    feature columns.
+    """
+    rng = np.random.default_rng(seed)
+    n_skus = max(n_rows // n_locations, 1)
+    brand = rng.integers(0, len(BRANDS), n_rows)
+    category = rng.integers(0, len(CATEGORIES), n_rows)
+    return pd.DataFrame({
+        "sku": [f"SKU{i % n_skus}" for i in range(n_rows)],
+        "product_name": [f"Product {i % n_skus}" for i in range(n_rows)],
+        "brand": np.array(BRANDS)[brand],
+        "category": np.array(CATEGORIES)[category],
+        "location": np.array(REGIONS[:n_locations])[np.arange(n_rows) % n_locations],
+        "current_stock": rng.integers(0, 200, n_rows),
+        "required_stock": rng.integers(0, 200, n_rows),
+        "max_capacity": np.full(n_rows, 300),
+        "price": rng.uniform(1, 50, n_rows).round(2),
+        "rating": rng.uniform(1, 5, n_rows).round(1),
+        "discount": rng.uniform(0, 0.5, n_rows).round(2),
+        "brand_index": brand,
+        "category_index": category
+    })
+
+
+def publish_inventory(df: pd.DataFrame):
+    """
+    Writes `df` as the configured parquet inventory (a new data version).
+    """
+    df.to_parquet(INVENTORY_PATH, index=False)
+
+
+def install_models(n_estimators: int = 50, seed: int = 0):
+    """
+    Trains a small XGBoost demand model on synthetic features and places it
+    next to the bundled weights in the scratch weights directory.
+    """
+    import joblib
+    from xgboost import XGBRegressor
+
+    target_dir = os.environ["WAREHOUSEIQ_MODEL_WEIGHTS_DIR"]
+    os.makedirs(target_dir, exist_ok=True)
+    for filename in os.listdir(WEIGHTS_DIR):
+        shutil.copy(os.path.join(WEIGHTS_DIR, filename), target_dir)
+
+    train = synthetic_inventory(20_000, seed=seed)
+    features = train[["price", "rating", "discount", "brand_index", "category_index"]].to_numpy(dtype=np.float32)
+    demand = 200 / train["price"] + 30 * train["discount"] + 5 * train["rating"]
+    model = XGBRegressor(n_estimators=n_estimators, max_depth=6, n_jobs=1)
+    model.fit(features, demand)
+    joblib.dump(model, os.path.join(target_dir, "xgb_demand_model.pkl"))
+
+
+def timed(func, *args, repeat: int = 1, **kwargs):
+    """
+    (best seconds over `repeat` runs, last result)
+    """
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def cleanup():
+    shutil.rmtree(WORK_DIR, ignore_errors=True)
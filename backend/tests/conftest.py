@@ -0,0 +1,95 @@
+# tests/conftest.py
+#
+# Points the app at a scratch directory (parquet inventory, model weights,
+# stores) through the usual WAREHOUSEIQ_* settings before any app module
+# is imported. backend/app goes on the import path the way the modules
+# import each other, backend/ so `app.main` imports as under uvicorn.
+
+import os
+import shutil
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+APP_DIR = os.path.join(BACKEND_DIR, "app")
+WEIGHTS_DIR = os.path.join(BACKEND_DIR, "model_weights")
+WORK_DIR = tempfile.mkdtemp(prefix="warehouseiq-tests-")
+INVENTORY_PATH = os.path.join(WORK_DIR, "inventory.parquet")
+
+sys.path[:0] = [APP_DIR, BACKEND_DIR]
+os.environ.update({
+    "WAREHOUSEIQ_INVENTORY_SOURCE": "parquet",
+    "WAREHOUSEIQ_INVENTORY_URI": INVENTORY_PATH,
+    "WAREHOUSEIQ_MODEL_WEIGHTS_DIR": os.path.join(WORK_DIR, "model_weights"),
+    "WAREHOUSEIQ_FORECAST_STORE_PATH": os.path.join(WORK_DIR, "forecast_store.npz"),
+    "WAREHOUSEIQ_GEOCODE_CACHE_PATH": os.path.join(WORK_DIR, "geocode_cache.sqlite3"),
+    "WAREHOUSEIQ_PRICE_HISTORY_DIR": os.path.join(WORK_DIR, "price_history"),
+    "WAREHOUSEIQ_COMPETITOR_FEED_DIR": os.path.join(WORK_DIR, "competitor_feeds"),
+    "WAREHOUSEIQ_SCORING_WORKERS": "1",
+    "WAREHOUSEIQ_PREDICTION_BATCH_WINDOW_MS": "0",
+})
+
+FEATURE_COLUMNS = ["price", "rating", "discount", "brand_index", "category_index"]
+
+
+class LinearDemandModel:
+    """
+    Deterministic stand-in for the XGBoost demand model (same predict API).
+    """
+
+    def predict(self, features):
+        features = np.asarray(features, dtype=float)
+        return 200 / np.maximum(features[:, 0], 1) + 30 * features[:, 2] + 5 * features[:, 1]
+
+
+def synthetic_inventory(n_rows: int = 60, n_locations: int = 3, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n_skus = max(n_rows // n_locations, 1)
+    brand = rng.integers(0, 3, n_rows)
+    category = rng.integers(0, 2, n_rows)
+    return pd.DataFrame({
+        "sku": [f"SKU{i % n_skus}" for i in range(n_rows)],
+        "product_name": [f'Product "{i % n_skus}" é' for i in range(n_rows)],
+        "brand": np.array(["Acme", "Bolt", "Crest"])[brand],
+        "category": np.array(["Toys", "Food"])[category],
+        "location": np.array(["California", "Texas", "New York"][:n_locations])[np.arange(n_rows) % n_locations],
+        "current_stock": rng.integers(0, 200, n_rows),
+        "required_stock": rng.integers(0, 200, n_rows),
+        "max_capacity": np.full(n_rows, 300),
+        "price": rng.uniform(1, 50, n_rows).round(2),
+        "rating": rng.uniform(1, 5, n_rows).round(1),
+        "discount": rng.uniform(0, 0.5, n_rows).round(2),
+        "brand_index": brand,
+        "category_index": category
+    })
+
+
+@pytest.fixture(scope="session", autouse=True)
+def model_weights():
+    import joblib
+    target_dir = os.environ["WAREHOUSEIQ_MODEL_WEIGHTS_DIR"]
+    os.makedirs(target_dir, exist_ok=True)
+    for filename in os.listdir(WEIGHTS_DIR):
+        shutil.copy(os.path.join(WEIGHTS_DIR, filename), target_dir)
+    joblib.dump(LinearDemandModel(), os.path.join(target_dir, "xgb_demand_model.pkl"))
+    yield target_dir
+    shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def inventory():
+    """
+    Publishes a synthetic inventory as the configured source (a new data
+    version) and returns it; call it again with other arguments to publish
+    a different one.
+    """
+    def publish(n_rows: int = 60, n_locations: int = 3, seed: int = 0, frame: pd.DataFrame = None):
+        df = synthetic_inventory(n_rows, n_locations, seed) if frame is None else frame
+        df.to_parquet(INVENTORY_PATH, index=False)
+        return df
+
+    publish()
+    return publish
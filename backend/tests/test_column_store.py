@@ -0,0 +1,49 @@
+# tests/test_column_store.py
+
+import numpy as np
+
+from core.column_store import open_column_store, publish_column_store
+from conftest import synthetic_inventory
+
+
+def _mapped(array) -> bool:
+    # True when the array's memory comes from a file mapping
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+def test_round_trip(tmp_path):
+    df = synthetic_inventory(200)
+    df["brand"] = df["brand"].astype("category")
+    publish_column_store(df, str(tmp_path))
+
+    loaded = open_column_store(str(tmp_path))
+    assert list(loaded.columns) == list(df.columns)
+    for column in df.columns:
+        assert loaded[column].tolist() == df[column].tolist(), column
+
+
+def test_numeric_columns_and_codes_are_mapped_without_copy(tmp_path):
+    df = synthetic_inventory(1000)
+    # > 127 distinct values needs int16 codes
+    df["sku"] = [f"SKU{i % 400}" for i in range(len(df))]
+    publish_column_store(df, str(tmp_path))
+
+    loaded = open_column_store(str(tmp_path), ["sku", "brand", "current_stock", "price"])
+    assert _mapped(loaded["current_stock"].array._ndarray)
+    assert _mapped(loaded["price"].array._ndarray)
+    assert loaded["brand"].array.codes.dtype == np.int8
+    assert _mapped(loaded["brand"].array.codes)
+    assert loaded["sku"].array.codes.dtype == np.int16
+    assert _mapped(loaded["sku"].array.codes)
+
+
+def test_publish_swaps_versions(tmp_path):
+    publish_column_store(synthetic_inventory(10, seed=1), str(tmp_path))
+    first = open_column_store(str(tmp_path))
+    publish_column_store(synthetic_inventory(20, seed=2), str(tmp_path))
+    assert len(open_column_store(str(tmp_path))) == 20
+    assert len(first) == 10  # an open mapping keeps the old version readable
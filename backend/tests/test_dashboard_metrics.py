@@ -0,0 +1,53 @@
+# tests/test_dashboard_metrics.py
+
+import time
+import pytest
+
+from core import dashboard_metrics, jobs
+from core.dashboard_metrics import CachedComponent
+
+
+@pytest.mark.parametrize("trend, text", [(23.0, "+23.00% demand"), (-4.92, "-4.92% demand"), (0.0, "+0.00% demand")])
+def test_demand_increase_is_signed(monkeypatch, trend, text):
+    monkeypatch.setattr(dashboard_metrics, "get_inventory_kpis", lambda: {})
+    monkeypatch.setattr(dashboard_metrics, "resolve_components", lambda: {
+        "xgb_accuracy": 95.0, "prophet_trend": trend, "trend_spike": []
+    })
+    metrics = dashboard_metrics.get_dashboard_metrics()
+    assert metrics["prophet_seasonality"]["demand_increase"] == text
+
+
+def counting_component(version, ttl: float = 60.0) -> CachedComponent:
+    calls = []
+    component = CachedComponent("counting", lambda: calls.append(1) or len(calls), 0, ttl, 5.0, version=version)
+    return component, calls
+
+
+def resolve(component: CachedComponent):
+    return component.result(component.start(), time.monotonic() + 5.0)
+
+
+def test_component_recomputes_only_when_its_version_moves():
+    versions = ["v1"]
+    component, calls = counting_component(lambda: versions[0])
+    assert resolve(component) == 1
+    assert resolve(component) == 1
+    versions[0] = "v2"
+    assert resolve(component) == 2
+    assert component.stats["computed"] == 2 and component.stats["hits"] == 1
+
+
+def test_component_recomputes_after_its_ttl():
+    component, calls = counting_component(None, ttl=0.0)
+    assert resolve(component) == 1
+    assert resolve(component) == 2
+
+
+def test_aggregate_job_keeps_fresh_components(inventory, monkeypatch):
+    component, calls = counting_component(lambda: "v1")
+    monkeypatch.setattr(dashboard_metrics, "COMPONENTS", [component])
+    jobs._aggregate()
+    resolve(component)
+    jobs._aggregate()
+    jobs._aggregate()
+    assert len(calls) == 1
@@ -0,0 +1,45 @@
+# tests/test_data_sources.py
+
+import sqlite3
+from contextlib import closing
+import pytest
+
+from core.data_sources import CachedLoader, INVENTORY_DTYPES, create_source
+from conftest import synthetic_inventory
+
+
+def test_sqlite_source_reads_projection_and_closes(tmp_path, monkeypatch):
+    path = str(tmp_path / "inventory.db")
+    df = synthetic_inventory(30)
+    with closing(sqlite3.connect(path)) as conn:
+        df.to_sql("inventory", conn, index=False)
+        conn.commit()
+
+    opened = []
+    connect = sqlite3.connect
+    monkeypatch.setattr(sqlite3, "connect", lambda *args, **kwargs: opened.append(connect(*args, **kwargs)) or opened[-1])
+
+    loader = CachedLoader(create_source("sqlite", path, "inventory", INVENTORY_DTYPES, {}))
+    loaded = loader.load(["sku", "current_stock"])
+    assert len(opened) == 1
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")  # closed after the read
+    assert list(loaded.columns) == ["sku", "current_stock"]
+    assert loaded["current_stock"].tolist() == df["current_stock"].tolist()
+    assert str(loaded["sku"].dtype) == "category"
+
+
+def test_sqlite_version_changes_on_write(tmp_path):
+    path = str(tmp_path / "inventory.db")
+    with closing(sqlite3.connect(path)) as conn:
+        synthetic_inventory(10).to_sql("inventory", conn, index=False)
+        conn.commit()
+    loader = CachedLoader(create_source("sqlite", path, "inventory", INVENTORY_DTYPES, {}))
+    before = loader.version()
+    assert len(loader.load()) == 10
+
+    with closing(sqlite3.connect(path)) as conn:
+        synthetic_inventory(20).to_sql("inventory", conn, index=False, if_exists="append")
+        conn.commit()
+    assert loader.version() != before
+    assert len(loader.load()) == 30
@@ -0,0 +1,100 @@
+# tests/test_demand_map.py
+
+from datetime import date, timedelta
+import pytest
+from fastapi.testclient import TestClient
+
+from conftest import synthetic_inventory
+from app.main import app
+from core import event_store, snapshot
+from core.demand_map import build_tiles, nearest_surplus, spikes_payload, SPIKE_REASON, SPIKE_DURATION
+from core.event_store import get_calendar
+
+
+@pytest.fixture
+def surplus_inventory(inventory):
+    # One SKU: spiking in California, held in Texas with less than one
+    # unit above its fractional forecast (200 / 10 + 5 * 1 + 30 * 0.01 = 25.3)
+    df = synthetic_inventory(3, n_locations=3)
+    df["sku"] = "SKU0"
+    df["location"] = ["California", "Texas", "New York"]
+    df["price"] = [1.0, 10.0, 10.0]
+    df["rating"] = [1.0, 1.0, 1.0]
+    df["discount"] = [0.0, 0.01, 0.01]
+    df["required_stock"] = [10, 0, 0]
+    df["current_stock"] = [0, 26, 25]
+    return inventory(frame=df)
+
+
+def test_tiles_read_the_shared_snapshot(surplus_inventory, monkeypatch):
+    current = snapshot.refresh_snapshot()
+
+    def no_model_pass(*args, **kwargs):
+        raise AssertionError("the demand map must not score the inventory itself")
+
+    monkeypatch.setattr(snapshot, "predict_demand_matrix_with_price", no_model_pass)
+    tiles = build_tiles()
+
+    assert tiles.version == current.version
+    assert tiles.table.loc["California", "is_spike"]
+    # Spikes use the required stock as loaded, not the forecast-floored one
+    assert tiles.table.loc["California", "required_stock"] == 10
+
+
+def test_surplus_counts_whole_units(surplus_inventory):
+    tiles = build_tiles()
+    result = nearest_surplus(tiles, "California")
+
+    assert result["products"] == ["SKU0"]
+    # Texas: 26 in stock against an integer forecast of 25; New York has none
+    assert [(w["region"], w["surplus_units"]) for w in result["warehouses"]] == [("Texas", 1)]
+
+
+def test_nearest_surplus_after_an_incremental_refresh(surplus_inventory, inventory):
+    tiles = build_tiles()
+    assert tiles.surplus.index.get_level_values("sku").tolist() == ["SKU0"]
+
+    # Texas sells out: only its rows are recomputed and its surplus dropped
+    inventory(frame=surplus_inventory.assign(current_stock=[0, 0, 25]))
+    refreshed = build_tiles(previous=tiles)
+
+    assert refreshed.recomputed_regions == 1
+    assert refreshed.table.loc["California", "is_spike"]
+    result = nearest_surplus(refreshed, "California")
+    assert result["products"] == ["SKU0"] and result["warehouses"] == []
+
+
+def test_spike_reasons_come_from_the_event_calendar(surplus_inventory):
+    tiles = build_tiles()
+    calendar = get_calendar()
+
+    # Black Friday (California, 2026-11-27) is within the window
+    regions = spikes_payload(tiles, (calendar, date(2026, 11, 20)))["regions"]
+    california = next(region for region in regions if region["region"] == "California")
+    assert california["reason"].startswith("Black Friday (+") and california["duration"] == "1 day"
+
+    # No event ahead: the generic reason
+    regions = spikes_payload(tiles, (calendar, date(2027, 1, 10)))["regions"]
+    california = next(region for region in regions if region["region"] == "California")
+    assert (california["reason"], california["duration"]) == (SPIKE_REASON, SPIKE_DURATION)
+
+
+def test_ingested_events_reach_the_cached_payloads(surplus_inventory, monkeypatch):
+    monkeypatch.setattr(event_store, "_calendar", None)
+    client = TestClient(app)
+    before = client.get("/demand-map/summary-cards")
+    assert before.json()[0]["region"] == "California"
+
+    today = date.today()
+    event_store.ingest_events([{
+        "event_name": "Heatwave", "event_type": "Weather", "region": "California",
+        "date": today.isoformat(), "end_date": (today + timedelta(days=2)).isoformat(), "score": 6.0
+    }])
+    after = client.get("/demand-map/summary-cards")
+
+    assert after.headers["ETag"] != before.headers["ETag"]
+    card = after.json()[0]
+    assert card["reason"].startswith("Heatwave (+") and card["duration"] == "3 days"
+    overlay = {entry["region"]: entry for entry in client.get("/demand-map/geo-overlay").json()}
+    assert overlay["California"]["reason"] == card["reason"]
+    assert overlay["Texas"]["reason"] == SPIKE_REASON
@@ -0,0 +1,45 @@
+# tests/test_event_batch.py
+
+import json
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.api import events  # the module the app mounts
+from models.event_model import score_event_impacts
+
+GRID = {"regions": ["Mumbai", "Texas", "Delhi"], "event_types": ["Festival", "Sale"],
+        "score_min": 0, "score_max": 10, "score_step": 0.5}
+SCENARIOS = [{"region": "Texas", "event_type": "Sale", "score": 7.5},
+             {"region": "Mumbai", "event_type": "Concert", "score": 12}]
+
+
+def expected_lines() -> list:
+    # The whole batch scored as one frame, as before chunking
+    steps = int(round((GRID["score_max"] - GRID["score_min"]) / GRID["score_step"])) + 1
+    grid_scores = GRID["score_min"] + GRID["score_step"] * np.arange(steps)
+    regions = [s["region"] for s in SCENARIOS] + [r for r in GRID["regions"] for _ in range(2 * steps)]
+    types = [s["event_type"] for s in SCENARIOS] + [t for _ in GRID["regions"] for t in GRID["event_types"] for _ in range(steps)]
+    scores = [s["score"] for s in SCENARIOS] + list(np.tile(grid_scores, 6))
+    frame = score_event_impacts(regions, types, scores)
+    return [json.loads(line) for line in frame.to_json(orient="records", lines=True).splitlines()]
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 7, 50_000])
+def test_chunked_scoring_matches_a_single_pass(monkeypatch, chunk_rows):
+    monkeypatch.setattr(events, "BATCH_CHUNK_ROWS", chunk_rows)
+    plan = events._batch_plan(events.EventBatchRequest(scenarios=SCENARIOS, grid=GRID))
+    body = b"".join(events._iter_scored_batch(*plan, chunk_rows=chunk_rows))
+    assert [json.loads(line) for line in body.decode().splitlines()] == expected_lines()
+
+
+def test_batch_route_streams_and_enforces_the_cap(monkeypatch):
+    client = TestClient(app)
+    response = client.post("/event-estimator/batch", json={"scenarios": SCENARIOS, "grid": GRID})
+    assert response.status_code == 200
+    assert [json.loads(line) for line in response.text.splitlines()] == expected_lines()
+
+    monkeypatch.setattr(events, "MAX_BATCH_SCENARIOS", 100)
+    response = client.post("/event-estimator/batch", json={"scenarios": SCENARIOS, "grid": GRID})
+    assert response.status_code == 400
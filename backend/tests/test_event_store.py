@@ -0,0 +1,68 @@
+# tests/test_event_store.py
+
+import datetime
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from core.event_store import EventCalendar
+
+REGIONS = ["Texas", "Mumbai", "Delhi"]
+CATEGORIES = ["Toys", "Food", "Home"]
+DAY0 = datetime.date(2026, 1, 1)
+
+
+def random_events(n: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    # Mostly single-day events, some spanning days to months, one a whole year
+    spans = np.where(rng.random(n) < 0.6, 0, rng.integers(1, 90, n))
+    spans[0] = 365
+    events = []
+    for i in range(n):
+        start = DAY0 + datetime.timedelta(days=int(rng.integers(0, 365)))
+        events.append({
+            "event_name": f"Event{i}", "event_type": "Sale", "region": REGIONS[i % 3], "score": 5.0,
+            "date": start.isoformat(),
+            "end_date": (start + datetime.timedelta(days=int(spans[i]))).isoformat() if spans[i] else None,
+            "categories": list(rng.choice(CATEGORIES, size=int(rng.integers(0, 3)), replace=False))
+        })
+    return events
+
+
+def brute_force(calendar: EventCalendar, start, end, regions, categories) -> list:
+    return [
+        event for event in calendar.events
+        if (end is None or event["date"] <= end.isoformat())
+        and (start is None or (event["end_date"] or event["date"]) >= start.isoformat())
+        and (not regions or event["region"] in regions)
+        and (not categories or set(categories) & set(event["categories"]))
+    ]
+
+
+def test_queries_match_a_full_scan():
+    calendar = EventCalendar(random_events(500))
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        start = DAY0 + datetime.timedelta(days=int(rng.integers(-30, 400)))
+        end = start + datetime.timedelta(days=int(rng.integers(0, 20)))
+        bounds = [(start, end), (start, None), (None, end), (None, None)][int(rng.integers(0, 4))]
+        regions = list(rng.choice(REGIONS, size=int(rng.integers(0, 3)), replace=False))
+        categories = list(rng.choice(CATEGORIES, size=int(rng.integers(0, 2)), replace=False))
+        assert calendar.query(*bounds, regions, categories) == brute_force(calendar, *bounds, regions, categories)
+
+
+def test_one_long_event_does_not_widen_other_buckets():
+    calendar = EventCalendar(random_events(500))
+    single_day = next(bucket for bucket in calendar.buckets if bucket.max_span == np.timedelta64(0, "D"))
+    assert max(bucket.max_span for bucket in calendar.buckets) == np.timedelta64(365, "D")
+    assert len(single_day.positions) > 250
+
+
+def test_events_ending_before_they_start_are_rejected():
+    event = dict(random_events(1)[0], date="2026-05-10", end_date="2026-05-01")
+    with pytest.raises(ValueError, match="before date"):
+        EventCalendar([event])
+
+    response = TestClient(app).post("/event-estimator/calendar", json=[event])
+    assert response.status_code == 400
@@ -0,0 +1,100 @@
+# tests/test_export.py
+
+import asyncio
+import gzip
+import io
+import json
+import time
+import pandas as pd
+import pytest
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from conftest import synthetic_inventory
+from app.main import app
+from app.api import inventory as inventory_api  # the module the app mounts
+from core.export import gzip_chunks, iter_csv, iter_ndjson, iter_parquet
+from core.stages import Stage
+
+COLUMNS = ["sku", "location", "current_stock", "price"]
+
+
+@pytest.fixture
+def frame():
+    return synthetic_inventory(50)
+
+
+def test_csv_header_is_written_once(frame):
+    chunks = list(iter_csv(frame, chunk_rows=7, columns=COLUMNS))
+    assert len(chunks) == 8
+    body = b"".join(chunks).decode()
+    assert body.count("sku,location") == 1
+    pd.testing.assert_frame_equal(pd.read_csv(io.StringIO(body)), frame[COLUMNS], check_dtype=False)
+
+
+def test_empty_csv_is_just_the_header(frame):
+    assert b"".join(iter_csv(frame.iloc[:0], columns=COLUMNS)) == b"sku,location,current_stock,price\n"
+
+
+def test_ndjson_survives_a_gzip_round_trip(frame):
+    body = gzip.decompress(b"".join(gzip_chunks(iter_ndjson(frame, chunk_rows=7, columns=COLUMNS))))
+    rows = [json.loads(line) for line in body.decode().splitlines()]
+    assert rows == json.loads(frame[COLUMNS].to_json(orient="records"))
+
+
+def test_parquet_reads_back(frame):
+    pq = pytest.importorskip("pyarrow.parquet")
+    body = b"".join(iter_parquet(frame, chunk_rows=7, columns=COLUMNS))
+    assert pq.ParquetFile(io.BytesIO(body)).num_row_groups == 8
+    pd.testing.assert_frame_equal(pd.read_parquet(io.BytesIO(body)), frame[COLUMNS], check_dtype=False)
+
+
+# ---------- Export Slots ----------
+@pytest.fixture
+def export_stage(monkeypatch):
+    stage = Stage("export", 1, 0)
+    monkeypatch.setattr(inventory_api.stages, "export", stage)
+    return stage
+
+
+@pytest.mark.parametrize("params", [{"format": "csv"}, {"format": "ndjson", "gzip": "true"}])
+def test_slot_is_released_when_the_stream_ends(inventory, export_stage, params):
+    source = inventory()
+    response = TestClient(app).get("/inventory-matrix/download", params=params)
+    assert response.status_code == 200
+    body = gzip.decompress(response.content) if "gzip" in params else response.content
+    assert len(body.decode().splitlines()) == len(source) + (params["format"] == "csv")
+    assert export_stage.in_flight == 0 and export_stage.stats["completed"] == 1
+
+
+def test_slot_is_released_when_the_request_is_rejected(inventory, export_stage):
+    response = TestClient(app).get("/inventory-matrix/download", params={"format": "xlsx"})
+    assert response.status_code == 400
+    assert export_stage.in_flight == 0 and export_stage.stats["failed"] == 1
+
+
+def test_slot_is_released_when_the_client_disconnects(frame, export_stage):
+    def slow(chunks):
+        for chunk in chunks:
+            time.sleep(0.01)
+            yield chunk
+
+    async def disconnect_early():
+        slot = export_stage.reserve()
+        response = StreamingResponse(export_stage.stream(slow(iter_csv(frame, 1)), slot))
+        sent = []
+
+        async def receive():
+            await asyncio.sleep(0.05)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        await response({"type": "http", "asgi": {"spec_version": "2.3"}}, receive, send)
+        assert export_stage.in_flight == 0  # before the body is garbage collected
+        return sent
+
+    sent = asyncio.run(disconnect_early())
+    assert 1 < len(sent) < len(frame) + 1  # started, then cut off
+    assert export_stage.in_flight == 0 and export_stage.stats["failed"] == 1
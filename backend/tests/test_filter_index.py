@@ -0,0 +1,31 @@
+# tests/test_filter_index.py
+
+import numpy as np
+import pytest
+
+from core.filter_index import build_filter_index, select_rows
+from core.snapshot import get_inventory_snapshot
+
+
+@pytest.mark.parametrize("filters", [
+    {"brand": ["Acme"]},
+    {"brand": ["Acme", "Crest"]},
+    {"brand": ["Bolt"], "location": ["Texas"]},
+    {"brand": ["Bolt"], "category": ["Toys"], "location": ["Texas", "New York"]},
+    {"status": ["Critical", "Low"], "category": ["Food"]},
+    {"brand": ["Nope"]},
+])
+def test_select_rows_matches_boolean_masks(inventory, filters):
+    inventory(400, seed=5)
+    df = get_inventory_snapshot()
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in filters.items():
+        mask &= df[column].astype(str).isin(values).to_numpy()
+
+    selected = select_rows(build_filter_index(df), filters)
+    assert selected.tolist() == np.flatnonzero(mask).tolist()
+
+
+def test_no_filter_selects_everything(inventory):
+    index = build_filter_index(get_inventory_snapshot())
+    assert select_rows(index, {"brand": None, "location": []}) is None
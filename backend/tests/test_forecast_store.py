@@ -0,0 +1,81 @@
+# tests/test_forecast_store.py
+
+import datetime
+import os
+import numpy as np
+import pandas as pd
+
+from core.forecast_store import ForecastStore, compute_forecasts
+from core.utils import load_inventory_data
+from models import xgb_model
+
+HORIZONS = [7, 30]
+TODAY = datetime.date(2026, 10, 1)
+
+
+def forecasts(skus: list, value: float) -> pd.DataFrame:
+    return pd.DataFrame({"sku": skus, "forecast_7d": value, "forecast_30d": value * 4})
+
+
+def test_batches_grow_in_place(tmp_path):
+    store = ForecastStore(str(tmp_path / "store.npz"), HORIZONS)
+    store.put(forecasts([f"SKU{i}" for i in range(10)], 1.0), "v1", TODAY)
+    backing = store._state.values
+    first = store._state
+
+    store.put(forecasts([f"SKU{i}" for i in range(5, 20)], 2.0), "v1", TODAY)
+    assert store._state.values is backing  # spare capacity, no copy
+    assert store._state.n == 20
+    assert store.get("SKU0") == {"forecast_7d": 1.0, "forecast_30d": 4.0}
+    assert store.get("SKU19") == {"forecast_7d": 2.0, "forecast_30d": 8.0}
+    # The previous generation does not see the appended rows
+    assert first.position("SKU19") == -1
+
+    frame = store.frame()
+    assert frame["sku"].tolist() == [f"SKU{i}" for i in range(20)]
+    assert frame["forecast_7d"].tolist() == [1.0] * 5 + [2.0] * 15
+
+
+def test_growth_past_capacity_keeps_rows(tmp_path, monkeypatch):
+    from core import forecast_store
+    monkeypatch.setattr(forecast_store, "_MIN_CAPACITY", 4)
+    store = ForecastStore(str(tmp_path / "store.npz"), HORIZONS)
+    for start in range(0, 50, 3):
+        store.put(forecasts([f"SKU{i}" for i in range(start, start + 3)], float(start)), "v1", TODAY)
+    assert len(store._state.values) == 64
+    assert store.bulk(["SKU0", "SKU49", "missing"])["forecast_7d"].tolist()[:2] == [0.0, 48.0]
+    assert np.isnan(store.bulk(["missing"])["forecast_7d"][0])
+
+
+def test_prune_drops_skus_outside_the_catalogue(tmp_path):
+    path = str(tmp_path / "store.npz")
+    store = ForecastStore(path, HORIZONS)
+    store.put(forecasts(["A", "B", "C", "D"], 1.0), "v1", TODAY)
+
+    assert store.prune(["A", "C", "E"]) == 2
+    assert store.get("B") is None and store.get("D") is None
+    assert store.frame()["sku"].tolist() == ["A", "C"]
+    assert store.stale(["A", "B", "C"], "v1", TODAY) == ["B"]
+    assert store.prune(["A", "C"]) == 0
+
+    store.put(forecasts(["E"], 3.0), "v1", TODAY)
+    store.save()
+    reloaded = ForecastStore(path, HORIZONS)
+    assert reloaded.frame()["sku"].tolist() == ["A", "C", "E"]
+    assert reloaded.get("E") == {"forecast_7d": 3.0, "forecast_30d": 12.0}
+    assert os.listdir(tmp_path) == ["store.npz"]
+
+
+def test_subset_forecasts_keep_the_full_catalogue_fast_path(inventory, monkeypatch):
+    inventory()
+    catalogue = load_inventory_data(["sku"] + xgb_model.feature_cols)
+    full = xgb_model.predict_features(catalogue)
+    remembered = xgb_model._last_prediction
+
+    compute_forecasts(catalogue["sku"].astype(str).unique()[:3].tolist(), HORIZONS)
+    assert xgb_model._last_prediction is remembered
+
+    def no_lookups(*args, **kwargs):
+        raise AssertionError("an unchanged catalogue is answered from the last result")
+    monkeypatch.setattr(xgb_model.prediction_cache, "get_many", no_lookups)
+    assert np.array_equal(xgb_model.predict_features(catalogue), full)
@@ -0,0 +1,127 @@
+# tests/test_geocoding.py
+#
+# The geocoder against a local stub of the Geocoding API.
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import pytest
+
+from core.geocoding import GAZETTEER, GeocodeCache, Geocoder
+
+
+class StubGeocodingAPI(BaseHTTPRequestHandler):
+    # region -> (HTTP status, body); unknown regions get ZERO_RESULTS
+    responses = {}
+    delay = 0.0
+    hits = []
+
+    def do_GET(self):
+        region = parse_qs(urlparse(self.path).query)["address"][0]
+        StubGeocodingAPI.hits.append(region)
+        time.sleep(self.delay)
+        status, body = self.responses.get(region, (200, {"status": "ZERO_RESULTS", "results": []}))
+        payload = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def ok(lat, lng):
+    return 200, {"status": "OK", "results": [{"geometry": {"location": {"lat": lat, "lng": lng}}}]}
+
+
+@pytest.fixture
+def stub_api():
+    StubGeocodingAPI.responses = {}
+    StubGeocodingAPI.delay = 0.0
+    StubGeocodingAPI.hits = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGeocodingAPI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/geocode/json"
+    server.shutdown()
+    server.server_close()
+
+
+def resolve(geocoder, regions):
+    async def run():
+        try:
+            return await geocoder.resolve_many(regions)
+        finally:
+            await geocoder.aclose()
+    return asyncio.run(run())
+
+
+def test_resolves_and_persists(tmp_path, stub_api):
+    StubGeocodingAPI.responses["Gotham"] = ok(40.7, -74.0)
+    path = str(tmp_path / "geo.sqlite3")
+    geocoder = Geocoder(GeocodeCache(path), api_key="key", url=stub_api)
+
+    assert resolve(geocoder, ["Gotham"]) == {"Gotham": {"lat": 40.7, "lng": -74.0}}
+    # A new process starts from the persisted cache: no API call
+    reopened = Geocoder(GeocodeCache(path), api_key="key", url=stub_api)
+    assert resolve(reopened, ["Gotham"]) == {"Gotham": {"lat": 40.7, "lng": -74.0}}
+    assert StubGeocodingAPI.hits == ["Gotham"]
+
+
+def test_concurrent_lookups_share_one_request(tmp_path, stub_api):
+    StubGeocodingAPI.responses["Gotham"] = ok(40.7, -74.0)
+    StubGeocodingAPI.delay = 0.2
+    geocoder = Geocoder(GeocodeCache(str(tmp_path / "geo.sqlite3")), api_key="key", url=stub_api)
+
+    async def run():
+        try:
+            return await asyncio.gather(*(geocoder.resolve("Gotham") for _ in range(20)))
+        finally:
+            await geocoder.aclose()
+
+    results = asyncio.run(run())
+    assert all(result == {"lat": 40.7, "lng": -74.0} for result in results)
+    assert StubGeocodingAPI.hits == ["Gotham"]
+
+
+@pytest.mark.parametrize("response", [
+    (500, {"error": "boom"}),
+    (429, {"status": "OVER_QUERY_LIMIT"}),
+    (200, "not json"),
+    (200, {"status": "OK", "results": []}),
+    (200, {"status": "OK", "results": [{"geometry": {}}]}),
+    (200, ["unexpected"]),
+])
+def test_bad_responses_fall_back_to_gazetteer(tmp_path, stub_api, response):
+    StubGeocodingAPI.responses["Texas"] = response
+    StubGeocodingAPI.responses["Gotham"] = response
+    path = str(tmp_path / "geo.sqlite3")
+    geocoder = Geocoder(GeocodeCache(path), api_key="key", url=stub_api)
+
+    result = resolve(geocoder, ["Texas", "Gotham"])
+    assert result["Texas"] == {"lat": GAZETTEER["Texas"][0], "lng": GAZETTEER["Texas"][1]}
+    assert result["Gotham"] == {"lat": None, "lng": None}
+    # Fallbacks are never persisted, so the API is asked again later
+    assert GeocodeCache(path).get("Texas") is None
+
+
+def test_unreachable_api_falls_back(tmp_path):
+    geocoder = Geocoder(GeocodeCache(str(tmp_path / "geo.sqlite3")), api_key="key",
+                        url="http://127.0.0.1:9/geocode/json")
+    assert resolve(geocoder, ["Ohio"]) == {"Ohio": {"lat": GAZETTEER["Ohio"][0], "lng": GAZETTEER["Ohio"][1]}}
+
+
+def test_cache_writes_run_off_the_event_loop(tmp_path, stub_api):
+    StubGeocodingAPI.responses["Gotham"] = ok(1.0, 2.0)
+    cache = GeocodeCache(str(tmp_path / "geo.sqlite3"))
+    writers = []
+    put = cache.put
+    cache.put = lambda *args, **kwargs: writers.append(threading.current_thread()) or put(*args, **kwargs)
+    geocoder = Geocoder(cache, api_key="key", url=stub_api)
+
+    resolve(geocoder, ["Gotham"])
+    assert writers and threading.main_thread() not in writers
@@ -0,0 +1,148 @@
+# tests/test_jobs.py
+
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.api import admin  # the module the app mounts
+from core import jobs, snapshot, demand_map
+from core.jobs import JobScheduler
+
+
+def wait_until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = JobScheduler(max_workers=2)
+    yield scheduler
+    if scheduler.loop is not None:
+        scheduler.loop.call_soon_threadsafe(scheduler.loop.stop)
+    scheduler.executor.shutdown(wait=False)
+
+
+def gated(run=lambda: None):
+    # A job body that blocks until the returned event is set
+    gate = threading.Event()
+
+    def body():
+        assert gate.wait(5)
+        return run()
+    return body, gate
+
+
+def test_triggers_of_a_queued_job_share_one_run(scheduler):
+    upstream, gate = gated()
+    scheduler.register("up", upstream)
+    down = scheduler.register("down", lambda: "done", ["up"])
+
+    scheduler.trigger("up")
+    wait_until(lambda: scheduler.jobs["up"].state == "running")
+    first, second = scheduler.trigger("down"), scheduler.trigger("down")
+    wait_until(lambda: down.triggers == 2)
+    assert down.state == "queued"  # waiting for "up"
+
+    gate.set()
+    assert first.result(5) == second.result(5) == "done"
+    # The success of "up" triggered "down" once more, joining the same run
+    wait_until(lambda: down.state == "idle")
+    assert down.runs == 1 and down.deduplicated == 2 and not down.rerun
+
+
+def test_trigger_while_running_runs_again(scheduler):
+    calls = []
+    body, gate = gated(lambda: calls.append(None) or len(calls))
+    job = scheduler.register("job", body)
+
+    first = scheduler.trigger("job")
+    wait_until(lambda: job.state == "running")
+    second = scheduler.trigger("job")
+
+    gate.set()
+    # Both callers join the current run; a fresh one follows it
+    assert first.result(5) == second.result(5) == 1
+    wait_until(lambda: job.runs == 2 and job.state == "idle")
+    assert calls == [None, None]
+
+
+def test_success_cascades_through_the_pipeline(scheduler):
+    order = []
+    names = ["load_data", "score", "aggregate", "materialize"]
+    for upstream, name in zip([None] + names, names):
+        scheduler.register(name, lambda name=name: order.append(name), [upstream] if upstream else [])
+
+    scheduler.trigger("load_data").result(5)
+    wait_until(lambda: scheduler.jobs["materialize"].runs == 1)
+    assert order == names
+
+
+def test_failure_stops_the_cascade(scheduler):
+    def fail():
+        raise RuntimeError("source unreachable")
+
+    scheduler.register("load_data", lambda: None)
+    score = scheduler.register("score", fail, ["load_data"])
+    aggregate = scheduler.register("aggregate", lambda: None, ["score"])
+
+    scheduler.trigger("load_data").result(5)
+    wait_until(lambda: score.runs == 1)
+    time.sleep(0.05)
+    assert score.failures == 1 and "source unreachable" in score.last_error
+    assert aggregate.runs == 0
+
+
+# ---------- Stale serving ----------
+@pytest.fixture
+def pipeline(scheduler, monkeypatch):
+    # The module-level trigger() goes through this scheduler
+    monkeypatch.setattr(jobs, "scheduler", scheduler)
+    return scheduler
+
+
+def test_outdated_snapshot_is_served_while_score_runs(pipeline, inventory):
+    served = snapshot.refresh_snapshot()
+    body, gate = gated(jobs._score)
+    score = pipeline.register("score", body)
+    pipeline.start()
+    wait_until(lambda: score.state == "running")
+
+    inventory(seed=1)
+    stale_before = snapshot.snapshot_stats["stale_served"]
+    assert snapshot.get_snapshot() is served
+    assert snapshot.snapshot_stats["stale_served"] == stale_before + 1
+
+    gate.set()
+    wait_until(lambda: score.runs == 2 and score.state == "idle")
+    current = snapshot.get_snapshot()
+    assert current is not served and current.version == snapshot.current_version()
+
+
+def test_outdated_tiles_are_served_while_materialize_runs(pipeline, inventory):
+    served = demand_map.refresh_tiles()
+    body, gate = gated(jobs._materialize)
+    materialize = pipeline.register("materialize", body)
+    pipeline.start()
+    wait_until(lambda: materialize.state == "running")
+
+    inventory(seed=1)
+    assert demand_map.get_tiles() is served
+
+    gate.set()
+    wait_until(lambda: materialize.runs == 2 and materialize.state == "idle")
+    assert demand_map.get_tiles().version == snapshot.current_version()
+
+
+def test_admin_job_routes(pipeline, monkeypatch):
+    monkeypatch.setattr(admin, "scheduler", pipeline)
+    pipeline.register("load_data", lambda: None)
+    client = TestClient(app)
+    assert client.post("/admin/jobs/unknown/run").status_code == 404
+    assert client.post("/admin/jobs/load_data/run").json()["name"] == "load_data"
+    wait_until(lambda: pipeline.jobs["load_data"].runs == 1)
+    assert [job["name"] for job in client.get("/admin/jobs").json()["jobs"]] == ["load_data"]
@@ -0,0 +1,38 @@
+# tests/test_main.py
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+ORIGIN = "http://localhost:5173"
+
+
+def test_app_mounts_every_router():
+    paths = {route.path for route in app.routes}
+    for path in [
+        "/inventory-matrix", "/inventory-matrix/download", "/dashboard/metrics",
+        "/event-estimator/calendar", "/pricing/predict", "/demand-map/geo-overlay", "/admin/models"
+    ]:
+        assert path in paths
+
+
+def test_every_route_is_mounted_once():
+    seen = [(method, route.path) for route in app.routes for method in getattr(route, "methods", None) or ()]
+    duplicates = {key for key in seen if seen.count(key) > 1}
+    assert not duplicates
+
+
+def test_inventory_routes_answer(inventory):
+    client = TestClient(app)
+    for path in ["/inventory-matrix", "/inventory-matrix/metrics", "/inventory-matrix/reorder-report"]:
+        assert client.get(path).status_code == 200, path
+    response = client.post("/demand-map/region-details", json={"region": "Texas"})
+    assert response.status_code == 200
+
+
+def test_cors_exposes_pagination_and_cache_headers():
+    response = TestClient(app).get("/", headers={"Origin": ORIGIN})
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == ORIGIN
+    exposed = {header.strip() for header in response.headers["access-control-expose-headers"].split(",")}
+    assert {"X-Next-Cursor", "X-Total-Count", "ETag"} <= exposed
@@ -0,0 +1,20 @@
+# tests/test_match_titles.py
+
+from utils.match_titles import match_titles, normalize_title
+
+THEIRS = ["Acme Wireless Mouse Large", "Bolt Organic Coffee 1kg", "Crest Stainless Bottle 500ml", "Acme Wired Keyboard"]
+
+
+def test_normalize_title():
+    assert normalize_title("Café-Table  2x!") == "cafe table 2x"
+
+
+def test_noisy_titles_find_their_listing():
+    ours = ["ACME WIRELES MOUSE LARGE", "bolt organic cofee 1kg", "crest stainless bottle"]
+    matches = match_titles(ours, THEIRS, top_k=1)
+    assert matches["match"].tolist() == [0, 1, 2]
+    assert (matches["score"] >= 0.5).all()
+
+
+def test_unrelated_titles_do_not_match():
+    assert match_titles(["garden hose reel"], THEIRS).empty
@@ -0,0 +1,106 @@
+# tests/test_pagination.py
+
+import base64
+import json
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from core.pagination import encode_cursor
+from core.snapshot import get_inventory_snapshot
+
+
+@pytest.fixture
+def source(inventory):
+    # Few distinct stock values and SKUs held in several locations, so most
+    # rows tie on the sort column and on the sku
+    df = inventory(120, n_locations=3, seed=3)
+    return inventory(frame=df.assign(current_stock=df["current_stock"] % 5))
+
+
+@pytest.fixture
+def client(source):
+    return TestClient(app)
+
+
+def expected_keys(sort_by: str, descending: bool, location: str = None) -> list:
+    df = get_inventory_snapshot()
+    if location is not None:
+        df = df[df["location"] == location]
+    keys = df["sku"].astype(str) + "|" + df["location"].astype(str)
+    ordered = df.assign(key=keys).sort_values([sort_by, "key"], kind="stable")["key"].tolist()
+    return ordered[::-1] if descending else ordered
+
+
+def walk(client, limit: int, **params) -> tuple:
+    # Every page until X-Next-Cursor is gone: (row keys, total counts seen)
+    keys, totals, cursor = [], set(), None
+    while True:
+        response = client.get("/inventory-matrix", params={**params, "limit": limit, "cursor": cursor})
+        assert response.status_code == 200
+        rows = response.json()
+        assert len(rows) <= limit
+        keys += [f"{row['sku']}|{row['location']}" for row in rows]
+        totals.add(int(response.headers["X-Total-Count"]))
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return keys, totals
+
+
+@pytest.mark.parametrize("sort_by", ["sku", "current_stock", "stock_ratio"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_pages_cover_the_sorted_matrix_once(client, sort_by, order):
+    keys, totals = walk(client, 7, sort_by=sort_by, order=order)
+    assert keys == expected_keys(sort_by, order == "desc")
+    assert totals == {120}
+
+
+def test_ties_are_broken_by_sku_then_location(client):
+    rows = client.get("/inventory-matrix", params={"sort_by": "current_stock", "limit": 120}).json()
+    pairs = [(row["current_stock"], row["sku"], row["location"]) for row in rows]
+    assert pairs == sorted(pairs, key=lambda p: (p[0], f"{p[1]}|{p[2]}"))
+    assert len({(sku, location) for _, sku, location in pairs}) == 120
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_filtered_pages(client, order):
+    keys, totals = walk(client, 6, sort_by="current_stock", order=order, location="Texas")
+    assert keys == expected_keys("current_stock", order == "desc", location="Texas")
+    assert totals == {len(keys)}
+
+
+def test_cursor_survives_a_snapshot_rebuild(client, source, inventory):
+    first = client.get("/inventory-matrix", params={"sort_by": "sku", "limit": 10})
+    seen = [f"{row['sku']}|{row['location']}" for row in first.json()]
+
+    # A new data version in which rows before the cursor are gone
+    keys = source["sku"] + "|" + source["location"]
+    inventory(frame=source[~keys.isin(seen[:5])].reset_index(drop=True))
+    second = client.get("/inventory-matrix", params={
+        "sort_by": "sku", "limit": 10, "cursor": first.headers["X-Next-Cursor"]
+    })
+
+    assert [f"{row['sku']}|{row['location']}" for row in second.json()] == expected_keys("sku", False)[5:15]
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    base64.urlsafe_b64encode(json.dumps({"s": "sku"}).encode()).decode(),
+    encode_cursor("current_stock", False, 3, "SKU1|Texas"),  # another sort column
+    encode_cursor("sku", True, "SKU1", "SKU1|Texas"),        # another direction
+])
+def test_malformed_or_foreign_cursor_is_rejected(client, cursor):
+    response = client.get("/inventory-matrix", params={"sort_by": "sku", "limit": 5, "cursor": cursor})
+    assert response.status_code == 400
+
+
+def test_unknown_sort_column_is_rejected(client):
+    assert client.get("/inventory-matrix", params={"sort_by": "price"}).status_code == 400
+
+
+def test_last_page_has_no_next_cursor(client):
+    response = client.get("/inventory-matrix", params={"sort_by": "sku", "limit": 500})
+    assert response.headers["X-Total-Count"] == "120"
+    assert "X-Next-Cursor" not in response.headers
+    assert len(response.json()) == 120
@@ -0,0 +1,90 @@
+# tests/test_prediction.py
+
+import threading
+import time
+import numpy as np
+
+from models.xgb_model import MicroBatcher, PredictionCache, row_hashes
+
+
+class ConstantModel:
+    def __init__(self, value, delay=0.0):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    def predict(self, matrix):
+        self.calls += 1
+        time.sleep(self.delay)
+        return np.full(len(matrix), self.value, dtype=np.float32)
+
+
+def test_cache_round_trip_and_version_reset():
+    cache = PredictionCache(1000)
+    keys = row_hashes(np.random.default_rng(0).random((500, 5), dtype=np.float32))
+    values, missing = cache.get_many("v1", keys)
+    assert missing.all()
+
+    cache.put_many("v1", keys, np.arange(500, dtype=np.float32))
+    values, missing = cache.get_many("v1", keys)
+    assert not missing.any()
+    assert values.tolist() == list(range(500))
+
+    # A new version starts empty, and writes for the old one are dropped
+    assert cache.get_many("v2", keys)[1].all()
+    cache.put_many("v1", keys, np.zeros(500, dtype=np.float32))
+    assert cache.get_many("v2", keys)[1].all()
+
+
+def test_cache_evicts_least_recently_used():
+    cache = PredictionCache(100)
+    old, hot, new = (np.arange(start, start + 50, dtype=np.uint64) for start in (0, 1000, 2000))
+    cache.get_many("v1", old)
+    cache.put_many("v1", old, np.ones(50, dtype=np.float32))
+    cache.put_many("v1", hot, np.full(50, 2, dtype=np.float32))
+    cache.get_many("v1", old)  # old is now more recent than hot
+    cache.put_many("v1", new, np.full(50, 3, dtype=np.float32))
+
+    assert not cache.get_many("v1", old)[1].any()
+    assert cache.get_many("v1", hot)[1].all()
+    assert cache.get_many("v1", new)[0].tolist() == [3.0] * 50
+
+
+def test_cache_updates_existing_keys():
+    cache = PredictionCache(10)
+    keys = np.array([5, 3, 5], dtype=np.uint64)
+    cache.get_many("v1", keys)
+    cache.put_many("v1", keys, np.array([1, 2, 1], dtype=np.float32))
+    cache.put_many("v1", keys[:1], np.array([9], dtype=np.float32))
+    assert cache.get_many("v1", keys)[0].tolist() == [9.0, 2.0, 9.0]
+
+
+def test_lone_call_does_not_wait_for_the_window():
+    batcher = MicroBatcher(window_seconds=2.0)
+    started = time.perf_counter()
+    result = batcher.predict(ConstantModel(1.0), np.zeros((3, 5), dtype=np.float32), "v1")
+    assert time.perf_counter() - started < 1.0
+    assert result.tolist() == [1.0, 1.0, 1.0]
+
+
+def test_versions_are_never_batched_together():
+    batcher = MicroBatcher(window_seconds=0.05)
+    old, new = ConstantModel(1.0, delay=0.2), ConstantModel(2.0)
+    results = {}
+
+    def call(name, model, version):
+        results[name] = batcher.predict(model, np.zeros((4, 5), dtype=np.float32), version)
+
+    first = threading.Thread(target=call, args=("old", old, "v1"))
+    first.start()
+    time.sleep(0.02)  # the old-version batch is now running
+    threads = [threading.Thread(target=call, args=(f"old{i}", old, "v1")) for i in range(3)]
+    threads += [threading.Thread(target=call, args=(f"new{i}", new, "v2")) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in [first] + threads:
+        thread.join()
+
+    assert all(results[f"new{i}"].tolist() == [2.0] * 4 for i in range(3))
+    assert all(results[f"old{i}"].tolist() == [1.0] * 4 for i in range(3))
+    assert new.calls == 1  # concurrent same-version calls share one predict
@@ -0,0 +1,73 @@
+# tests/test_price_ingest.py
+
+import os
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from core import config, price_ingest
+from core.price_ingest import PriceHistory
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def feeds(tmp_path, monkeypatch):
+    feed_dir = tmp_path / "feeds"
+    feed_dir.mkdir()
+    monkeypatch.setattr(config, "COMPETITOR_FEED_DIR", str(feed_dir))
+    monkeypatch.setattr(price_ingest, "_history", PriceHistory(str(tmp_path / "history")))
+    return feed_dir
+
+
+def ingest(feed_dir, name: str, frame: pd.DataFrame) -> dict:
+    path = os.path.join(feed_dir, name)
+    if name.endswith(".csv"):
+        frame.to_csv(path, index=False)
+    else:
+        frame.to_json(path, orient="records", lines=True, date_format="iso")
+    response = TestClient(app).post("/pricing/ingest-feeds")
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_only_changed_skus_are_rescored(feeds, tmp_path, monkeypatch):
+    # Wide feed over two days: every price is new
+    first = ingest(feeds, "day1.csv", pd.DataFrame({
+        "sku": ["A", "B", "C", "A"],
+        "walmart_price": [10.0, 20.0, 30.0, 11.0],
+        "amazon_price": [9.0, 21.0, 29.0, 10.5],
+        "observed_at": ["2026-10-01T09:00", "2026-10-01T09:00", "2026-10-01T09:00", "2026-10-02T09:00"]
+    }))
+    assert first["rows"] == 8 and first["changed_skus"] == 3
+    assert sorted(d["sku"] for d in first["decisions"]) == ["A", "B", "C"]
+    history = tmp_path / "history" / "history"
+    assert sorted(os.listdir(history)) == ["day=2026-10-01", "day=2026-10-02"]
+    assert os.listdir(feeds / "processed")
+
+    # Long feed: only B's Amazon price moves
+    second = ingest(feeds, "day3.jsonl", pd.DataFrame({
+        "sku": ["A", "B", "C"],
+        "competitor": ["walmart", "amazon", "walmart"],
+        "price": [11.0, 18.0, 30.0],
+        "observed_at": ["2026-10-03T09:00"] * 3
+    }))
+    assert (second["price_changes"], second["changed_skus"]) == (1, 1)
+    assert [(d["sku"], d["walmart_price"], d["amazon_price"]) for d in second["decisions"]] == [("B", 20.0, 18.0)]
+
+    # Nothing moved: no rescoring at all
+    def no_rescore(*args, **kwargs):
+        raise AssertionError("nothing changed, nothing to rescore")
+    monkeypatch.setattr(price_ingest.PriceHistory, "latest_wide", no_rescore)
+    third = ingest(feeds, "day4.csv", pd.DataFrame({"sku": ["C"], "walmart_price": [30.0]}))
+    assert (third["changed_skus"], third["decisions"]) == (0, [])
+
+
+def test_latest_prices_are_reloaded(feeds, tmp_path):
+    ingest(feeds, "feed.csv", pd.DataFrame({"sku": ["A", "B"], "amazon_price": [5.0, 6.0], "walmart_price": [7.0, None]}))
+    reloaded = PriceHistory(str(tmp_path / "history"))
+
+    assert reloaded.latest == {("A", "amazon"): 5.0, ("B", "amazon"): 6.0, ("A", "walmart"): 7.0}
+    wide = reloaded.latest_wide(["B"])
+    assert wide.to_dict(orient="records") == [{"sku": "B", "amazon_price": 6.0}]
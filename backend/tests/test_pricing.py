@@ -0,0 +1,88 @@
+# tests/test_pricing.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from models.price_model import price_actions, price_feature_matrix, predict_should_lower, score_catalogue
+
+
+@pytest.fixture
+def items():
+    rng = np.random.default_rng(7)
+    n = 60
+    walmart = rng.uniform(1, 100, n).round(2)
+    amazon = (walmart * rng.uniform(0.7, 1.3, n)).round(2)
+    items = [
+        {"walmart_price": w, "amazon_price": a, "brand": int(b), "category": int(c), "available": int(v)}
+        for w, a, b, c, v in zip(walmart, amazon, rng.integers(0, 50, n), rng.integers(0, 8, n), rng.integers(0, 2, n))
+    ]
+    # Every other item also carries demand and stock
+    for item, forecast, stock in zip(items[::2], rng.integers(0, 100, n), rng.integers(0, 100, n)):
+        item.update(forecasted_demand=float(forecast), current_stock=float(stock))
+    return items
+
+
+def test_batch_matches_single_predictions(items):
+    client = TestClient(app)
+    batch = client.post("/pricing/batch", json=items)
+    assert batch.status_code == 200
+    singles = [client.post("/pricing/predict", json=item).json()["should_lower_price"] for item in items]
+    assert [decision["should_lower_price"] for decision in batch.json()] == singles
+
+
+def test_batch_matches_row_by_row_scoring(items):
+    decisions = TestClient(app).post("/pricing/batch", json=items).json()
+    for item, decision in zip(items, decisions):
+        row = price_feature_matrix([item["walmart_price"]], [item["amazon_price"]],
+                                   item["brand"], item["category"], item["available"])
+        ml_lower = int(predict_should_lower(row)[0])
+        overstock = "forecasted_demand" not in item or item["forecasted_demand"] < item["current_stock"]
+        assert decision["should_lower_price"] == ml_lower
+        assert decision["price_action"] == ("Lower Price" if ml_lower and overstock else "Hold Price")
+
+
+def test_empty_batch():
+    assert TestClient(app).post("/pricing/batch", json=[]).json() == []
+
+
+@pytest.mark.parametrize("overstock, ml_lower, action", [
+    (True, 1, "Lower Price"),
+    (True, 0, "Hold Price"),
+    (False, 1, "Hold Price"),
+    (False, 0, "Hold Price"),
+    (True, np.nan, "Lower Price"),   # no competitor data: stock decides
+    (False, np.nan, "Hold Price"),
+    (None, 1, "Lower Price"),        # no stock rule: the classifier decides
+    (None, 0, "Hold Price"),
+    (True, None, "Lower Price"),
+    (False, None, "Hold Price"),
+])
+def test_price_action_rules(overstock, ml_lower, action):
+    result = price_actions(
+        overstock=None if overstock is None else np.array([overstock]),
+        ml_lower=None if ml_lower is None else np.array([ml_lower], dtype=float)
+    )
+    assert result.tolist() == [action]
+
+
+def test_score_catalogue_scores_rows_with_a_competitor_price():
+    catalogue = pd.DataFrame({
+        "price": [10.0, 20.0, 30.0, 40.0],
+        "amazon_price": [9.0, np.nan, 35.0, 39.0],
+        "brand_index": [1, 2, 3, 4],
+        "category_index": [0, 1, 0, 1],
+        "current_stock": [5, 0, 0, 12]
+    })
+    signal = score_catalogue(catalogue)
+
+    assert np.isnan(signal[1])
+    for i in (0, 2, 3):
+        row = catalogue.iloc[i]
+        expected = predict_should_lower(price_feature_matrix(
+            [row["price"]], [row["amazon_price"]], row["brand_index"], row["category_index"], int(row["current_stock"] > 0)
+        ))[0]
+        assert signal[i] == expected
+    assert np.isnan(score_catalogue(catalogue.drop(columns="amazon_price"))).all()
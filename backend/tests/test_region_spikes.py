@@ -0,0 +1,81 @@
+# tests/test_region_spikes.py
+
+import numpy as np
+import pandas as pd
+
+from models.geo_demand_map import compute_hierarchy_spikes, compute_region_spikes
+
+
+def legacy_spikes(df: pd.DataFrame) -> list:
+    # The per-region loop compute_region_spikes replaced
+    results = []
+    grouped = df.groupby("location").agg({"forecasted_demand": "sum", "required_stock": "sum"}).reset_index()
+    for _, row in grouped.iterrows():
+        spike_pct = round(100 * (row["forecasted_demand"] - row["required_stock"]) / max(row["required_stock"], 1), 2)
+        if spike_pct < 10:
+            continue
+        level = "High" if spike_pct > 30 else "Moderate" if spike_pct > 20 else "Mild"
+        products = df[df["location"] == row["location"]].nlargest(5, "forecasted_demand")["sku"].tolist()
+        results.append((row["location"], spike_pct, level, products))
+    return results
+
+
+def scored_rows(n_regions: int = 40, n_skus: int = 30, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    # Regions listed out of order, so first-appearance order differs from sorted
+    regions = [f"Region{i:03d}" for i in rng.permutation(n_regions)]
+    df = pd.DataFrame({
+        "location": np.repeat(regions, n_skus),
+        "sku": [f"SKU{i}" for i in range(n_skus)] * n_regions,
+        "required_stock": rng.integers(1, 100, n_regions * n_skus),
+    })
+    df["forecasted_demand"] = df["required_stock"] * rng.uniform(0.5, 1.8, n_regions * n_skus)
+    return df
+
+
+def test_region_spikes_match_the_legacy_loop_in_order():
+    df = scored_rows()
+    table = compute_region_spikes(df)
+    spikes = table[table["is_spike"]]
+
+    expected = legacy_spikes(df)
+    assert len(expected) > 5
+    assert list(zip(spikes.index, spikes["spike_percent"], spikes["demand_level"], spikes["products"])) == expected
+    assert list(table.index) == sorted(table.index)
+
+
+def test_categorical_regions_come_back_sorted():
+    df = scored_rows(seed=1).astype({"location": "category", "sku": "category"})
+    table = compute_region_spikes(df)
+    assert list(table.index) == sorted(df["location"].unique())
+
+
+def test_hierarchy_rolls_up_from_the_level_below():
+    df = pd.DataFrame({
+        "country": ["US", "US", "US", "US", "IN", "IN"],
+        "state": ["Texas", "Texas", "Ohio", "Ohio", "Kerala", "Kerala"],
+        # Same city name in two states: two regions
+        "city": ["Springfield", "Austin", "Springfield", "Springfield", "Kochi", "Kochi"],
+        "sku": ["A", "B", "A", "C", "A", "B"],
+        "required_stock": [10, 10, 10, 10, 10, 10],
+        "forecasted_demand": [30.0, 5.0, 4.0, 9.0, 2.0, 1.0],
+    })
+    tables = compute_hierarchy_spikes(df, top_k=2)
+    assert list(tables) == ["country", "state", "city"]
+
+    city = tables["city"]
+    assert list(zip(city["state"], city.index)) == [
+        ("Kerala", "Kochi"), ("Ohio", "Springfield"), ("Texas", "Austin"), ("Texas", "Springfield")
+    ]
+
+    country = tables["country"]
+    assert list(country.index) == ["IN", "US"]
+    assert country.loc["US", "forecasted_demand"] == 48.0
+    assert country.loc["US", "required_stock"] == 40
+    # SKU A summed over Texas and Ohio (34) outranks C (9) and B (5)
+    assert country.loc["US", "products"] == ["A", "C"]
+    assert country.loc["IN", "products"] == []
+
+    state = tables["state"]
+    assert state.loc["Texas", "country"] == "US"
+    pd.testing.assert_frame_equal(tables["state"], compute_region_spikes(df, level="state"))
@@ -0,0 +1,102 @@
+# tests/test_registry.py
+
+import os
+import joblib
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.api import admin  # the module the app mounts
+from core import config
+from models import registry
+
+
+@pytest.fixture
+def weights(tmp_path, monkeypatch):
+    """
+    A registry with one model, "toy", whose weights live in a tmp dir.
+    Returns a function writing new weights with a given mtime.
+    """
+    specs = {"toy": ("toy.pkl", joblib.load), "missing": ("missing.pkl", joblib.load)}
+    monkeypatch.setattr(config, "MODEL_WEIGHTS_DIR", str(tmp_path))
+    monkeypatch.setattr(registry, "MODEL_SPECS", specs)
+    monkeypatch.setattr(admin, "MODEL_SPECS", specs)
+    monkeypatch.setattr(registry, "_entries", {})
+    monkeypatch.setattr(registry, "_errors", {})
+    path = str(tmp_path / "toy.pkl")
+
+    def write(model, mtime: float):
+        joblib.dump(model, path)
+        os.utime(path, (mtime, mtime))
+        return path
+    return write
+
+
+def test_version_is_a_content_hash(weights):
+    path = weights({"weights": [1, 2, 3]}, mtime=1_000)
+    entry = registry.reload_model("toy")
+    with open(path, "rb") as f:
+        assert entry.version == registry.weights_version(f.read())
+
+    # Same bytes re-deployed later: a new mtime but the same version
+    weights({"weights": [1, 2, 3]}, mtime=2_000)
+    assert registry.reload_changed_models() == []
+    assert registry.get_entry("toy").version == entry.version
+
+
+def test_reload_changed_models_follows_the_mtime(weights):
+    weights({"weights": 1}, mtime=1_000)
+    registry.load_all_models()
+    entry = registry.get_entry("toy")
+
+    assert registry.reload_changed_models() == []
+    assert registry.get_entry("toy") is entry  # unchanged mtime: not even read
+
+    weights({"weights": 2}, mtime=2_000)
+    assert registry.reload_changed_models() == ["toy"]
+    assert registry.get_model("toy") == {"weights": 2}
+
+
+def test_swap_leaves_fetched_entries_intact(weights):
+    weights({"weights": 1}, mtime=1_000)
+    held = registry.get_entry("toy")
+
+    weights({"weights": 2}, mtime=2_000)
+    swapped = registry.reload_model("toy")
+
+    assert (held.model, held.version) != (swapped.model, swapped.version)
+    assert held.model == {"weights": 1} and registry.get_entry("toy") is swapped
+
+
+def test_failed_reload_keeps_the_previous_model(weights):
+    path = weights({"weights": 1}, mtime=1_000)
+    entry = registry.reload_model("toy")
+
+    with open(path, "wb") as f:
+        f.write(b"not a pickle")
+    os.utime(path, (2_000, 2_000))
+
+    assert registry.reload_changed_models() == []
+    with pytest.raises(Exception):
+        registry.reload_model("toy")
+    assert registry.get_entry("toy") is entry
+    assert registry._errors["toy"]
+
+    response = TestClient(app).post("/admin/models/toy/reload")
+    assert response.status_code == 500 and "previous weights kept" in response.json()["detail"]
+    assert registry.get_model("toy") == {"weights": 1}
+
+
+def test_missing_weights_are_reported_not_raised(weights):
+    weights({"weights": 1}, mtime=1_000)
+    info = {model["name"]: model for model in registry.load_all_models()}
+
+    assert info["toy"]["status"] == "loaded"
+    assert info["missing"]["status"] == "error" and "missing.pkl" in info["missing"]["error"]
+    assert TestClient(app).post("/admin/models/unknown/reload").status_code == 404
+
+
+def test_shipped_models_all_have_weights():
+    shipped = set(os.listdir(os.path.join(os.path.dirname(__file__), "..", "model_weights")))
+    # Demand model weights are not in the repo; tests and benchmarks train their own
+    assert {filename for filename, _ in registry.MODEL_SPECS.values()} - shipped <= {"xgb_demand_model.pkl"}
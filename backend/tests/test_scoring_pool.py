@@ -0,0 +1,48 @@
+# tests/test_scoring_pool.py
+
+import joblib
+import numpy as np
+import pytest
+
+from conftest import LinearDemandModel
+from models.registry import weights_version
+from models.scoring_pool import StaleWeightsError, score_matrix, shutdown_pool
+
+
+class FailingModel:
+    def predict(self, features):
+        raise ValueError("bad features")
+
+
+def _weights(tmp_path, model, name="model.pkl"):
+    path = tmp_path / name
+    joblib.dump(model, path)
+    return str(path), weights_version(path.read_bytes())
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    shutdown_pool()
+    yield
+    shutdown_pool()
+
+
+def test_sharded_scores_match_in_process(tmp_path):
+    path, version = _weights(tmp_path, LinearDemandModel())
+    matrix = np.random.default_rng(0).random((1001, 5), dtype=np.float32) * 10
+    scored = score_matrix(matrix, path, version, workers=3)
+    expected = LinearDemandModel().predict(matrix).astype(np.float32)
+    assert np.allclose(scored, expected)
+
+
+def test_worker_error_is_not_masked(tmp_path):
+    path, version = _weights(tmp_path, FailingModel())
+    with pytest.raises(ValueError, match="bad features"):
+        score_matrix(np.zeros((10, 5), dtype=np.float32), path, version, workers=2)
+
+
+def test_changed_weights_are_refused(tmp_path):
+    path, version = _weights(tmp_path, LinearDemandModel())
+    joblib.dump(FailingModel(), path)  # replaced after the registry loaded it
+    with pytest.raises(StaleWeightsError):
+        score_matrix(np.zeros((10, 5), dtype=np.float32), path, version, workers=2)
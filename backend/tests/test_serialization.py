@@ -0,0 +1,97 @@
+# tests/test_serialization.py
+#
+# The columnar encoder must produce exactly what the per-row Pydantic loop
+# it replaced produced (same objects, same key order, same values).
+
+import json
+from typing import List
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from api import inventory as inventory_api
+from core.serialization import frame_to_records_json
+from core.snapshot import get_inventory_snapshot
+from schemas.inventory import InventoryItem, ReorderItem, ReorderReport
+
+
+def legacy_inventory_items(df) -> bytes:
+    # The loop get_inventory_matrix used before columnar encoding
+    items = [
+        InventoryItem(
+            sku=row['sku'],
+            product_name=row['product_name'],
+            brand=row['brand'],
+            category=row['category'],
+            location=row['location'],
+            current_stock=row['current_stock'],
+            forecasted_demand=row['forecasted_demand'],
+            required_stock=row['required_stock'],
+            price_action=row['price_action'],
+            status=row['status']
+        )
+        for _, row in df.iterrows()
+    ]
+    return TypeAdapter(List[InventoryItem]).dump_json(items)
+
+
+def legacy_reorder_report(df) -> bytes:
+    reorder_df = df[df['current_stock'] < df['required_stock']]
+    items = [
+        ReorderItem(
+            sku=row['sku'],
+            product_name=row['product_name'],
+            current_stock=row['current_stock'],
+            required_stock=row['required_stock']
+        )
+        for _, row in reorder_df.iterrows()
+    ]
+    return ReorderReport(total_reorder_items=len(items), items=items).model_dump_json().encode()
+
+
+def assert_same_json(actual, expected):
+    actual, expected = json.loads(actual), json.loads(expected)
+    assert actual == expected
+    # Same wire shape, field order included
+    assert [list(item) for item in actual] == [list(item) for item in expected]
+
+
+def client():
+    app = FastAPI()
+    app.include_router(inventory_api.router)
+    return TestClient(app)
+
+
+def test_records_match_pydantic_loop(inventory):
+    inventory(500, seed=1)
+    df = get_inventory_snapshot()
+    assert_same_json(frame_to_records_json(df, InventoryItem), legacy_inventory_items(df))
+
+
+def test_filtered_records_match_pydantic_loop(inventory):
+    inventory(500, seed=2)
+    df = get_inventory_snapshot()
+    subset = df[(df["brand"] == "Bolt") & (df["location"] != "Texas")]
+    assert len(subset)
+    assert_same_json(frame_to_records_json(subset, InventoryItem), legacy_inventory_items(subset))
+
+
+def test_inventory_matrix_route_matches_pydantic_loop(inventory):
+    inventory(300, seed=3)
+    response = client().get("/inventory-matrix")
+    assert response.status_code == 200
+    assert_same_json(response.content, legacy_inventory_items(get_inventory_snapshot()))
+
+
+def test_reorder_report_route_matches_pydantic_loop(inventory):
+    inventory(300, seed=4)
+    response = client().get("/inventory-matrix/reorder-report")
+    assert response.status_code == 200
+    expected = json.loads(legacy_reorder_report(get_inventory_snapshot()))
+    assert expected["total_reorder_items"] > 0
+    assert response.json() == expected
+
+
+def test_empty_frame_encodes_as_empty_list(inventory):
+    df = get_inventory_snapshot().iloc[:0]
+    assert json.loads(frame_to_records_json(df, InventoryItem)) == []
@@ -0,0 +1,60 @@
+# tests/test_spatial_index.py
+
+import numpy as np
+import pytest
+
+from core.spatial_index import GridIndex, haversine_km
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(0)
+    return rng.uniform(-80, 80, 2_000), rng.uniform(-180, 180, 2_000)
+
+
+def brute_bbox(lats, lngs, south, west, north, east):
+    if east - west < 360:
+        west, east = (west + 180) % 360 - 180, (east + 180) % 360 - 180 if east != 180 else 180
+    in_lat = (lats >= south) & (lats <= north)
+    in_lng = (lngs >= west) & (lngs <= east) if west <= east else (lngs >= west) | (lngs <= east)
+    return np.flatnonzero(in_lat & in_lng)
+
+
+@pytest.mark.parametrize("bbox", [
+    (-10, -20, 30, 40),
+    (0, 170, 40, -170),   # crosses the antimeridian
+    (-60, 150, 60, 210),  # same, written past 180
+    (-90, -180, 90, 180),
+])
+def test_query_bbox_matches_a_scan(points, bbox):
+    lats, lngs = points
+    index = GridIndex(lats, lngs, cell_deg=5.0)
+    assert index.query_bbox(*bbox).tolist() == brute_bbox(lats, lngs, *bbox).tolist()
+
+
+def test_antimeridian_box_holds_points_on_both_sides():
+    index = GridIndex([10.0, 10.0, 10.0], [179.5, -179.5, 0.0])
+    assert index.query_bbox(0, 170, 20, -170).tolist() == [0, 1]
+
+
+def test_nearest_with_a_mask_matches_a_scan(points):
+    lats, lngs = points
+    index = GridIndex(lats, lngs)
+    mask = np.zeros(len(lats), dtype=bool)
+    mask[::7] = True
+
+    for lat, lng in [(0.0, 0.0), (45.0, 179.0), (-70.0, -100.0)]:
+        positions, distances = index.nearest(lat, lng, 5, mask)
+        eligible = np.flatnonzero(mask)
+        all_distances = haversine_km(lat, lng, lats[eligible], lngs[eligible])
+        expected = eligible[np.argsort(all_distances, kind="stable")[:5]]
+        assert positions.tolist() == expected.tolist()
+        assert mask[positions].all()
+        assert np.all(np.diff(distances) >= 0)
+
+
+def test_nearest_with_fewer_eligible_points_than_k():
+    index = GridIndex([0.0, 1.0, 2.0], [0.0, 1.0, 2.0])
+    positions, _ = index.nearest(0.0, 0.0, 5, np.array([False, False, True]))
+    assert positions.tolist() == [2]
+    assert len(index.nearest(0.0, 0.0, 5, np.zeros(3, dtype=bool))[0]) == 0
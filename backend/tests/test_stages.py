@@ -0,0 +1,81 @@
+# tests/test_stages.py
+
+import asyncio
+import threading
+import time
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.main import app
+from app.api import inventory as inventory_api  # the module the app mounts
+from core.stages import Stage
+
+
+def test_concurrent_reservations_admit_up_to_capacity():
+    stage = Stage("export", 1, 0)
+    barrier = threading.Barrier(12)
+    outcomes = []
+
+    def reserve():
+        barrier.wait()
+        try:
+            outcomes.append(stage.reserve())
+        except HTTPException as exc:
+            outcomes.append(exc.status_code)
+
+    threads = [threading.Thread(target=reserve) for _ in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert outcomes.count(429) == 11
+    assert stage.in_flight == 1 and stage.stats["rejected"] == 11
+
+
+def test_slot_is_released_once_by_every_path():
+    stage = Stage("export", 1, 0)
+
+    # Streamed to the end
+    async def drain():
+        return [chunk async for chunk in stage.stream(iter([b"a", b"b"]), stage.reserve())]
+    assert asyncio.run(drain()) == [b"a", b"b"]
+    assert stage.in_flight == 0 and stage.stats["completed"] == 1
+
+    # The handler fails before the body starts
+    with pytest.raises(ValueError):
+        with stage.reserve():
+            raise ValueError("bad request")
+    assert stage.in_flight == 0 and stage.stats["failed"] == 1
+
+    # The body is built but never iterated
+    slot = stage.reserve()
+    body = stage.stream(iter([b"a"]), slot)
+    del body
+    assert stage.in_flight == 0 and stage.stats["failed"] == 2
+
+    slot.release()
+    assert stage.in_flight == 0 and stage.stats["failed"] == 2
+
+
+def test_concurrent_downloads_respect_the_export_limit(monkeypatch, inventory):
+    inventory()
+    stage = Stage("export", 1, 0)
+    monkeypatch.setattr(inventory_api.stages, "export", stage)
+    export_rows = inventory_api._export_rows
+
+    def slow_export_rows(*args):
+        time.sleep(0.2)
+        return export_rows(*args)
+    monkeypatch.setattr(inventory_api, "_export_rows", slow_export_rows)
+
+    async def download_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await asyncio.gather(*(http.get("/inventory-matrix/download?format=csv") for _ in range(12)))
+
+    codes = [response.status_code for response in asyncio.run(download_all())]
+    assert codes.count(200) == 1 and codes.count(429) == 11
+    assert stage.in_flight == 0 and stage.stats["completed"] == 1
+
@@ -0,0 +1,51 @@
+# tests/test_trend_model.py
+
+import numpy as np
+
+from models.trend_model import TrendSpikeDetector
+
+
+def steady_history(detector: TrendSpikeDetector, skus: list, periods: int, seed: int = 0):
+    # 20 units a period, give or take 1
+    rng = np.random.default_rng(seed)
+    for _ in range(periods):
+        detector.add_sales(skus, rng.integers(19, 22, len(skus)))
+        detector.close_period()
+        assert not detector.spiking
+
+
+def test_spike_is_flagged():
+    detector = TrendSpikeDetector()
+    steady_history(detector, ["A", "B"], periods=10)
+
+    detector.add_sales(["A", "B"], [20, 20])
+    assert detector.spiking_skus() == []
+    detector.add_sale("A", 100)
+    assert detector.spiking_skus() == ["A"]  # flagged within the open period
+
+    detector.close_period()
+    assert detector.spiking_skus() == ["A"]  # and still once it is closed
+
+
+def test_steady_series_is_not_flagged():
+    detector = TrendSpikeDetector()
+    steady_history(detector, [f"SKU{i}" for i in range(200)], periods=60)
+    assert detector.spiking_skus() == []
+
+
+def test_no_flags_during_warmup():
+    detector = TrendSpikeDetector(warmup=7)
+    steady_history(detector, ["A"], periods=3)
+    detector.add_sale("A", 1000)
+    assert detector.spiking_skus() == []
+
+
+def test_warmup_statistics_weigh_periods_equally():
+    # Before 1 / alpha periods the mean and variance are the plain ones,
+    # not an EWMA anchored to the first period
+    detector = TrendSpikeDetector(alpha=0.1)
+    for quantity in (10, 20, 30, 40):
+        detector.add_sale("A", quantity)
+        detector.close_period()
+    assert np.isclose(detector.mean[0], 25.0)
+    assert np.isclose(detector.var[0], np.var([10, 20, 30, 40]))